@@ -3,48 +3,137 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
 import re
-from dataclasses import asdict, dataclass, field, fields
-from datetime import UTC, datetime
+import sys
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from dataclasses import dataclass, field, fields
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from itertools import islice
 from typing import Any
 
 import voluptuous as vol
 from aiohttp import web
 from homeassistant.components import webhook as webhook_comp
 from homeassistant.config_entries import ConfigEntry, ConfigEntryState
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
 from homeassistant.exceptions import (
     ConfigEntryNotReady,
+    HomeAssistantError,
     ServiceValidationError,
 )
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 
+from .analytics import CALLER_WINDOWS, TOP_CALLERS_CAPACITY, CallerAnalytics
+from .announcements import AnnouncementPipeline
+from .audio import AudioPreparer
+from .blocklist import Blocklist
+from .commands import CommandDispatcher
 from .const import (
     ADDON_SLUG,
+    CALL_EVENT_TYPES,
+    CONF_ANNOUNCE_GROUPS,
+    CONF_AUDIO_CACHE_MAX_AGE_DAYS,
+    CONF_AUDIO_CACHE_MAX_MB,
+    CONF_AUDIO_PREPARE,
+    CONF_AUDIO_SAMPLE_RATE,
+    CONF_BLOCKLIST_FILE,
+    CONF_BLOCKLIST_NATIONAL_MATCH,
+    CONF_BROADCAST_MAX_LEGS,
+    CONF_CACHE_DIR,
+    CONF_CALL_HISTORY,
+    CONF_CALL_HISTORY_RETENTION_DAYS,
+    CONF_CALL_ROUTES,
+    CONF_CALLER_ANALYTICS,
     CONF_DEFAULT_TARGET,
+    CONF_DIAL_RATE_LIMIT,
+    CONF_DTMF_COLLECT,
+    CONF_DTMF_MAX_LENGTH,
+    CONF_DTMF_SEQUENCE_ONLY,
+    CONF_DTMF_TERMINATOR,
+    CONF_DTMF_TIMEOUT,
+    CONF_EVENT_HISTORY_SIZE,
+    CONF_IVR_FILE,
+    CONF_MAX_CALL_SESSIONS,
+    CONF_MAX_CONCURRENT_COMMANDS,
+    CONF_MAX_INACTIVE_CALL_SESSIONS,
     CONF_NOTIFY_HANGUP,
     CONF_NOTIFY_RING_TIMEOUT,
     CONF_NOTIFY_SIP_ACCOUNT,
+    CONF_PERSISTENCE_MODE,
+    CONF_PHONEBOOK_FILE,
     CONF_SIP_HOST,
+    CONF_TTS_CACHE_SIZE_MB,
+    CONF_TTS_ENGINE_ID,
+    CONF_TTS_LANGUAGE,
+    CONF_TTS_PRERENDER,
+    CONF_TTS_SENTENCE_CHUNKS,
+    CONF_TTS_VOICE,
     CONF_WEBHOOK_ID,
+    CONF_WEBHOOK_QUEUE_SIZE,
     DATA_SERVICES_REGISTERED,
+    DEFAULT_AUDIO_CACHE_MAX_AGE_DAYS,
+    DEFAULT_AUDIO_CACHE_MAX_MB,
+    DEFAULT_AUDIO_SAMPLE_RATE,
+    DEFAULT_BROADCAST_MAX_LEGS,
+    DEFAULT_CACHE_DIR,
+    DEFAULT_CALL_HISTORY_RETENTION_DAYS,
+    DEFAULT_DIAL_RATE_LIMIT,
+    DEFAULT_DTMF_MAX_LENGTH,
+    DEFAULT_DTMF_TERMINATOR,
+    DEFAULT_DTMF_TIMEOUT,
+    DEFAULT_EVENT_HISTORY_SIZE,
+    DEFAULT_MAX_CALL_SESSIONS,
+    DEFAULT_MAX_CONCURRENT_COMMANDS,
+    DEFAULT_MAX_INACTIVE_CALL_SESSIONS,
     DEFAULT_NOTIFY_RING_TIMEOUT,
     DEFAULT_NOTIFY_SIP_ACCOUNT,
+    DEFAULT_TTS_CACHE_SIZE_MB,
+    DEFAULT_TTS_ENGINE_ID,
+    DEFAULT_TTS_LANGUAGE,
+    DEFAULT_WEBHOOK_QUEUE_SIZE,
     DOMAIN,
+    DTMF_SEQUENCE_EVENT,
+    ENTITY_EVENT_TYPES,
     EVENT_WEBHOOK,
-    NOTIFY_OPTION_KEYS,
+    OPTION_KEYS,
+    PERSISTENCE_JOURNAL,
     PLATFORMS,
+    SIGNAL_AUDIO_CACHE,
+    SIGNAL_BLOCKLIST,
     SIGNAL_CALL_STATE,
+    SIGNAL_COMMAND_QUEUE,
     STORAGE_KEY,
     STORAGE_VERSION,
     TERMINAL_CALL_EVENTS,
 )
+from .dtmf import DtmfCollector
 from .entity import async_ensure_device
+from .history import CALL_OUTCOMES, CallHistory
+from .ingest import WebhookIngestQueue
+from .ivr import IvrEngine, async_load_ivr
+from .janitor import AudioCacheJanitor
+from .journal import CallJournal
+from .phonebook import Phonebook
+from .routing import CallRouter, RoutingTable, parse_routes
+from .sequencing import CallEventSequencer, WebhookDeduplicator, state_for_event
 from .supervisor import SupervisorError, get_addon_info, set_system_managed
+from .tts_cache import TTS_CACHE_SUBDIR, TtsCache
+from .waiters import CallWaiters, target_key
 
 _LOGGER = logging.getLogger(__name__)
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
@@ -60,9 +149,35 @@ SERVICE_STOP_PLAYBACK = "stop_playback"
 SERVICE_ANSWER = "answer"
 SERVICE_ANNOUNCE = "announce"
 SERVICE_ANSWER_AND_SPEAK = "answer_and_speak"
+SERVICE_QUERY_CALLS = "query_calls"
+SERVICE_QUERY_CALLERS = "query_callers"
+SERVICE_BROADCAST_ANNOUNCE = "broadcast_announce"
+SERVICE_WAIT_FOR_EVENT = "wait_for_event"
+SERVICE_START_IVR = "start_ivr"
+SERVICE_PREWARM_TTS = "prewarm_tts"
+
+# Extra time allowed after the ring timeout for ha-sip to report the outcome.
+CALL_EVENT_GRACE = 10
+# How long one sentence of a chunked message may play before giving up.
+TTS_CHUNK_PLAYBACK_TIMEOUT = 120
+# What a dial or announce response waits for; terminal events always end a wait.
+CALL_WAIT_EVENTS: dict[str, frozenset[str]] = {
+    "call_started": frozenset(CALL_EVENT_TYPES),
+    "call_established": frozenset({"call_established"}),
+    "playback_done": frozenset({"playback_done"}),
+    "call_ended": frozenset(),
+}
+DEFAULT_CALL_WAIT_TIMEOUT = 60
 
 NON_EMPTY_STRING = vol.All(cv.string, vol.Length(min=1))
 
+CALL_WAIT_FIELDS = {
+    vol.Optional("wait_for", default="call_started"): vol.In(CALL_WAIT_EVENTS),
+    vol.Optional("timeout", default=DEFAULT_CALL_WAIT_TIMEOUT): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=3600)
+    ),
+}
+
 DIAL_SCHEMA = vol.Schema(
     {
         vol.Required("number"): NON_EMPTY_STRING,
@@ -74,6 +189,7 @@ DIAL_SCHEMA = vol.Schema(
         ),
         vol.Optional("menu"): dict,
         vol.Optional("webhook_to_call"): dict,
+        **CALL_WAIT_FIELDS,
     },
     extra=vol.PREVENT_EXTRA,
 )
@@ -159,6 +275,49 @@ ANNOUNCE_SCHEMA = vol.Schema(
         ),
         vol.Optional("hangup_after_speaking", default=True): bool,
         vol.Optional("webhook_to_call"): dict,
+        **CALL_WAIT_FIELDS,
+    },
+    extra=vol.PREVENT_EXTRA,
+)
+
+BROADCAST_ANNOUNCE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional("targets"): vol.All(cv.ensure_list_csv, [NON_EMPTY_STRING]),
+            vol.Optional("groups"): vol.All(cv.ensure_list_csv, [NON_EMPTY_STRING]),
+            vol.Required("message"): NON_EMPTY_STRING,
+            vol.Optional("title"): cv.string,
+            vol.Optional("tts_language"): cv.string,
+            vol.Optional(
+                "ring_timeout", default=DEFAULT_NOTIFY_RING_TIMEOUT
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional("sip_account", default=DEFAULT_NOTIFY_SIP_ACCOUNT): vol.All(
+                vol.Coerce(int), vol.Range(min=1)
+            ),
+            vol.Optional("hangup_after_speaking", default=True): bool,
+        },
+        extra=vol.PREVENT_EXTRA,
+    ),
+    cv.has_at_least_one_key("targets", "groups"),
+)
+
+START_IVR_SCHEMA = vol.Schema(
+    {
+        vol.Required("internal_id"): NON_EMPTY_STRING,
+        vol.Optional("menu"): NON_EMPTY_STRING,
+    },
+    extra=vol.PREVENT_EXTRA,
+)
+
+WAIT_FOR_EVENT_SCHEMA = vol.Schema(
+    {
+        vol.Required("internal_id"): NON_EMPTY_STRING,
+        vol.Required("event"): vol.All(
+            cv.ensure_list, [vol.In(ENTITY_EVENT_TYPES)]
+        ),
+        vol.Optional("timeout", default=DEFAULT_CALL_WAIT_TIMEOUT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=3600)
+        ),
     },
     extra=vol.PREVENT_EXTRA,
 )
@@ -176,34 +335,171 @@ ANSWER_AND_SPEAK_SCHEMA = vol.Schema(
 )
 
 
-@dataclass
+CALL_SESSION_TIMESTAMP_FIELDS: tuple[str, ...] = (
+    "created_at",
+    "updated_at",
+    "established_at",
+    "disconnected_at",
+)
+
+
+def _iso_timestamp(value: float | None) -> str | None:
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, UTC).isoformat()
+
+
+def _parse_timestamp(value: Any) -> float | None:
+    if isinstance(value, int | float):
+        return float(value)
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+def _intern(value: str | None) -> str | None:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+QUERY_CALLS_SCHEMA = vol.Schema(
+    {
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("caller"): NON_EMPTY_STRING,
+        vol.Optional("direction"): vol.In(("incoming", "outgoing")),
+        vol.Optional("outcome"): vol.In(CALL_OUTCOMES),
+        vol.Optional("cursor"): NON_EMPTY_STRING,
+        vol.Optional("limit", default=50): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=500)
+        ),
+        vol.Optional("include_events", default=False): bool,
+    },
+    extra=vol.PREVENT_EXTRA,
+)
+PREWARM_TTS_SCHEMA = vol.Schema(
+    {
+        vol.Required("messages"): vol.All(
+            cv.ensure_list, vol.Length(min=1), [NON_EMPTY_STRING]
+        ),
+        vol.Optional("tts_language"): cv.string,
+    },
+    extra=vol.PREVENT_EXTRA,
+)
+
+QUERY_CALLERS_SCHEMA = vol.Schema(
+    {
+        vol.Optional("window", default="hour"): vol.In(tuple(CALLER_WINDOWS)),
+        vol.Optional("limit", default=10): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=TOP_CALLERS_CAPACITY)
+        ),
+        vol.Optional("caller"): NON_EMPTY_STRING,
+    },
+    extra=vol.PREVENT_EXTRA,
+)
+
+
+@dataclass(slots=True)
 class CallSession:
+    # Timestamps are epoch seconds; to_dict() renders them as ISO strings so the
+    # stored and exposed format is unchanged.
     internal_id: str
     direction: str = "unknown"
     state: str = "idle"
     last_event: str = "idle"
     caller: str | None = None
     parsed_caller: str | None = None
+    caller_name: str | None = None
     sip_account: int | None = None
     menu_id: str | None = None
     last_dtmf_digit: str | None = None
     last_type: str | None = None
     last_message: str | None = None
     last_audio_file: str | None = None
-    created_at: str | None = None
-    updated_at: str | None = None
-    established_at: str | None = None
-    disconnected_at: str | None = None
+    created_at: float | None = None
+    updated_at: float | None = None
+    established_at: float | None = None
+    disconnected_at: float | None = None
     event_count: int = 0
+    _cache: dict[str, Any] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name != "_cache":
+            object.__setattr__(self, "_cache", None)
 
     @property
     def active(self) -> bool:
         return self.last_event not in TERMINAL_CALL_EVENTS
 
     def to_dict(self) -> dict[str, Any]:
-        payload = asdict(self)
-        payload["active"] = self.active
-        return payload
+        """Return the cached dict projection; callers must not mutate it."""
+        if self._cache is None:
+            self._cache = {
+                "internal_id": self.internal_id,
+                "direction": self.direction,
+                "state": self.state,
+                "last_event": self.last_event,
+                "caller": self.caller,
+                "parsed_caller": self.parsed_caller,
+                "caller_name": self.caller_name,
+                "sip_account": self.sip_account,
+                "menu_id": self.menu_id,
+                "last_dtmf_digit": self.last_dtmf_digit,
+                "last_type": self.last_type,
+                "last_message": self.last_message,
+                "last_audio_file": self.last_audio_file,
+                "created_at": _iso_timestamp(self.created_at),
+                "updated_at": _iso_timestamp(self.updated_at),
+                "established_at": _iso_timestamp(self.established_at),
+                "disconnected_at": _iso_timestamp(self.disconnected_at),
+                "event_count": self.event_count,
+                "active": self.active,
+            }
+        return self._cache
+
+
+@dataclass(frozen=True, slots=True)
+class RuntimeSnapshot:
+    """Read-only view of runtime state shared by every entity for one update."""
+
+    version: int = 0
+    last_event: str = "idle"
+    last_updated: str | None = None
+    last_caller: str | None = None
+    last_caller_name: str | None = None
+    last_internal_id: str | None = None
+    last_incoming_call: dict[str, Any] | None = None
+    last_dtmf_digit: str | None = None
+    last_dtmf_updated: str | None = None
+    last_menu_id: str | None = None
+    last_message: str | None = None
+    last_audio_file: str | None = None
+    active_call_count: int = 0
+    active_call_ids: tuple[str, ...] = ()
+    active_calls: tuple[dict[str, Any], ...] = ()
+    recent_calls: tuple[dict[str, Any], ...] = ()
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "last_event": self.last_event,
+            "last_updated": self.last_updated,
+            "last_caller": self.last_caller,
+            "last_caller_name": self.last_caller_name,
+            "last_internal_id": self.last_internal_id,
+            "last_dtmf_digit": self.last_dtmf_digit,
+            "last_menu_id": self.last_menu_id,
+            "last_message": self.last_message,
+            "last_audio_file": self.last_audio_file,
+            "active_call_count": self.active_call_count,
+            "active_call_ids": list(self.active_call_ids),
+            "active_calls": list(self.active_calls),
+            "recent_calls": list(self.recent_calls),
+        }
 
 
 @dataclass
@@ -211,55 +507,109 @@ class UniFiTalkRuntimeData:
     config: dict[str, Any]
     store: Store[dict[str, Any]]
     device_id: str | None = None
-    calls: dict[str, CallSession] = field(default_factory=dict)
-    recent_events: list[dict[str, Any]] = field(default_factory=list)
+    max_calls: int = DEFAULT_MAX_CALL_SESSIONS
+    max_inactive_calls: int = DEFAULT_MAX_INACTIVE_CALL_SESSIONS
+    # Ordered least to most recently updated; touched sessions move to the end.
+    calls: OrderedDict[str, CallSession] = field(default_factory=OrderedDict)
+    active_index: dict[str, CallSession] = field(default_factory=dict)
+    # Newest first; appendleft drops the oldest entry once the buffer is full.
+    recent_events: deque[dict[str, Any]] = field(
+        default_factory=lambda: deque(maxlen=DEFAULT_EVENT_HISTORY_SIZE)
+    )
     last_payload: dict[str, Any] = field(default_factory=dict)
     last_event: str = "idle"
     last_updated: str | None = None
     last_caller: str | None = None
+    last_caller_name: str | None = None
     last_internal_id: str | None = None
     last_incoming_call: dict[str, Any] | None = None
     last_dtmf_digit: str | None = None
+    last_dtmf_updated: str | None = None
     last_menu_id: str | None = None
     last_message: str | None = None
     last_audio_file: str | None = None
+    snapshot: RuntimeSnapshot = field(default_factory=RuntimeSnapshot)
+    journal: CallJournal | None = None
+    history: CallHistory | None = None
+    ingest: WebhookIngestQueue | None = None
+    sequencer: CallEventSequencer | None = None
+    commands: CommandDispatcher | None = None
+    waiters: CallWaiters = field(default_factory=CallWaiters)
+    ivr: IvrEngine | None = None
+    dtmf: DtmfCollector | None = None
+    router: CallRouter | None = None
+    phonebook: Phonebook | None = None
+    blocklist: Blocklist | None = None
+    analytics: CallerAnalytics | None = None
+    tts_cache: TtsCache | None = None
+    announcements: AnnouncementPipeline | None = None
+    janitor: AudioCacheJanitor | None = None
+    audio: AudioPreparer | None = None
+    deduplicator: WebhookDeduplicator = field(default_factory=WebhookDeduplicator)
+    journal_seq: int = 0
+
+    def call_state(self, internal_id: str) -> str | None:
+        session = self.calls.get(internal_id)
+        return session.state if session is not None else None
 
     def active_calls(self) -> list[CallSession]:
-        return [session for session in self.calls.values() if session.active]
+        return list(self.active_index.values())
+
+    def index_call(self, session: CallSession) -> None:
+        if session.active:
+            self.active_index.setdefault(session.internal_id, session)
+        else:
+            self.active_index.pop(session.internal_id, None)
 
     def recent_call_snapshots(self, limit: int = 10) -> list[dict[str, Any]]:
-        sessions = sorted(
-            self.calls.values(),
-            key=lambda session: session.updated_at or "",
-            reverse=True,
+        return [
+            session.to_dict()
+            for session in islice(reversed(self.calls.values()), limit)
+        ]
+
+    def recent_event_log(self, limit: int | None = None) -> list[dict[str, Any]]:
+        return list(islice(self.recent_events, limit))
+
+    def refresh_snapshot(self) -> RuntimeSnapshot:
+        active = self.active_calls()
+        self.snapshot = RuntimeSnapshot(
+            version=self.snapshot.version + 1,
+            last_event=self.last_event,
+            last_updated=self.last_updated,
+            last_caller=self.last_caller,
+            last_caller_name=self.last_caller_name,
+            last_internal_id=self.last_internal_id,
+            # Copied so a later change to the runtime cannot leak into it.
+            last_incoming_call=(
+                dict(self.last_incoming_call)
+                if self.last_incoming_call is not None
+                else None
+            ),
+            last_dtmf_digit=self.last_dtmf_digit,
+            last_dtmf_updated=self.last_dtmf_updated,
+            last_menu_id=self.last_menu_id,
+            last_message=self.last_message,
+            last_audio_file=self.last_audio_file,
+            active_call_count=len(active),
+            active_call_ids=tuple(self.active_index),
+            active_calls=tuple(session.to_dict() for session in active[:5]),
+            recent_calls=tuple(self.recent_call_snapshots(5)),
         )
-        return [session.to_dict() for session in sessions[:limit]]
+        return self.snapshot
 
     def summary(self) -> dict[str, Any]:
-        active = self.active_calls()
-        return {
-            "last_event": self.last_event,
-            "last_updated": self.last_updated,
-            "last_caller": self.last_caller,
-            "last_internal_id": self.last_internal_id,
-            "last_dtmf_digit": self.last_dtmf_digit,
-            "last_menu_id": self.last_menu_id,
-            "last_message": self.last_message,
-            "last_audio_file": self.last_audio_file,
-            "active_call_count": len(active),
-            "active_call_ids": [session.internal_id for session in active],
-            "active_calls": [session.to_dict() for session in active[:5]],
-            "recent_calls": self.recent_call_snapshots(5),
-        }
+        return self.snapshot.summary()
 
 
 type UniFiTalkConfigEntry = ConfigEntry[UniFiTalkRuntimeData]
-CALL_SESSION_FIELDS = {field_info.name for field_info in fields(CallSession)}
+CALL_SESSION_FIELDS = {
+    field_info.name for field_info in fields(CallSession) if field_info.init
+}
 
 
 def _merge_entry_config(entry: ConfigEntry) -> dict[str, Any]:
     merged = dict(entry.data)
-    for key in NOTIFY_OPTION_KEYS:
+    for key in OPTION_KEYS:
         if key in entry.options:
             merged[key] = entry.options[key]
     return merged
@@ -275,17 +625,20 @@ def _serialize_runtime(runtime: UniFiTalkRuntimeData) -> dict[str, Any]:
             internal_id: session.to_dict()
             for internal_id, session in runtime.calls.items()
         },
-        "recent_events": runtime.recent_events,
+        "recent_events": list(runtime.recent_events),
         "last_payload": runtime.last_payload,
         "last_event": runtime.last_event,
         "last_updated": runtime.last_updated,
         "last_caller": runtime.last_caller,
+        "last_caller_name": runtime.last_caller_name,
         "last_internal_id": runtime.last_internal_id,
         "last_incoming_call": runtime.last_incoming_call,
         "last_dtmf_digit": runtime.last_dtmf_digit,
+        "last_dtmf_updated": runtime.last_dtmf_updated,
         "last_menu_id": runtime.last_menu_id,
         "last_message": runtime.last_message,
         "last_audio_file": runtime.last_audio_file,
+        "journal_seq": runtime.journal_seq,
     }
 
 
@@ -298,6 +651,11 @@ def _restore_call_session(
     session_data.setdefault("internal_id", internal_id)
     if not session_data.get("internal_id"):
         return None
+    for key in CALL_SESSION_TIMESTAMP_FIELDS:
+        session_data[key] = _parse_timestamp(session_data.get(key))
+    for key in ("direction", "state", "last_event", "last_type"):
+        if key in session_data:
+            session_data[key] = _intern(session_data[key])
     return CallSession(**session_data)
 
 
@@ -309,31 +667,145 @@ def _restore_runtime(
 
     calls = payload.get("calls")
     if isinstance(calls, dict):
-        runtime.calls = {}
+        sessions: list[CallSession] = []
         for internal_id, session_data in calls.items():
             if not isinstance(session_data, dict):
                 continue
             session = _restore_call_session(internal_id, session_data)
             if session is not None:
-                runtime.calls[internal_id] = session
-
-    runtime.recent_events = list(payload.get("recent_events") or [])[:25]
+                sessions.append(session)
+        sessions.sort(key=lambda session: session.updated_at or 0.0)
+        runtime.calls = OrderedDict()
+        runtime.active_index = {}
+        for session in sessions:
+            runtime.calls[session.internal_id] = session
+            runtime.index_call(session)
+
+    capacity = runtime.recent_events.maxlen
+    runtime.recent_events = deque(
+        islice(payload.get("recent_events") or [], capacity), maxlen=capacity
+    )
     runtime.last_payload = dict(payload.get("last_payload") or {})
     runtime.last_event = payload.get("last_event") or runtime.last_event
     runtime.last_updated = payload.get("last_updated")
     runtime.last_caller = payload.get("last_caller")
+    runtime.last_caller_name = payload.get("last_caller_name")
     runtime.last_internal_id = payload.get("last_internal_id")
     runtime.last_incoming_call = payload.get("last_incoming_call")
     runtime.last_dtmf_digit = payload.get("last_dtmf_digit")
+    runtime.last_dtmf_updated = payload.get("last_dtmf_updated")
     runtime.last_menu_id = payload.get("last_menu_id")
     runtime.last_message = payload.get("last_message")
     runtime.last_audio_file = payload.get("last_audio_file")
+    runtime.journal_seq = int(payload.get("journal_seq") or 0)
+    runtime.refresh_snapshot()
 
 
 def _schedule_runtime_save(runtime: UniFiTalkRuntimeData) -> None:
     runtime.store.async_delay_save(lambda: _serialize_runtime(runtime), 3.0)
 
 
+def _record_runtime_update(
+    runtime: UniFiTalkRuntimeData, payload: dict[str, Any], timestamp: str
+) -> None:
+    if runtime.history is not None:
+        session = runtime.calls.get(payload.get("internal_id") or "")
+        if session is not None:
+            runtime.history.async_record(session, payload)
+
+    if runtime.journal is None:
+        return
+
+    runtime.journal_seq += 1
+    runtime.journal.async_append(runtime.journal_seq, timestamp, payload)
+
+
+def _apply_webhook_batch(
+    hass: HomeAssistant, entry: UniFiTalkConfigEntry, payloads: list[dict[str, Any]]
+) -> None:
+    runtime = entry.runtime_data
+    if (blocklist := runtime.blocklist) is not None:
+        # Blocked calls are hung up and shed before any state or entity work.
+        payloads = [
+            payload for payload in payloads if not blocklist.async_filter(payload)
+        ]
+    if runtime.sequencer is not None:
+        payloads = runtime.sequencer.async_order(payloads, runtime.call_state)
+    if payloads:
+        _apply_webhook_events(hass, entry, payloads)
+
+
+def _apply_webhook_events(
+    hass: HomeAssistant, entry: UniFiTalkConfigEntry, payloads: list[dict[str, Any]]
+) -> None:
+    runtime = entry.runtime_data
+    applied: list[tuple[dict[str, Any], dict[str, Any]]] = []
+    pending = deque(payloads)
+    while pending:
+        payload = pending.popleft()
+        if (
+            payload.get("event") == DTMF_SEQUENCE_EVENT
+            and payload.get("internal_id") not in runtime.active_index
+        ):
+            # The call ended before its timed-out sequence was applied.
+            continue
+        dispatch_payload = _update_runtime_from_webhook(runtime, payload)
+        _record_runtime_update(runtime, payload, dispatch_payload["timestamp"])
+        applied.append((payload, dispatch_payload))
+        if runtime.dtmf is not None:
+            # A sequence applies right after the digit that completed it.
+            pending.extendleft(reversed(runtime.dtmf.async_pop_completed()))
+
+    if runtime.journal is None:
+        _schedule_runtime_save(runtime)
+    if runtime.dtmf is not None and runtime.dtmf.sequence_only:
+        # Single digits still update the runtime; only the completed sequence
+        # reaches entities and the event bus.
+        applied = [item for item in applied if item[1]["event"] != "dtmf_digit"]
+    snapshot = runtime.refresh_snapshot()
+    if not applied:
+        return
+    async_dispatcher_send(
+        hass,
+        f"{SIGNAL_CALL_STATE}_{entry.entry_id}",
+        [dispatch for _, dispatch in applied],
+        snapshot,
+    )
+    for payload, dispatch_payload in applied:
+        hass.bus.async_fire(
+            EVENT_WEBHOOK,
+            {
+                **payload,
+                **dispatch_payload,
+                "entry_id": entry.entry_id,
+                "device_id": runtime.device_id,
+            },
+        )
+
+
+def _replay_journal(
+    runtime: UniFiTalkRuntimeData, records: list[dict[str, Any]]
+) -> int:
+    replayed = 0
+    for record in records:
+        seq = record.get("seq")
+        payload = record.get("payload")
+        if not isinstance(seq, int) or seq <= runtime.journal_seq:
+            continue
+        if not isinstance(payload, dict):
+            continue
+        try:
+            now = datetime.fromisoformat(record["ts"])
+        except (KeyError, TypeError, ValueError):
+            now = None
+        _update_runtime_from_webhook(runtime, payload, now)
+        runtime.journal_seq = seq
+        replayed += 1
+    if replayed:
+        runtime.refresh_snapshot()
+    return replayed
+
+
 def _normalize_sip_target(number: str, host: str) -> str:
     target = number.strip()
     if target.startswith(("sip:", "sips:", "tel:")):
@@ -345,19 +817,6 @@ def _normalize_sip_target(number: str, host: str) -> str:
     return target
 
 
-def _state_for_event(event: str, current: str) -> str:
-    return {
-        "incoming_call": "ringing",
-        "call_established": "active",
-        "entered_menu": "menu",
-        "dtmf_digit": current if current != "idle" else "active",
-        "playback_done": current if current != "idle" else "active",
-        "ring_timeout": "timed_out",
-        "timeout": "timed_out",
-        "call_disconnected": "disconnected",
-    }.get(event, current)
-
-
 def _compose_message(message: str, title: str | None) -> str:
     clean_message = message.strip()
     clean_title = (title or "").strip()
@@ -371,6 +830,7 @@ def _build_menu_message(
     title: str | None = None,
     tts_language: str | None = None,
     hangup_after_speaking: bool = False,
+    cache_audio: bool = False,
 ) -> dict[str, Any]:
     menu: dict[str, Any] = {
         "message": _compose_message(message, title),
@@ -378,9 +838,121 @@ def _build_menu_message(
     }
     if tts_language:
         menu["language"] = tts_language
+    if cache_audio:
+        menu["cache_audio"] = True
     return menu
 
 
+def _parse_announce_groups(value: str | None) -> dict[str, list[str]]:
+    groups: dict[str, list[str]] = {}
+    for line in (value or "").splitlines():
+        name, sep, members = line.partition(":")
+        if not sep or not name.strip():
+            continue
+        groups[name.strip().lower()] = [
+            member.strip() for member in members.split(",") if member.strip()
+        ]
+    return groups
+
+
+def _resolve_broadcast_targets(
+    runtime: UniFiTalkRuntimeData, data: dict[str, Any]
+) -> list[str]:
+    targets = list(data.get("targets", []))
+    groups = _parse_announce_groups(runtime.config.get(CONF_ANNOUNCE_GROUPS))
+    for name in data.get("groups", []):
+        members = groups.get(name.strip().lower())
+        if members is None:
+            raise ServiceValidationError(
+                f"Unknown announcement group '{name}'. Define it in the UniFi Talk "
+                "integration options.",
+            )
+        targets.extend(members)
+    return list(dict.fromkeys(targets))
+
+
+async def _async_dial_and_wait(
+    hass: HomeAssistant,
+    runtime: UniFiTalkRuntimeData,
+    payload: dict[str, Any],
+    events: frozenset[str],
+    timeout: float,
+) -> tuple[str | None, dict[str, Any] | None]:
+    """Send a dial command and wait for one of ``events`` on the new call.
+
+    Returns the call's ``internal_id`` (if any event arrived) and the event that
+    ended the wait, or ``None`` when the timeout expired first.
+    """
+    waiter = runtime.waiters.async_add(payload["number"], events)
+    try:
+        await _stdin(hass, payload)
+        runtime.waiters.async_set_timeout(waiter, timeout)
+        event = await waiter.future
+    finally:
+        runtime.waiters.async_remove(waiter)
+    return waiter.internal_id, event
+
+
+async def _async_dial_response(
+    hass: HomeAssistant,
+    runtime: UniFiTalkRuntimeData,
+    call: ServiceCall,
+    payload: dict[str, Any],
+) -> ServiceResponse:
+    if not call.return_response:
+        await _stdin(hass, payload)
+        return None
+    internal_id, event = await _async_dial_and_wait(
+        hass,
+        runtime,
+        payload,
+        CALL_WAIT_EVENTS[call.data["wait_for"]],
+        call.data["timeout"],
+    )
+    session = runtime.calls.get(internal_id or "")
+    return {
+        "internal_id": internal_id,
+        "number": payload["number"],
+        "event": event["event"] if event else None,
+        "state": session.state if session else None,
+        "timed_out": event is None,
+    }
+
+
+async def _broadcast_leg(
+    hass: HomeAssistant,
+    runtime: UniFiTalkRuntimeData,
+    target: str,
+    payload: dict[str, Any],
+    wait: float | None,
+    fan_out: asyncio.Semaphore,
+) -> dict[str, Any]:
+    result: dict[str, Any] = {"target": target, "internal_id": None}
+    try:
+        async with fan_out:
+            if wait is None:
+                await _stdin(hass, payload)
+                return {**result, "outcome": "dialed"}
+            internal_id, event = await _async_dial_and_wait(
+                hass, runtime, payload, CALL_WAIT_EVENTS["call_established"], wait
+            )
+    except HomeAssistantError as err:
+        return {**result, "outcome": "failed", "error": str(err)}
+
+    result["internal_id"] = internal_id
+    if event is None:
+        result["outcome"] = "failed"
+        result["error"] = "No call events received"
+    elif event["event"] == "call_established":
+        result["outcome"] = "answered"
+    elif event["event"] == "ring_timeout":
+        result["outcome"] = "ring_timeout"
+    else:
+        result["outcome"] = "failed"
+        result["error"] = f"Call ended with {event['event']}"
+    return result
+
+
 def _get_runtime(hass: HomeAssistant) -> UniFiTalkRuntimeData:
     for entry in hass.config_entries.async_entries(DOMAIN):
         if entry.state is ConfigEntryState.LOADED and entry.runtime_data is not None:
@@ -397,6 +969,162 @@ async def _stdin(hass: HomeAssistant, payload: dict[str, Any]) -> None:
             "The Home Assistant Supervisor add-on API is not available.",
         )
 
+    runtime = _get_runtime(hass)
+    if runtime.commands is None:
+        await _send_stdin(hass, payload)
+        return
+    await runtime.commands.async_submit(payload)
+
+
+async def _async_prepare_payload(
+    runtime: UniFiTalkRuntimeData, payload: dict[str, Any]
+) -> AsyncIterator[dict[str, Any]]:
+    """Prepare a command before the dispatcher sends it to ha-sip.
+
+    TTS messages are pre-rendered first, then every audio file a part plays,
+    rendered or not, is swapped for its telephony-ready copy.
+    """
+    if runtime.tts_cache is None:
+        yield await _async_prepare_audio(runtime.audio, payload)
+        return
+    parts = _async_prerender_payload(runtime, runtime.tts_cache, payload)
+    async with aclosing(parts):
+        async for part in parts:
+            yield await _async_prepare_audio(runtime.audio, part)
+
+
+async def _async_prepare_audio(
+    audio: AudioPreparer | None, payload: dict[str, Any]
+) -> dict[str, Any]:
+    if audio is None:
+        return payload
+    command = payload.get("command")
+    if command in (SERVICE_DIAL, SERVICE_ANSWER) and payload.get("menu"):
+        menu = await _async_prepare_menu_audio(audio, payload["menu"])
+        return {**payload, "menu": menu}
+    if command == SERVICE_PLAY_AUDIO_FILE and payload.get("audio_file"):
+        if (audio_file := await audio.async_prepare(payload["audio_file"])) is not None:
+            return {**payload, "audio_file": audio_file}
+    return payload
+
+
+async def _async_prepare_menu_audio(audio: AudioPreparer, menu: Any) -> Any:
+    if not isinstance(menu, dict):
+        return menu
+    prepared = dict(menu)
+    if isinstance(source := menu.get("audio_file"), str) and source:
+        if (audio_file := await audio.async_prepare(source)) is not None:
+            prepared["audio_file"] = audio_file
+    if isinstance(choices := menu.get("choices"), dict):
+        children = await asyncio.gather(
+            *(_async_prepare_menu_audio(audio, choice) for choice in choices.values())
+        )
+        prepared["choices"] = dict(zip(choices, children, strict=True))
+    return prepared
+
+
+async def _async_prerender_payload(
+    runtime: UniFiTalkRuntimeData, tts_cache: TtsCache, payload: dict[str, Any]
+) -> AsyncIterator[dict[str, Any]]:
+    """Swap TTS messages in a command for audio rendered by Home Assistant.
+
+    Anything that cannot be rendered in time is left as a message, so ha-sip
+    falls back to live TTS. Dial and answer menus never wait for rendering:
+    call control goes out at once, using audio only where it is already cached,
+    and missing messages render in the background for the next call. A long
+    ``play_message`` on a known call is played one sentence at a time: later
+    sentences render while earlier ones play, and each is sent once ha-sip
+    reports ``playback_done`` for the one before. The dispatcher sends those
+    later sentences outside the call's lock and stops them when another command
+    for the call arrives.
+    """
+    command = payload.get("command")
+    if command in (SERVICE_DIAL, SERVICE_ANSWER) and payload.get("menu"):
+        yield {
+            **payload,
+            "menu": _prerender_menu(tts_cache, payload["menu"]),
+        }
+        return
+    if command != SERVICE_PLAY_MESSAGE:
+        yield payload
+        return
+
+    language = payload.get("tts_language")
+    chunks = tts_cache.split_message(payload["message"])
+    internal_id = _resolve_call_id(runtime, payload["number"])
+    if len(chunks) == 1 or internal_id is None:
+        yield await _async_prerender_message(tts_cache, payload, payload["message"])
+        return
+
+    tts_cache.async_prefetch(chunks, language)
+    for chunk in chunks[:-1]:
+        part = await _async_prerender_message(tts_cache, payload, chunk)
+        waiter = runtime.waiters.async_add_for_call(
+            internal_id, CALL_WAIT_EVENTS["playback_done"], TTS_CHUNK_PLAYBACK_TIMEOUT
+        )
+        try:
+            yield part
+            event = await waiter.future
+        finally:
+            runtime.waiters.async_remove(waiter)
+        if event is None or event["event"] != "playback_done":
+            # The call ended, or playback never reported back.
+            return
+    yield await _async_prerender_message(tts_cache, payload, chunks[-1])
+
+
+async def _async_prerender_message(
+    tts_cache: TtsCache, payload: dict[str, Any], message: str
+) -> dict[str, Any]:
+    audio_file = await tts_cache.async_prerender(message, payload.get("tts_language"))
+    if audio_file is None:
+        return {**payload, "message": message}
+    prepared = {
+        key: value
+        for key, value in payload.items()
+        if key not in ("message", "tts_language")
+    }
+    return {**prepared, "command": SERVICE_PLAY_AUDIO_FILE, "audio_file": audio_file}
+
+
+def _resolve_call_id(runtime: UniFiTalkRuntimeData, number: str) -> str | None:
+    """Return the active call a command targets, by internal ID or remote party."""
+    if number in runtime.active_index:
+        return number
+    key = target_key(number)
+    for session in runtime.active_index.values():
+        if key in (
+            session.internal_id.lower(),
+            target_key(session.parsed_caller),
+            target_key(session.caller),
+        ):
+            return session.internal_id
+    return None
+
+
+def _command_key(runtime: UniFiTalkRuntimeData, number: str) -> str:
+    """Return the key that serializes commands addressed to the same call."""
+    return _resolve_call_id(runtime, number) or target_key(number) or number
+
+
+def _prerender_menu(tts_cache: TtsCache, menu: Any) -> Any:
+    if not isinstance(menu, dict):
+        return menu
+    prepared = dict(menu)
+    message = menu.get("message")
+    if isinstance(message, str) and message and not menu.get("audio_file"):
+        audio_file = tts_cache.async_lookup_or_render(message, menu.get("language"))
+        if audio_file is not None:
+            del prepared["message"]
+            prepared["audio_file"] = audio_file
+    if isinstance(choices := menu.get("choices"), dict):
+        prepared["choices"] = {
+            key: _prerender_menu(tts_cache, choice) for key, choice in choices.items()
+        }
+    return prepared
+
+
+async def _send_stdin(hass: HomeAssistant, payload: dict[str, Any]) -> None:
     await hass.services.async_call(
         "hassio",
         "addon_stdin",
@@ -408,8 +1136,7 @@ async def _stdin(hass: HomeAssistant, payload: dict[str, Any]) -> None:
 def _append_recent_event(
     runtime: UniFiTalkRuntimeData, event_data: dict[str, Any], now: str
 ) -> None:
-    runtime.recent_events.insert(
-        0,
+    runtime.recent_events.appendleft(
         {
             "timestamp": now,
             "event": event_data.get("event"),
@@ -419,52 +1146,65 @@ def _append_recent_event(
             "digit": event_data.get("digit"),
         },
     )
-    del runtime.recent_events[25:]
 
 
 def _prune_call_sessions(runtime: UniFiTalkRuntimeData) -> None:
-    if len(runtime.calls) <= 25:
+    if len(runtime.calls) <= runtime.max_calls:
         return
 
-    active_ids = {session.internal_id for session in runtime.active_calls()}
-    inactive_sessions = sorted(
-        (session for session in runtime.calls.values() if not session.active),
-        key=lambda session: session.updated_at or "",
-        reverse=True,
-    )
-    keep_ids = active_ids | {session.internal_id for session in inactive_sessions[:15]}
-    runtime.calls = {
-        internal_id: session
-        for internal_id, session in runtime.calls.items()
-        if internal_id in keep_ids
-    }
+    excess = len(runtime.calls) - len(runtime.active_index) - runtime.max_inactive_calls
+    if excess <= 0:
+        return
+
+    evicted: list[str] = []
+    for internal_id in runtime.calls:
+        if internal_id in runtime.active_index:
+            continue
+        evicted.append(internal_id)
+        if len(evicted) >= excess:
+            break
+    for internal_id in evicted:
+        del runtime.calls[internal_id]
 
 
 def _update_runtime_from_webhook(
-    runtime: UniFiTalkRuntimeData, payload: dict[str, Any]
+    runtime: UniFiTalkRuntimeData,
+    payload: dict[str, Any],
+    now_dt: datetime | None = None,
 ) -> dict[str, Any]:
-    now = datetime.now(UTC).isoformat()
-    event = payload.get("event") or "idle"
+    now_dt = now_dt or datetime.now(UTC)
+    now = now_dt.isoformat()
+    now_ts = now_dt.timestamp()
+    event = _intern(payload.get("event") or "idle")
     internal_id = payload.get("internal_id")
     parsed_caller = payload.get("parsed_caller")
     caller = payload.get("caller")
+    caller_name = payload.get("caller_name")
+    if caller_name is None and runtime.phonebook is not None:
+        caller_name = runtime.phonebook.lookup(parsed_caller or caller)
 
     runtime.last_payload = dict(payload)
     runtime.last_event = event
     runtime.last_updated = now
-    runtime.last_caller = parsed_caller or caller or runtime.last_caller
+    if parsed_caller or caller:
+        runtime.last_caller = parsed_caller or caller
+        runtime.last_caller_name = caller_name
     runtime.last_internal_id = internal_id or runtime.last_internal_id
 
     if event == "incoming_call":
+        if runtime.analytics is not None:
+            runtime.analytics.record(parsed_caller or caller, now_ts)
         runtime.last_incoming_call = {
             "timestamp": now,
             "caller": caller,
             "parsed_caller": parsed_caller,
+            "caller_name": caller_name,
             "sip_account": payload.get("sip_account"),
             "internal_id": internal_id,
         }
     if event == "dtmf_digit":
         runtime.last_dtmf_digit = payload.get("digit")
+        runtime.last_dtmf_updated = now
     if event == "entered_menu":
         runtime.last_menu_id = payload.get("menu_id")
     if event == "playback_done":
@@ -479,37 +1219,47 @@ def _update_runtime_from_webhook(
             session = CallSession(
                 internal_id=internal_id,
                 direction="incoming" if event == "incoming_call" else "outgoing",
-                created_at=now,
+                created_at=now_ts,
             )
             runtime.calls[internal_id] = session
+        else:
+            runtime.calls.move_to_end(internal_id)
 
         if event == "incoming_call":
             session.direction = "incoming"
         elif session.direction == "unknown":
             session.direction = "outgoing"
 
-        session.state = _state_for_event(event, session.state)
-        session.last_event = event
+        # A completed DTMF sequence reports on the call but is not a step in it.
+        synthetic = event == DTMF_SEQUENCE_EVENT
+        if not synthetic:
+            session.state = state_for_event(event, session.state)
+            session.last_event = event
+            session.event_count += 1
         session.caller = caller or session.caller
         session.parsed_caller = parsed_caller or session.parsed_caller
+        session.caller_name = caller_name or session.caller_name
         session.sip_account = payload.get("sip_account", session.sip_account)
-        session.updated_at = now
-        session.event_count += 1
+        session.updated_at = now_ts
 
         if payload.get("menu_id"):
-            session.menu_id = payload["menu_id"]
+            session.menu_id = _intern(payload["menu_id"])
         if payload.get("digit"):
             session.last_dtmf_digit = payload["digit"]
         if payload.get("type"):
-            session.last_type = payload["type"]
+            session.last_type = _intern(payload["type"])
         if payload.get("message"):
             session.last_message = payload["message"]
         if payload.get("audio_file"):
             session.last_audio_file = payload["audio_file"]
         if event == "call_established" and session.established_at is None:
-            session.established_at = now
+            session.established_at = now_ts
         if event in TERMINAL_CALL_EVENTS:
-            session.disconnected_at = now
+            session.disconnected_at = now_ts
+        runtime.index_call(session)
+        runtime.waiters.async_resolve(session, event, payload)
+        if not synthetic:
+            _handle_call_event(runtime, session, payload)
 
     _prune_call_sessions(runtime)
     return {
@@ -517,22 +1267,39 @@ def _update_runtime_from_webhook(
         "internal_id": internal_id,
         "caller": caller,
         "parsed_caller": parsed_caller,
+        "caller_name": caller_name,
         "digit": payload.get("digit"),
+        "digits": payload.get("digits"),
         "menu_id": payload.get("menu_id"),
         "sip_account": payload.get("sip_account"),
         "timestamp": now,
     }
 
 
+def _handle_call_event(
+    runtime: UniFiTalkRuntimeData, session: CallSession, payload: dict[str, Any]
+) -> None:
+    if runtime.announcements is not None:
+        runtime.announcements.async_handle_event(session)
+    # A routed call is already handled; the IVR must not answer it too.
+    routed = runtime.router is not None and runtime.router.async_handle_event(session)
+    if runtime.ivr is not None and not routed:
+        runtime.ivr.async_handle_event(session, payload)
+    if runtime.dtmf is not None:
+        runtime.dtmf.async_handle_event(session, payload)
+
+
 def _register_services(hass: HomeAssistant) -> None:
     if hass.data[DOMAIN][DATA_SERVICES_REGISTERED]:
         return
 
-    async def dial(call: ServiceCall) -> None:
+    async def dial(call: ServiceCall) -> ServiceResponse:
         runtime = _get_runtime(hass)
         host = runtime.config[CONF_SIP_HOST]
-        await _stdin(
+        return await _async_dial_response(
             hass,
+            runtime,
+            call,
             {
                 "command": SERVICE_DIAL,
                 "number": _normalize_sip_target(call.data["number"], host),
@@ -641,25 +1408,44 @@ def _register_services(hass: HomeAssistant) -> None:
             },
         )
 
-    async def announce(call: ServiceCall) -> None:
+    async def announce(call: ServiceCall) -> ServiceResponse:
         runtime = _get_runtime(hass)
         host = runtime.config[CONF_SIP_HOST]
-        await _stdin(
-            hass,
-            {
-                "command": SERVICE_DIAL,
-                "number": _normalize_sip_target(call.data["number"], host),
-                "ring_timeout": call.data["ring_timeout"],
-                "sip_account": call.data["sip_account"],
-                "webhook_to_call": call.data.get("webhook_to_call", {}),
-                "menu": _build_menu_message(
-                    message=call.data["message"],
-                    title=call.data.get("title"),
-                    tts_language=call.data.get("tts_language"),
-                    hangup_after_speaking=call.data["hangup_after_speaking"],
-                ),
-            },
+        menu = _build_menu_message(
+            message=call.data["message"],
+            title=call.data.get("title"),
+            tts_language=call.data.get("tts_language"),
+            hangup_after_speaking=call.data["hangup_after_speaking"],
         )
+        payload = {
+            "command": SERVICE_DIAL,
+            "number": _normalize_sip_target(call.data["number"], host),
+            "ring_timeout": call.data["ring_timeout"],
+            "sip_account": call.data["sip_account"],
+            "webhook_to_call": call.data.get("webhook_to_call", {}),
+            "menu": menu,
+        }
+        pipeline = runtime.announcements
+        if pipeline is None or pipeline.tts_cache.async_lookup(
+            menu["message"], menu.get("language")
+        ):
+            return await _async_dial_response(hass, runtime, call, payload)
+
+        # Render while the phone rings; the message is played once answered.
+        announcement = pipeline.async_add(
+            payload["number"],
+            menu["message"],
+            menu.get("language"),
+            call.data["hangup_after_speaking"],
+            call.data["ring_timeout"] + CALL_EVENT_GRACE,
+        )
+        try:
+            return await _async_dial_response(
+                hass, runtime, call, {**payload, "menu": {}}
+            )
+        except HomeAssistantError:
+            pipeline.async_discard(announcement)
+            raise
 
     async def answer_and_speak(call: ServiceCall) -> None:
         await _stdin(
@@ -677,7 +1463,156 @@ def _register_services(hass: HomeAssistant) -> None:
             },
         )
 
-    hass.services.async_register(DOMAIN, SERVICE_DIAL, dial, schema=DIAL_SCHEMA)
+    async def broadcast_announce(call: ServiceCall) -> ServiceResponse:
+        runtime = _get_runtime(hass)
+        host = runtime.config[CONF_SIP_HOST]
+        targets = _resolve_broadcast_targets(runtime, call.data)
+        # ha-sip renders the shared message once and reuses it for every leg.
+        menu = _build_menu_message(
+            message=call.data["message"],
+            title=call.data.get("title"),
+            tts_language=call.data.get("tts_language"),
+            hangup_after_speaking=call.data["hangup_after_speaking"],
+            cache_audio=True,
+        )
+        wait = (
+            call.data["ring_timeout"] + CALL_EVENT_GRACE
+            if call.return_response
+            else None
+        )
+        # Each leg also takes its own dial_rate_limit slot in the dispatcher.
+        fan_out = asyncio.Semaphore(
+            runtime.config.get(CONF_BROADCAST_MAX_LEGS, DEFAULT_BROADCAST_MAX_LEGS)
+        )
+        results = await asyncio.gather(
+            *(
+                _broadcast_leg(
+                    hass,
+                    runtime,
+                    target,
+                    {
+                        "command": SERVICE_DIAL,
+                        "number": _normalize_sip_target(target, host),
+                        "ring_timeout": call.data["ring_timeout"],
+                        "sip_account": call.data["sip_account"],
+                        "menu": menu,
+                    },
+                    wait,
+                    fan_out,
+                )
+                for target in targets
+            )
+        )
+        if not call.return_response:
+            return None
+        summary = {"answered": 0, "ring_timeout": 0, "failed": 0}
+        for result in results:
+            summary[result["outcome"]] += 1
+        return {"targets": list(results), **summary}
+
+    async def start_ivr(call: ServiceCall) -> None:
+        runtime = _get_runtime(hass)
+        if runtime.ivr is None:
+            raise ServiceValidationError(
+                "No IVR definition is loaded. Set an IVR file in the UniFi Talk "
+                "integration options.",
+            )
+        menu = call.data.get("menu")
+        if menu is not None and menu not in runtime.ivr.definition.menus:
+            raise ServiceValidationError(f"Unknown IVR menu '{menu}'.")
+        runtime.ivr.async_start(call.data["internal_id"], menu)
+
+    async def wait_for_event(call: ServiceCall) -> ServiceResponse:
+        runtime = _get_runtime(hass)
+        internal_id = call.data["internal_id"]
+        session = runtime.calls.get(internal_id)
+        if session is not None and not session.active:
+            # The call already ended; a terminal event would end the wait anyway.
+            return {
+                "internal_id": internal_id,
+                "event": session.last_event,
+                "timed_out": False,
+            }
+
+        waiter = runtime.waiters.async_add_for_call(
+            internal_id, frozenset(call.data["event"]), call.data["timeout"]
+        )
+        try:
+            event = await waiter.future
+        finally:
+            runtime.waiters.async_remove(waiter)
+        if event is None:
+            return {"internal_id": internal_id, "event": None, "timed_out": True}
+        return {**event, "timed_out": False}
+
+    async def query_calls(call: ServiceCall) -> ServiceResponse:
+        runtime = _get_runtime(hass)
+        if runtime.history is None:
+            raise ServiceValidationError(
+                "Call history is not enabled in the UniFi Talk integration options.",
+            )
+        return await runtime.history.async_query(
+            start=dt_util.as_utc(call.data["start"]) if "start" in call.data else None,
+            end=dt_util.as_utc(call.data["end"]) if "end" in call.data else None,
+            caller=call.data.get("caller"),
+            direction=call.data.get("direction"),
+            outcome=call.data.get("outcome"),
+            cursor=call.data.get("cursor"),
+            limit=call.data["limit"],
+            include_events=call.data["include_events"],
+        )
+
+    async def query_callers(call: ServiceCall) -> ServiceResponse:
+        runtime = _get_runtime(hass)
+        if runtime.analytics is None:
+            raise ServiceValidationError(
+                "Caller analytics are not enabled in the UniFi Talk integration "
+                "options.",
+            )
+        now = dt_util.utcnow().timestamp()
+        window = call.data["window"]
+        callers = runtime.analytics.top_callers(window, call.data["limit"], now)
+        if runtime.phonebook is not None:
+            for item in callers:
+                item["caller_name"] = runtime.phonebook.lookup(item["caller"])
+        response: dict[str, Any] = {
+            "window": window,
+            "total_calls": runtime.analytics.totals(now)[window],
+            "callers": callers,
+        }
+        if "caller" in call.data:
+            response["estimated_calls"] = runtime.analytics.estimate(
+                call.data["caller"], now
+            )
+        return response
+
+    async def prewarm_tts(call: ServiceCall) -> ServiceResponse:
+        runtime = _get_runtime(hass)
+        if runtime.tts_cache is None:
+            raise ServiceValidationError(
+                "TTS pre-rendering is not enabled in the UniFi Talk integration "
+                "options.",
+            )
+        messages = list(dict.fromkeys(call.data["messages"]))
+        language = call.data.get("tts_language")
+        files = await asyncio.gather(
+            *(
+                runtime.tts_cache.async_prerender(message, language)
+                for message in messages
+            )
+        )
+        if not call.return_response:
+            return None
+        rendered = sum(audio_file is not None for audio_file in files)
+        return {"rendered": rendered, "failed": len(files) - rendered}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DIAL,
+        dial,
+        schema=DIAL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
     hass.services.async_register(DOMAIN, SERVICE_HANGUP, hangup, schema=HANGUP_SCHEMA)
     hass.services.async_register(
         DOMAIN, SERVICE_SEND_DTMF, send_dtmf, schema=DTMF_SCHEMA
@@ -702,7 +1637,11 @@ def _register_services(hass: HomeAssistant) -> None:
     )
     hass.services.async_register(DOMAIN, SERVICE_ANSWER, answer, schema=ANSWER_SCHEMA)
     hass.services.async_register(
-        DOMAIN, SERVICE_ANNOUNCE, announce, schema=ANNOUNCE_SCHEMA
+        DOMAIN,
+        SERVICE_ANNOUNCE,
+        announce,
+        schema=ANNOUNCE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(
         DOMAIN,
@@ -710,6 +1649,44 @@ def _register_services(hass: HomeAssistant) -> None:
         answer_and_speak,
         schema=ANSWER_AND_SPEAK_SCHEMA,
     )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BROADCAST_ANNOUNCE,
+        broadcast_announce,
+        schema=BROADCAST_ANNOUNCE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_IVR, start_ivr, schema=START_IVR_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_WAIT_FOR_EVENT,
+        wait_for_event,
+        schema=WAIT_FOR_EVENT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_CALLS,
+        query_calls,
+        schema=QUERY_CALLS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PREWARM_TTS,
+        prewarm_tts,
+        schema=PREWARM_TTS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_CALLERS,
+        query_callers,
+        schema=QUERY_CALLERS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
     hass.data[DOMAIN][DATA_SERVICES_REGISTERED] = True
 
 
@@ -734,6 +1711,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: UniFiTalkConfigEntry) ->
         ) from err
 
     config = _merge_entry_config(entry)
+    webhook_id = config.get(CONF_WEBHOOK_ID)
+    if not webhook_id:
+        raise ConfigEntryNotReady("Missing webhook ID in config entry data")
+
     store = Store[dict[str, Any]](
         hass, STORAGE_VERSION, _runtime_storage_key(entry.entry_id)
     )
@@ -741,38 +1722,221 @@ async def async_setup_entry(hass: HomeAssistant, entry: UniFiTalkConfigEntry) ->
         config=config,
         store=store,
         device_id=async_ensure_device(hass, entry),
+        max_calls=config.get(CONF_MAX_CALL_SESSIONS, DEFAULT_MAX_CALL_SESSIONS),
+        max_inactive_calls=config.get(
+            CONF_MAX_INACTIVE_CALL_SESSIONS, DEFAULT_MAX_INACTIVE_CALL_SESSIONS
+        ),
+        recent_events=deque(
+            maxlen=config.get(CONF_EVENT_HISTORY_SIZE, DEFAULT_EVENT_HISTORY_SIZE)
+        ),
     )
     _restore_runtime(entry.runtime_data, await store.async_load())
 
-    entry.async_on_unload(entry.add_update_listener(_async_reload_entry))
+    if phonebook_file := config.get(CONF_PHONEBOOK_FILE):
+        phonebook = Phonebook(hass, hass.config.path(phonebook_file))
+        await phonebook.async_load()
+        phonebook.async_start()
+        entry.async_on_unload(phonebook.async_stop)
+        entry.runtime_data.phonebook = phonebook
+
+    journal = CallJournal(
+        hass,
+        hass.config.path(".storage", f"{_runtime_storage_key(entry.entry_id)}.journal"),
+        store,
+        partial(_serialize_runtime, entry.runtime_data),
+    )
+    if _replay_journal(entry.runtime_data, await journal.async_load()):
+        await journal.async_compact()
+    if config.get(CONF_PERSISTENCE_MODE) == PERSISTENCE_JOURNAL:
+        entry.runtime_data.journal = journal
+        journal.async_start()
+        entry.async_on_unload(journal.async_stop)
+    else:
+        await journal.async_remove()
+
+    if config.get(CONF_CALL_HISTORY):
+        history = CallHistory(
+            hass,
+            hass.config.path(f"{DOMAIN}_call_history.db"),
+            config.get(
+                CONF_CALL_HISTORY_RETENTION_DAYS, DEFAULT_CALL_HISTORY_RETENTION_DAYS
+            ),
+        )
+        await history.async_setup()
+        entry.async_on_unload(history.async_stop)
+        entry.runtime_data.history = history
+
+    ingest = WebhookIngestQueue(
+        hass,
+        partial(_apply_webhook_batch, hass, entry),
+        config.get(CONF_WEBHOOK_QUEUE_SIZE, DEFAULT_WEBHOOK_QUEUE_SIZE),
+    )
+    ingest.async_start(entry)
+    entry.runtime_data.ingest = ingest
+    entry.runtime_data.sequencer = CallEventSequencer(
+        hass, partial(_apply_webhook_events, hass, entry)
+    )
 
-    webhook_id = config.get(CONF_WEBHOOK_ID)
-    if not webhook_id:
-        raise ConfigEntryNotReady("Missing webhook ID in config entry data")
+    cache_dir = config.get(CONF_CACHE_DIR, DEFAULT_CACHE_DIR)
+    tts_cache: TtsCache | None = None
+    if config.get(CONF_TTS_PRERENDER):
+        tts_cache = TtsCache(
+            hass,
+            cache_dir,
+            config.get(CONF_TTS_ENGINE_ID, DEFAULT_TTS_ENGINE_ID),
+            config.get(CONF_TTS_LANGUAGE, DEFAULT_TTS_LANGUAGE) or None,
+            config.get(CONF_TTS_VOICE) or None,
+            config.get(CONF_TTS_CACHE_SIZE_MB, DEFAULT_TTS_CACHE_SIZE_MB) * 1024 * 1024,
+            config.get(CONF_TTS_SENTENCE_CHUNKS, True),
+        )
+        await tts_cache.async_load()
+        entry.runtime_data.tts_cache = tts_cache
+        entry.runtime_data.announcements = AnnouncementPipeline(
+            hass, entry, tts_cache, partial(_stdin, hass)
+        )
+
+    if config.get(CONF_AUDIO_PREPARE):
+        audio = AudioPreparer(
+            hass,
+            cache_dir,
+            config.get(CONF_AUDIO_SAMPLE_RATE, DEFAULT_AUDIO_SAMPLE_RATE),
+            Store[dict[str, Any]](
+                hass,
+                STORAGE_VERSION,
+                f"{_runtime_storage_key(entry.entry_id)}_audio_sources",
+            ),
+        )
+        await audio.async_load()
+        entry.runtime_data.audio = audio
+
+    max_mb = config.get(CONF_AUDIO_CACHE_MAX_MB, DEFAULT_AUDIO_CACHE_MAX_MB)
+    max_age_days = config.get(
+        CONF_AUDIO_CACHE_MAX_AGE_DAYS, DEFAULT_AUDIO_CACHE_MAX_AGE_DAYS
+    )
+    if max_mb or max_age_days:
+        janitor = AudioCacheJanitor(
+            hass,
+            entry,
+            cache_dir,
+            Store[dict[str, Any]](
+                hass,
+                STORAGE_VERSION,
+                f"{_runtime_storage_key(entry.entry_id)}_audio_cache",
+            ),
+            max_mb * 1024 * 1024,
+            timedelta(days=max_age_days) if max_age_days else None,
+            (os.path.join(cache_dir, TTS_CACHE_SUBDIR),),
+            partial(
+                async_dispatcher_send, hass, f"{SIGNAL_AUDIO_CACHE}_{entry.entry_id}"
+            ),
+        )
+        await janitor.async_load()
+        janitor.async_start()
+        entry.async_on_unload(janitor.async_stop)
+        entry.runtime_data.janitor = janitor
+
+    entry.runtime_data.commands = CommandDispatcher(
+        hass,
+        partial(_send_stdin, hass),
+        config.get(CONF_MAX_CONCURRENT_COMMANDS, DEFAULT_MAX_CONCURRENT_COMMANDS),
+        config.get(CONF_DIAL_RATE_LIMIT, DEFAULT_DIAL_RATE_LIMIT),
+        partial(
+            async_dispatcher_send, hass, f"{SIGNAL_COMMAND_QUEUE}_{entry.entry_id}"
+        ),
+        (
+            partial(_async_prepare_payload, entry.runtime_data)
+            if tts_cache or entry.runtime_data.audio
+            else None
+        ),
+        partial(_command_key, entry.runtime_data),
+    )
+    entry.async_on_unload(entry.runtime_data.commands.async_stop)
+
+    if blocklist_file := config.get(CONF_BLOCKLIST_FILE):
+        blocklist = Blocklist(
+            hass,
+            entry,
+            hass.config.path(blocklist_file),
+            hass.config.path(
+                ".storage", f"{_runtime_storage_key(entry.entry_id)}.blocklist"
+            ),
+            partial(_stdin, hass),
+            partial(
+                async_dispatcher_send, hass, f"{SIGNAL_BLOCKLIST}_{entry.entry_id}"
+            ),
+            config.get(CONF_BLOCKLIST_NATIONAL_MATCH, False),
+        )
+        await blocklist.async_load()
+        blocklist.async_start()
+        entry.async_on_unload(blocklist.async_stop)
+        entry.runtime_data.blocklist = blocklist
+
+    if config.get(CONF_CALLER_ANALYTICS):
+        entry.runtime_data.analytics = CallerAnalytics()
+
+    if config.get(CONF_DTMF_COLLECT):
+        entry.runtime_data.dtmf = DtmfCollector(
+            hass,
+            lambda payload: ingest.async_put([payload]),
+            config.get(CONF_DTMF_TERMINATOR, DEFAULT_DTMF_TERMINATOR),
+            config.get(CONF_DTMF_MAX_LENGTH, DEFAULT_DTMF_MAX_LENGTH),
+            config.get(CONF_DTMF_TIMEOUT, DEFAULT_DTMF_TIMEOUT),
+            config.get(CONF_DTMF_SEQUENCE_ONLY, False),
+        )
+
+    if ivr_file := config.get(CONF_IVR_FILE):
+        definition = await async_load_ivr(hass, hass.config.path(ivr_file))
+        if definition is not None:
+            host = config[CONF_SIP_HOST]
+            entry.runtime_data.ivr = IvrEngine(
+                hass,
+                entry,
+                definition,
+                entry.runtime_data.commands.async_submit,
+                lambda target: _normalize_sip_target(target, host),
+            )
+
+    if call_routes := config.get(CONF_CALL_ROUTES):
+        try:
+            table = RoutingTable(parse_routes(call_routes))
+        except vol.Invalid as err:
+            _LOGGER.error("Invalid call routes: %s", err)
+        else:
+            host = config[CONF_SIP_HOST]
+            entry.runtime_data.router = CallRouter(
+                hass,
+                entry,
+                table,
+                entry.runtime_data.commands.async_submit,
+                lambda target: _normalize_sip_target(target, host),
+                entry.runtime_data.ivr,
+            )
+
+    entry.async_on_unload(entry.add_update_listener(_async_reload_entry))
 
     async def _handle_webhook(
         hass: HomeAssistant, webhook_id: str, request: web.Request
     ) -> web.Response:
         del webhook_id
         try:
-            payload = await request.json()
+            body = await request.json()
         except ValueError:
             return web.Response(status=400, text="Expected JSON payload")
+        # A relay may batch a burst of events into one request as a JSON array.
+        payloads = body if isinstance(body, list) else [body]
+        if not all(isinstance(payload, dict) for payload in payloads):
+            return web.Response(
+                status=400, text="Expected a JSON object or an array of objects"
+            )
 
-        dispatch_payload = _update_runtime_from_webhook(entry.runtime_data, payload)
-        _schedule_runtime_save(entry.runtime_data)
-        async_dispatcher_send(
-            hass, f"{SIGNAL_CALL_STATE}_{entry.entry_id}", dispatch_payload
-        )
-        hass.bus.async_fire(
-            EVENT_WEBHOOK,
-            {
-                **payload,
-                **dispatch_payload,
-                "entry_id": entry.entry_id,
-                "device_id": entry.runtime_data.device_id,
-            },
-        )
+        deduplicator = entry.runtime_data.deduplicator
+        payloads = [
+            payload
+            for payload in payloads
+            if not deduplicator.async_is_duplicate(payload)
+        ]
+        if not ingest.async_put(payloads):
+            return web.Response(status=503, text="Webhook queue is full")
         return web.Response(status=200)
 
     try:
@@ -796,8 +1960,6 @@ async def async_unload_entry(hass: HomeAssistant, entry: UniFiTalkConfigEntry) -
     if not unload_ok:
         return False
 
-    await entry.runtime_data.store.async_save(_serialize_runtime(entry.runtime_data))
-
     webhook_id = entry.runtime_data.config.get(CONF_WEBHOOK_ID)
     if webhook_id:
         try:
@@ -805,6 +1967,30 @@ async def async_unload_entry(hass: HomeAssistant, entry: UniFiTalkConfigEntry) -
         except ValueError:
             pass
 
+    if entry.runtime_data.ingest is not None:
+        await entry.runtime_data.ingest.async_stop()
+    if entry.runtime_data.sequencer is not None:
+        entry.runtime_data.sequencer.async_release_all()
+    entry.runtime_data.waiters.async_cancel_all()
+    if entry.runtime_data.ivr is not None:
+        entry.runtime_data.ivr.async_stop()
+    if entry.runtime_data.dtmf is not None:
+        entry.runtime_data.dtmf.async_stop()
+    if entry.runtime_data.announcements is not None:
+        entry.runtime_data.announcements.async_stop()
+    if entry.runtime_data.tts_cache is not None:
+        entry.runtime_data.tts_cache.async_stop()
+
+    if entry.runtime_data.history is not None:
+        await entry.runtime_data.history.async_close()
+
+    if entry.runtime_data.journal is not None:
+        await entry.runtime_data.journal.async_close()
+    else:
+        await entry.runtime_data.store.async_save(
+            _serialize_runtime(entry.runtime_data)
+        )
+
     return True
 
 
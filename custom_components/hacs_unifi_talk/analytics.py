@@ -0,0 +1,157 @@
+# SPDX-FileCopyrightText: 2025 Michael E. Harrington
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from .phonebook import caller_key
+
+# Heavy hitters tracked per bucket; a caller with more than 1/K of a bucket's
+# calls is always kept.
+TOP_CALLERS_CAPACITY = 64
+SKETCH_WIDTH = 512
+SKETCH_DEPTH = 4
+CALLER_WINDOWS: dict[str, tuple[int, int]] = {
+    # Window name: (bucket length in seconds, number of buckets).
+    "hour": (300, 12),
+    "day": (3600, 24),
+}
+# Windows advance one bucket at a time, so counts only age out this often.
+CALLER_BUCKET_SECONDS = min(length for length, _ in CALLER_WINDOWS.values())
+
+
+class SpaceSavingCounter:
+    """Space-saving top-K summary with a fixed number of counters."""
+
+    __slots__ = ("capacity", "counts", "errors")
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.counts: dict[str, int] = {}
+        # Upper bound on how much of a count was inherited from an evicted key.
+        self.errors: dict[str, int] = {}
+
+    def add(self, key: str) -> None:
+        if key in self.counts:
+            self.counts[key] += 1
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[key] = 1
+            self.errors[key] = 0
+            return
+        evicted = min(self.counts, key=self.counts.__getitem__)
+        floor = self.counts.pop(evicted)
+        del self.errors[evicted]
+        self.counts[key] = floor + 1
+        self.errors[key] = floor
+
+
+class CountMinSketch:
+    """Fixed-size frequency estimates that never undercount."""
+
+    __slots__ = ("_table", "_width")
+
+    def __init__(self, width: int, depth: int) -> None:
+        self._width = width
+        self._table = [array("I", bytes(4 * width)) for _ in range(depth)]
+
+    def add(self, key: str) -> None:
+        for row, table in enumerate(self._table):
+            table[hash((row, key)) % self._width] += 1
+
+    def estimate(self, key: str) -> int:
+        return min(
+            table[hash((row, key)) % self._width]
+            for row, table in enumerate(self._table)
+        )
+
+
+@dataclass(slots=True)
+class _Bucket:
+    index: int
+    total: int = 0
+    top: SpaceSavingCounter = field(
+        default_factory=lambda: SpaceSavingCounter(TOP_CALLERS_CAPACITY)
+    )
+    sketch: CountMinSketch = field(
+        default_factory=lambda: CountMinSketch(SKETCH_WIDTH, SKETCH_DEPTH)
+    )
+
+
+class SlidingCallerWindow:
+    """A ring of time buckets; the oldest bucket drops off as time advances."""
+
+    def __init__(self, bucket_seconds: int, bucket_count: int) -> None:
+        self.bucket_seconds = bucket_seconds
+        self.bucket_count = bucket_count
+        self._buckets: deque[_Bucket] = deque(maxlen=bucket_count)
+
+    def add(self, key: str, now: float) -> None:
+        index = int(now // self.bucket_seconds)
+        if not self._buckets or self._buckets[-1].index != index:
+            self._buckets.append(_Bucket(index))
+        bucket = self._buckets[-1]
+        bucket.total += 1
+        bucket.top.add(key)
+        bucket.sketch.add(key)
+
+    def _live(self, now: float) -> list[_Bucket]:
+        oldest = int(now // self.bucket_seconds) - self.bucket_count
+        return [bucket for bucket in self._buckets if bucket.index > oldest]
+
+    def total(self, now: float) -> int:
+        return sum(bucket.total for bucket in self._live(now))
+
+    def estimate(self, key: str, now: float) -> int:
+        return sum(bucket.sketch.estimate(key) for bucket in self._live(now))
+
+    def top(self, limit: int, now: float) -> list[tuple[str, int, int]]:
+        counts: dict[str, int] = {}
+        errors: dict[str, int] = {}
+        for bucket in self._live(now):
+            for key, count in bucket.top.counts.items():
+                counts[key] = counts.get(key, 0) + count
+                errors[key] = errors.get(key, 0) + bucket.top.errors[key]
+        ranked = sorted(counts, key=counts.__getitem__, reverse=True)[:limit]
+        return [(key, counts[key], errors[key]) for key in ranked]
+
+
+class CallerAnalytics:
+    """Streaming per-caller call counts over sliding hour and day windows.
+
+    Memory is fixed by the bucket, counter, and sketch sizes, no matter how
+    many distinct numbers call.
+    """
+
+    def __init__(self) -> None:
+        self.windows = {
+            name: SlidingCallerWindow(*shape) for name, shape in CALLER_WINDOWS.items()
+        }
+        self.recorded = 0
+
+    def record(self, caller: str | None, now: float) -> None:
+        key = caller_key(caller) or "unknown"
+        self.recorded += 1
+        for window in self.windows.values():
+            window.add(key, now)
+
+    def top_callers(self, window: str, limit: int, now: float) -> list[dict[str, Any]]:
+        return [
+            {"caller": key, "calls": count, "max_overcount": error}
+            for key, count, error in self.windows[window].top(limit, now)
+        ]
+
+    def estimate(self, caller: str, now: float) -> dict[str, int]:
+        key = caller_key(caller)
+        if key is None:
+            return {name: 0 for name in self.windows}
+        return {
+            name: window.estimate(key, now) for name, window in self.windows.items()
+        }
+
+    def totals(self, now: float) -> dict[str, int]:
+        return {name: window.total(now) for name, window in self.windows.items()}
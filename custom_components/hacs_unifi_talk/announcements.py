@@ -0,0 +1,179 @@
+# SPDX-FileCopyrightText: 2025 Michael E. Harrington
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import TERMINAL_CALL_EVENTS
+from .tts_cache import TtsCache
+from .waiters import target_key
+
+if TYPE_CHECKING:
+    from . import CallSession
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, eq=False)
+class _Announcement:
+    # The dialed target; follow-up commands address the call the same way.
+    target: str
+    message: str
+    language: str | None
+    hangup: bool
+    first_chunk: str
+    # Loop time after which an unanswered announcement is forgotten.
+    deadline: float
+
+
+class AnnouncementPipeline:
+    """Announcements whose TTS is rendered while the callee's phone rings.
+
+    The dial goes out without a spoken menu while the message renders into the
+    TTS cache, first sentence first. Once the call is answered the message is
+    sent as ``play_message``; the command dispatcher swaps in the rendered audio,
+    joining a render that is still in flight, and falls back to live TTS only
+    if rendering fails. Outbound calls are matched to their announcement by
+    dial target, like dial waiters.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        tts_cache: TtsCache,
+        send: Callable[[dict[str, Any]], Awaitable[None]],
+    ) -> None:
+        self.hass = hass
+        self.entry = entry
+        self.tts_cache = tts_cache
+        self._send = send
+        self._by_target: dict[str, list[_Announcement]] = {}
+        self._by_call: dict[str, _Announcement] = {}
+        self.ready_at_answer = 0
+        self.rendering_at_answer = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": sum(len(items) for items in self._by_target.values())
+            + len(self._by_call),
+            "ready_at_answer": self.ready_at_answer,
+            "rendering_at_answer": self.rendering_at_answer,
+        }
+
+    @callback
+    def async_add(
+        self,
+        target: str,
+        message: str,
+        language: str | None,
+        hangup: bool,
+        timeout: float,
+    ) -> _Announcement:
+        now = self.hass.loop.time()
+        self._prune(now)
+        chunks = self.tts_cache.split_message(message)
+        self.tts_cache.async_prefetch(chunks, language)
+        announcement = _Announcement(
+            target=target,
+            message=message,
+            language=language,
+            hangup=hangup,
+            first_chunk=chunks[0],
+            deadline=now + timeout,
+        )
+        if (key := target_key(target)) is not None:
+            self._by_target.setdefault(key, []).append(announcement)
+        return announcement
+
+    @callback
+    def async_discard(self, announcement: _Announcement) -> None:
+        for key, items in list(self._by_target.items()):
+            if announcement in items:
+                items.remove(announcement)
+                if not items:
+                    del self._by_target[key]
+        for internal_id, item in list(self._by_call.items()):
+            if item is announcement:
+                del self._by_call[internal_id]
+
+    @callback
+    def async_handle_event(self, session: CallSession) -> None:
+        if session.direction == "outgoing" and session.event_count == 1:
+            self._bind(session)
+        announcement = self._by_call.get(session.internal_id)
+        if announcement is None:
+            return
+        if session.last_event == "call_established":
+            del self._by_call[session.internal_id]
+            self._speak(announcement)
+        elif session.last_event in TERMINAL_CALL_EVENTS:
+            del self._by_call[session.internal_id]
+
+    @callback
+    def async_stop(self) -> None:
+        self._by_target.clear()
+        self._by_call.clear()
+
+    def _bind(self, session: CallSession) -> None:
+        for candidate in (session.parsed_caller, session.caller):
+            key = target_key(candidate)
+            announcements = self._by_target.get(key) if key is not None else None
+            if not announcements:
+                continue
+            self._by_call[session.internal_id] = announcements.pop(0)
+            if not announcements:
+                del self._by_target[key]
+            return
+
+    def _prune(self, now: float) -> None:
+        for key, items in list(self._by_target.items()):
+            items[:] = [item for item in items if item.deadline > now]
+            if not items:
+                del self._by_target[key]
+        for internal_id, item in list(self._by_call.items()):
+            if item.deadline <= now:
+                del self._by_call[internal_id]
+
+    def _speak(self, announcement: _Announcement) -> None:
+        if self.tts_cache.async_lookup(announcement.first_chunk, announcement.language):
+            self.ready_at_answer += 1
+        else:
+            self.rendering_at_answer += 1
+
+        command: dict[str, Any] = {
+            "command": "play_message",
+            "number": announcement.target,
+            "message": announcement.message,
+            # Holds the hangup back until the message has been heard.
+            "wait_for_audio_to_finish": announcement.hangup,
+        }
+        if announcement.language:
+            command["tts_language"] = announcement.language
+        commands = [command]
+        if announcement.hangup:
+            commands.append({"command": "hangup", "number": announcement.target})
+        self.entry.async_create_background_task(
+            self.hass, self._async_send(commands), f"{self.entry.domain} announcement"
+        )
+
+    async def _async_send(self, commands: list[dict[str, Any]]) -> None:
+        for command in commands:
+            try:
+                await self._send(command)
+            except HomeAssistantError as err:
+                _LOGGER.warning(
+                    "Announcement %s command for %s failed: %s",
+                    command["command"],
+                    command["number"],
+                    err,
+                )
+                return
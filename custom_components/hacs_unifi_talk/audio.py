@@ -0,0 +1,303 @@
+# SPDX-FileCopyrightText: 2025 Michael E. Harrington
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from typing import Any
+
+from aiohttp import ClientError, hdrs
+from homeassistant.components.ffmpeg import get_ffmpeg_manager
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+
+_LOGGER = logging.getLogger(__name__)
+
+AUDIO_PREPARED_SUBDIR = "prepared"
+# Remote sources are trusted this long before a conditional GET revalidates them.
+AUDIO_REVALIDATE_INTERVAL = 300
+AUDIO_FETCH_TIMEOUT = 15
+AUDIO_TRANSCODE_TIMEOUT = 30
+AUDIO_MAX_SOURCE_BYTES = 20 * 1024 * 1024
+AUDIO_INDEX_SAVE_DELAY = 10
+_REMOTE_PREFIXES = ("http://", "https://")
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def _hash_local(
+    path: str, known: dict[str, Any] | None
+) -> tuple[float, int, str] | None:
+    try:
+        stat = os.stat(path)
+        if known and (known.get("mtime"), known.get("size")) == (
+            stat.st_mtime,
+            stat.st_size,
+        ):
+            return stat.st_mtime, stat.st_size, known["hash"]
+        with open(path, "rb") as source:
+            digest = hashlib.file_digest(source, "sha256").hexdigest()[:32]
+        return stat.st_mtime, stat.st_size, digest
+    except (FileNotFoundError, IsADirectoryError, PermissionError):
+        return None
+
+
+def _touch(path: str) -> bool:
+    """Mark a prepared file as used; False when it has been evicted."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _write_source(directory: str, filename: str, data: bytes) -> str:
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, filename)
+    with open(path, "wb") as source:
+        source.write(data)
+    return path
+
+
+def _finish(temp_path: str, target: str | None, cleanup: tuple[str, ...]) -> None:
+    if target is not None:
+        os.replace(temp_path, target)
+    for path in cleanup:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class AudioPreparer:
+    """Telephony-ready copies of ``play_audio_file`` sources.
+
+    Sources are transcoded once with ffmpeg into mono 16-bit PCM WAV at the
+    configured sample rate and stored in the cache directory under a hash of
+    their content, so ha-sip can play them without decoding. Remote sources are
+    fetched with the shared HTTP session and revalidated with conditional GETs;
+    their validators are kept in a store across restarts. When a source cannot
+    be fetched or transcoded, the caller keeps the original path or URL.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        cache_dir: str,
+        sample_rate: int,
+        store: Store[dict[str, Any]],
+    ) -> None:
+        self.hass = hass
+        self.directory = os.path.join(cache_dir, AUDIO_PREPARED_SUBDIR)
+        self.sample_rate = sample_rate
+        self._store = store
+        # Source path or URL -> content hash plus mtime/size or HTTP validators.
+        self._sources: dict[str, dict[str, Any]] = {}
+        self._preparing: dict[str, asyncio.Task[str | None]] = {}
+        self.transcoded = 0
+        self.reused = 0
+        self.revalidated = 0
+        self.failures = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "sources": len(self._sources),
+            "sample_rate": self.sample_rate,
+            "transcoded": self.transcoded,
+            "reused": self.reused,
+            "revalidated": self.revalidated,
+            "failures": self.failures,
+        }
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load() or {}
+        self._sources = {
+            source: entry
+            for source, entry in data.get("sources", {}).items()
+            if isinstance(entry, dict) and entry.get("hash")
+        }
+
+    async def async_prepare(self, source: str) -> str | None:
+        """Return the prepared file for a source, or None to use it as is."""
+        task = self._preparing.get(source)
+        if task is None:
+            task = self.hass.async_create_background_task(
+                self._async_prepare(source), "UniFi Talk audio preparation"
+            )
+            self._preparing[source] = task
+            task.add_done_callback(lambda done: self._async_prepared(source, done))
+        try:
+            return await asyncio.shield(task)
+        except (ClientError, OSError, TimeoutError) as err:
+            _LOGGER.warning("Unable to prepare audio %s: %s", source, err)
+            return None
+
+    @callback
+    def _async_prepared(self, source: str, task: asyncio.Task[str | None]) -> None:
+        self._preparing.pop(source, None)
+        if task.cancelled() or task.exception() is not None:
+            self.failures += 1
+
+    async def _async_prepare(self, source: str) -> str | None:
+        if source.startswith(_REMOTE_PREFIXES):
+            return await self._async_prepare_remote(source)
+        if source.startswith(self.directory + os.sep):
+            return None
+        return await self._async_prepare_local(source)
+
+    async def _async_prepare_local(self, path: str) -> str | None:
+        known = self._sources.get(path)
+        hashed = await self.hass.async_add_executor_job(_hash_local, path, known)
+        if hashed is None:
+            return None
+        mtime, size, digest = hashed
+        if known is None or known["hash"] != digest:
+            self._sources[path] = {"mtime": mtime, "size": size, "hash": digest}
+            self._schedule_save()
+        target = self._target(digest)
+        if await self.hass.async_add_executor_job(_touch, target):
+            self.reused += 1
+            return target
+        return await self._async_transcode(path, target)
+
+    async def _async_prepare_remote(self, url: str) -> str | None:
+        known = self._sources.get(url)
+        if known is not None:
+            target = self._target(known["hash"])
+            fresh = time.time() - known.get("checked", 0) < AUDIO_REVALIDATE_INTERVAL
+            if fresh and await self.hass.async_add_executor_job(_touch, target):
+                self.reused += 1
+                return target
+
+        data = await self._async_fetch(url, known)
+        if data is None:
+            # Not modified; the prepared copy is still current unless evicted.
+            target = self._target(self._sources[url]["hash"])
+            if await self.hass.async_add_executor_job(_touch, target):
+                self.revalidated += 1
+                return target
+            data = await self._async_fetch(url, None)
+            if data is None:
+                return None
+
+        target = self._target(self._sources[url]["hash"])
+        if await self.hass.async_add_executor_job(_touch, target):
+            self.reused += 1
+            return target
+        source_path = await self.hass.async_add_executor_job(
+            _write_source,
+            self.directory,
+            f".{os.path.basename(target)}.source",
+            data,
+        )
+        return await self._async_transcode(source_path, target, source_path)
+
+    async def _async_fetch(
+        self, url: str, known: dict[str, Any] | None
+    ) -> bytes | None:
+        """Download a source; None means the server reported it unchanged."""
+        headers: dict[str, str] = {}
+        if known is not None:
+            if etag := known.get("etag"):
+                headers[hdrs.IF_NONE_MATCH] = etag
+            if last_modified := known.get("last_modified"):
+                headers[hdrs.IF_MODIFIED_SINCE] = last_modified
+        session = async_get_clientsession(self.hass)
+        async with (
+            asyncio.timeout(AUDIO_FETCH_TIMEOUT),
+            session.get(url, headers=headers) as response,
+        ):
+            if response.status == 304 and known is not None:
+                known["checked"] = time.time()
+                self._schedule_save()
+                return None
+            response.raise_for_status()
+            # Read one byte past the limit to tell a full file from a cut one.
+            data = await response.content.read(AUDIO_MAX_SOURCE_BYTES + 1)
+            if len(data) > AUDIO_MAX_SOURCE_BYTES:
+                raise ClientError(
+                    f"Audio source is larger than {AUDIO_MAX_SOURCE_BYTES} bytes"
+                )
+            self._sources[url] = {
+                "hash": _content_hash(data),
+                "etag": response.headers.get(hdrs.ETAG),
+                "last_modified": response.headers.get(hdrs.LAST_MODIFIED),
+                "checked": time.time(),
+            }
+        self._schedule_save()
+        return data
+
+    async def _async_transcode(
+        self, source_path: str, target: str, *cleanup: str
+    ) -> str | None:
+        await self.hass.async_add_executor_job(
+            lambda: os.makedirs(self.directory, exist_ok=True)
+        )
+        temp_path = os.path.join(self.directory, f".{os.path.basename(target)}.tmp")
+        process = await asyncio.create_subprocess_exec(
+            self._ffmpeg_binary(),
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            "-i",
+            source_path,
+            "-vn",
+            "-ac",
+            "1",
+            "-ar",
+            str(self.sample_rate),
+            "-c:a",
+            "pcm_s16le",
+            "-f",
+            "wav",
+            temp_path,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            async with asyncio.timeout(AUDIO_TRANSCODE_TIMEOUT):
+                _, stderr = await process.communicate()
+        except TimeoutError:
+            process.kill()
+            await process.wait()
+            await self.hass.async_add_executor_job(
+                _finish, temp_path, None, (temp_path, *cleanup)
+            )
+            raise
+        if process.returncode != 0:
+            await self.hass.async_add_executor_job(
+                _finish, temp_path, None, (temp_path, *cleanup)
+            )
+            _LOGGER.warning(
+                "Unable to transcode audio %s: %s",
+                source_path,
+                stderr.decode(errors="replace").strip(),
+            )
+            self.failures += 1
+            return None
+        await self.hass.async_add_executor_job(_finish, temp_path, target, cleanup)
+        self.transcoded += 1
+        return target
+
+    def _ffmpeg_binary(self) -> str:
+        try:
+            return get_ffmpeg_manager(self.hass).binary
+        except (KeyError, ValueError):
+            return "ffmpeg"
+
+    def _target(self, digest: str) -> str:
+        return os.path.join(self.directory, f"{digest}_{self.sample_rate}.wav")
+
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(
+            lambda: {"sources": self._sources}, AUDIO_INDEX_SAVE_DELAY
+        )
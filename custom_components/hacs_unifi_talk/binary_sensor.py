@@ -3,12 +3,14 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import UniFiTalkConfigEntry
+from . import RuntimeSnapshot, UniFiTalkConfigEntry
 from .const import SIGNAL_CALL_STATE
 from .entity import device_info
 
@@ -35,6 +37,7 @@ class UniFiTalkCallInProgressBinarySensor(BinarySensorEntity):
         self._attr_is_on = False
         self._attr_extra_state_attributes = {}
         self._unsub_dispatcher = None
+        self._state_key: tuple[Any, ...] | None = None
 
     async def async_added_to_hass(self) -> None:
         self._unsub_dispatcher = async_dispatcher_connect(
@@ -42,7 +45,7 @@ class UniFiTalkCallInProgressBinarySensor(BinarySensorEntity):
             f"{SIGNAL_CALL_STATE}_{self.entry.entry_id}",
             self._handle_push_update,
         )
-        self._handle_push_update({})
+        self._handle_push_update([], self.entry.runtime_data.snapshot)
 
     async def async_will_remove_from_hass(self) -> None:
         if self._unsub_dispatcher is not None:
@@ -50,13 +53,15 @@ class UniFiTalkCallInProgressBinarySensor(BinarySensorEntity):
             self._unsub_dispatcher = None
 
     @callback
-    def _handle_push_update(self, _: dict) -> None:
-        active_calls = self.entry.runtime_data.active_calls()
-        self._attr_is_on = bool(active_calls)
+    def _handle_push_update(self, _: list[dict], snapshot: RuntimeSnapshot) -> None:
+        # Every published attribute derives from the key, so none goes stale.
+        state_key = (snapshot.active_call_ids,)
+        if state_key == self._state_key:
+            return
+        self._state_key = state_key
+        self._attr_is_on = bool(snapshot.active_call_count)
         self._attr_extra_state_attributes = {
-            "active_call_count": len(active_calls),
-            "active_call_ids": [session.internal_id for session in active_calls],
-            "last_event": self.entry.runtime_data.last_event,
-            "updated": self.entry.runtime_data.last_updated,
+            "active_call_count": snapshot.active_call_count,
+            "active_call_ids": list(snapshot.active_call_ids),
         }
         self.async_write_ha_state()
@@ -0,0 +1,257 @@
+# SPDX-FileCopyrightText: 2025 Michael E. Harrington
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import logging
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import TERMINAL_CALL_EVENTS
+from .phonebook import caller_key
+
+_LOGGER = logging.getLogger(__name__)
+
+BLOCKLIST_CHECK_INTERVAL = timedelta(minutes=1)
+# Blocked calls whose follow-up events are still being swallowed.
+MAX_TRACKED_BLOCKED_CALLS = 256
+# Magic, format version, national matching flag, source mtime, number of
+# packed entries, byte length of the text entries.
+_INDEX_HEADER = struct.Struct("<4sBBdQQ")
+_INDEX_MAGIC = b"UTBL"
+_INDEX_VERSION = 2
+# Keys are packed as int("1" + digits) so leading zeros survive; 18 digits fit.
+_MAX_PACKED_DIGITS = 18
+
+
+def _pack(key: str) -> int | None:
+    if key.isdigit() and len(key) <= _MAX_PACKED_DIGITS:
+        return int("1" + key)
+    return None
+
+
+def _parse_source(path: str, national: bool) -> tuple[array[int], frozenset[str]]:
+    packed: set[int] = set()
+    text: set[str] = set()
+    with open(path, encoding="utf-8-sig") as source:
+        for line in source:
+            # Accept plain lists, the first column of a CSV, and # comments.
+            number = line.split("#", 1)[0].split(",", 1)[0].strip()
+            if (key := caller_key(number, national)) is None:
+                continue
+            if (value := _pack(key)) is not None:
+                packed.add(value)
+            else:
+                text.add(key)
+    return array("Q", sorted(packed)), frozenset(text)
+
+
+def _read_index(
+    index_path: str, mtime: float, national: bool
+) -> tuple[array[int], frozenset[str]] | None:
+    try:
+        with open(index_path, "rb") as index:
+            header = index.read(_INDEX_HEADER.size)
+            if len(header) != _INDEX_HEADER.size:
+                return None
+            magic, version, index_national, index_mtime, count, text_size = (
+                _INDEX_HEADER.unpack(header)
+            )
+            if (magic, version, bool(index_national), index_mtime) != (
+                _INDEX_MAGIC,
+                _INDEX_VERSION,
+                national,
+                mtime,
+            ):
+                return None
+            packed = array("Q")
+            packed.fromfile(index, count)
+            text = index.read(text_size).decode()
+    except (FileNotFoundError, EOFError, UnicodeDecodeError):
+        return None
+    return packed, frozenset(filter(None, text.split("\n")))
+
+
+def _write_index(
+    index_path: str,
+    mtime: float,
+    national: bool,
+    packed: array[int],
+    text: frozenset[str],
+) -> None:
+    encoded = "\n".join(sorted(text)).encode()
+    temp_path = f"{index_path}.tmp"
+    with open(temp_path, "wb") as index:
+        index.write(
+            _INDEX_HEADER.pack(
+                _INDEX_MAGIC,
+                _INDEX_VERSION,
+                national,
+                mtime,
+                len(packed),
+                len(encoded),
+            )
+        )
+        packed.tofile(index)
+        index.write(encoded)
+    os.replace(temp_path, index_path)
+
+
+def _load(
+    path: str, index_path: str, national: bool
+) -> tuple[float, array[int], frozenset[str]] | None:
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+    if (cached := _read_index(index_path, mtime, national)) is not None:
+        return mtime, *cached
+    packed, text = _parse_source(path, national)
+    try:
+        _write_index(index_path, mtime, national, packed, text)
+    except OSError as err:
+        _LOGGER.warning("Unable to write blocklist index %s: %s", index_path, err)
+    return mtime, packed, text
+
+
+def _mtime(path: str) -> float | None:
+    try:
+        return os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+class Blocklist:
+    """Blocked caller numbers held as a sorted array of packed integers.
+
+    The source list is parsed once into a binary index next to the runtime
+    store and reused on later starts until the source changes. A lookup is a
+    binary search, so even very large lists cost a few comparisons per call.
+    Numbers match exactly unless ``national`` matching is enabled.
+    Blocked calls are hung up and every event for them is dropped before it
+    reaches the runtime state, entities, or the event bus.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        path: str,
+        index_path: str,
+        send: Callable[[dict[str, Any]], Awaitable[None]],
+        on_change: Callable[[], None] | None = None,
+        national: bool = False,
+    ) -> None:
+        self.hass = hass
+        self.entry = entry
+        self.path = path
+        self.index_path = index_path
+        self.national = national
+        self._send = send
+        self._on_change = on_change
+        self._packed: array[int] = array("Q")
+        self._text: frozenset[str] = frozenset()
+        self._mtime: float | None = None
+        self._unsub_interval: CALLBACK_TYPE | None = None
+        # Insertion-ordered so the oldest tracked call is evicted first.
+        self._calls: dict[str, None] = {}
+        self.blocked_calls = 0
+        self.dropped_events = 0
+        self.last_blocked: str | None = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "blocked_calls": self.blocked_calls,
+            "dropped_events": self.dropped_events,
+            "numbers": len(self._packed) + len(self._text),
+            "last_blocked": self.last_blocked,
+        }
+
+    def contains(self, value: str | None) -> bool:
+        if (key := caller_key(value, self.national)) is None:
+            return False
+        if (code := _pack(key)) is None:
+            return key in self._text
+        packed = self._packed
+        index = bisect_left(packed, code)
+        return index < len(packed) and packed[index] == code
+
+    @callback
+    def async_filter(self, payload: dict[str, Any]) -> bool:
+        """Return True when the event belongs to a blocked call."""
+        internal_id = payload.get("internal_id")
+        if not internal_id:
+            return False
+        event = payload.get("event")
+        if internal_id in self._calls:
+            self.dropped_events += 1
+            if event in TERMINAL_CALL_EVENTS:
+                del self._calls[internal_id]
+            return True
+        if event != "incoming_call" or not self.contains(
+            payload.get("parsed_caller") or payload.get("caller")
+        ):
+            return False
+
+        self._calls[internal_id] = None
+        if len(self._calls) > MAX_TRACKED_BLOCKED_CALLS:
+            del self._calls[next(iter(self._calls))]
+        self.blocked_calls += 1
+        self.dropped_events += 1
+        self.last_blocked = datetime.now(UTC).isoformat()
+        self.entry.async_create_background_task(
+            self.hass, self._async_hangup(internal_id), f"{self.entry.domain} block"
+        )
+        if self._on_change is not None:
+            self._on_change()
+        return True
+
+    async def async_load(self) -> None:
+        try:
+            loaded = await self.hass.async_add_executor_job(
+                _load, self.path, self.index_path, self.national
+            )
+        except (OSError, UnicodeDecodeError) as err:
+            _LOGGER.error("Unable to read blocklist %s: %s", self.path, err)
+            return
+        if loaded is None:
+            _LOGGER.warning("Blocklist %s does not exist", self.path)
+            self._mtime = None
+            self._packed, self._text = array("Q"), frozenset()
+        else:
+            self._mtime, self._packed, self._text = loaded
+        if self._on_change is not None:
+            self._on_change()
+
+    @callback
+    def async_start(self) -> None:
+        self._unsub_interval = async_track_time_interval(
+            self.hass, self._async_check, BLOCKLIST_CHECK_INTERVAL
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_interval is not None:
+            self._unsub_interval()
+            self._unsub_interval = None
+
+    async def _async_check(self, _: datetime) -> None:
+        mtime = await self.hass.async_add_executor_job(_mtime, self.path)
+        if mtime != self._mtime:
+            await self.async_load()
+
+    async def _async_hangup(self, internal_id: str) -> None:
+        try:
+            await self._send({"command": "hangup", "number": internal_id})
+        except HomeAssistantError as err:
+            _LOGGER.warning("Unable to hang up blocked call %s: %s", internal_id, err)
@@ -0,0 +1,221 @@
+# SPDX-FileCopyrightText: 2025 Michael E. Harrington
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import aclosing, asynccontextmanager
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+_LOGGER = logging.getLogger(__name__)
+
+COMMAND_LATENCY_SAMPLES = 100
+
+
+class CommandDispatcher:
+    """Sends ha-sip stdin commands with per-call ordering and global limits.
+
+    Commands for the same call run one at a time in submission order, while
+    commands for different calls overlap up to ``max_in_flight``. ``call_key``
+    maps a command's ``number`` to the call it addresses, so an internal ID,
+    an extension and a SIP URI for one call share a lock. Outbound
+    dials are additionally spaced to at most ``dial_rate`` per second so bursts
+    stay within the trunk limits of the PBX; ``0`` disables the cap.
+
+    ``prepare`` turns a payload into the commands actually sent, for example
+    to swap a TTS message for pre-rendered audio or to play a long message one
+    sentence at a time. The first part is prepared and sent while the call's
+    lock is held, so slow preparation delays only that call's commands. Any
+    later parts are sent by a background sequence that takes the lock per part
+    and is cancelled as soon as another command for the call is submitted, so
+    a hangup or a new prompt never waits for a long message to finish. A
+    command with ``wait_for_audio_to_finish`` returns once its sequence is done.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        send: Callable[[dict[str, Any]], Awaitable[None]],
+        max_in_flight: int,
+        dial_rate: float,
+        on_change: Callable[[], None] | None = None,
+        prepare: Callable[[dict[str, Any]], AsyncIterator[dict[str, Any]]]
+        | None = None,
+        call_key: Callable[[str], str] | None = None,
+    ) -> None:
+        self.hass = hass
+        self.max_in_flight = max_in_flight
+        self.dial_rate = dial_rate
+        self._send = send
+        self._on_change = on_change
+        self._prepare = prepare
+        self._call_key = call_key
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._dial_interval = 1 / dial_rate if dial_rate > 0 else 0.0
+        self._next_dial = 0.0
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._lock_users: dict[str, int] = {}
+        self._sequences: dict[str, asyncio.Task[None]] = {}
+        # (queue wait, total latency) in seconds for recently completed commands.
+        self._samples: deque[tuple[float, float]] = deque(
+            maxlen=COMMAND_LATENCY_SAMPLES
+        )
+        self.depth = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+
+    def stats(self) -> dict[str, Any]:
+        samples = self._samples
+        return {
+            "depth": self.depth,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "dial_rate": self.dial_rate,
+            "sequences": len(self._sequences),
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_wait_ms": _average_ms(wait for wait, _ in samples),
+            "avg_latency_ms": _average_ms(latency for _, latency in samples),
+            "last_latency_ms": round(samples[-1][1] * 1000, 1) if samples else None,
+        }
+
+    async def async_submit(self, payload: dict[str, Any]) -> None:
+        key = str(payload.get("number") or "")
+        if key and self._call_key is not None:
+            key = self._call_key(key)
+        self._cancel_sequence(key)
+        submitted = time.monotonic()
+        sequence: asyncio.Task[None] | None = None
+        queued = True
+        self.depth += 1
+        self._changed()
+        parts = (
+            self._prepare(payload) if self._prepare is not None else _single(payload)
+        )
+        try:
+            async with self._async_lock(key):
+                # A sequence may have started while this command was queued.
+                self._cancel_sequence(key)
+                part = await anext(parts, None)
+                if part is not None:
+                    if part.get("command") == "dial":
+                        await self._async_throttle_dial()
+                    async with self._semaphore:
+                        started = time.monotonic()
+                        queued = False
+                        self.depth -= 1
+                        await self._async_send(part)
+                    self._samples.append(
+                        (started - submitted, time.monotonic() - submitted)
+                    )
+                self.completed += 1
+                if self._prepare is not None:
+                    sequence = self.hass.async_create_background_task(
+                        self._async_send_sequence(key, parts),
+                        "UniFi Talk command sequence",
+                    )
+                    self._sequences[key] = sequence
+                    sequence.add_done_callback(
+                        lambda done: self._async_sequence_done(key, done)
+                    )
+        except BaseException:
+            await parts.aclose()
+            raise
+        finally:
+            if queued:
+                self.depth -= 1
+            self._changed()
+        if sequence is not None and payload.get("wait_for_audio_to_finish"):
+            # Return once every part is sent, or the sequence was cancelled.
+            await asyncio.wait((sequence,))
+
+    @callback
+    def async_stop(self) -> None:
+        for task in self._sequences.values():
+            task.cancel()
+        self._sequences.clear()
+
+    async def _async_send_sequence(
+        self, key: str, parts: AsyncIterator[dict[str, Any]]
+    ) -> None:
+        async with aclosing(parts):
+            async for part in parts:
+                if part.get("command") == "dial":
+                    await self._async_throttle_dial()
+                async with self._async_lock(key), self._semaphore:
+                    try:
+                        await self._async_send(part)
+                    except HomeAssistantError as err:
+                        _LOGGER.warning(
+                            "Unable to send %s command for %s: %s",
+                            part.get("command"),
+                            key,
+                            err,
+                        )
+                        return
+
+    def _cancel_sequence(self, key: str) -> None:
+        if (sequence := self._sequences.pop(key, None)) is not None:
+            sequence.cancel()
+
+    @callback
+    def _async_sequence_done(self, key: str, task: asyncio.Task[None]) -> None:
+        if self._sequences.get(key) is task:
+            del self._sequences[key]
+            self._changed()
+
+    async def _async_send(self, part: dict[str, Any]) -> None:
+        self.in_flight += 1
+        self._changed()
+        try:
+            await self._send(part)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    @asynccontextmanager
+    async def _async_lock(self, key: str) -> AsyncIterator[None]:
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[key] -= 1
+            if not self._lock_users[key]:
+                del self._lock_users[key]
+                del self._locks[key]
+
+    async def _async_throttle_dial(self) -> None:
+        if not self._dial_interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_dial)
+        self._next_dial = slot + self._dial_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def _changed(self) -> None:
+        if self._on_change is not None:
+            self._on_change()
+
+
+async def _single(payload: dict[str, Any]) -> AsyncIterator[dict[str, Any]]:
+    yield payload
+
+
+def _average_ms(samples: Iterable[float]) -> float | None:
+    values = list(samples)
+    if not values:
+        return None
+    return round(sum(values) / len(values) * 1000, 1)
@@ -12,20 +12,47 @@ from homeassistant.components import webhook as webhook_comp
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import selector
 
 from .const import (
     ADDON_SLUG,
+    CALL_HANDLING_OPTION_KEYS,
+    CONF_ANNOUNCE_GROUPS,
     CONF_ANSWER_MODE,
+    CONF_AUDIO_CACHE_MAX_AGE_DAYS,
+    CONF_AUDIO_CACHE_MAX_MB,
+    CONF_AUDIO_PREPARE,
+    CONF_AUDIO_SAMPLE_RATE,
+    CONF_BLOCKLIST_FILE,
+    CONF_BLOCKLIST_NATIONAL_MATCH,
+    CONF_BROADCAST_MAX_LEGS,
     CONF_CACHE_DIR,
+    CONF_CALL_HISTORY,
+    CONF_CALL_HISTORY_RETENTION_DAYS,
+    CONF_CALL_ROUTES,
+    CONF_CALLER_ANALYTICS,
     CONF_DEFAULT_TARGET,
+    CONF_DIAL_RATE_LIMIT,
+    CONF_DTMF_COLLECT,
+    CONF_DTMF_MAX_LENGTH,
+    CONF_DTMF_SEQUENCE_ONLY,
+    CONF_DTMF_TERMINATOR,
+    CONF_DTMF_TIMEOUT,
     CONF_ENABLE_SSH,
+    CONF_EVENT_HISTORY_SIZE,
     CONF_GLOBAL_OPTIONS,
     CONF_INCOMING_FILE,
+    CONF_IVR_FILE,
+    CONF_MAX_CALL_SESSIONS,
+    CONF_MAX_CONCURRENT_COMMANDS,
+    CONF_MAX_INACTIVE_CALL_SESSIONS,
     CONF_NAME_SERVER,
     CONF_NOTIFY_HANGUP,
     CONF_NOTIFY_RING_TIMEOUT,
     CONF_NOTIFY_SIP_ACCOUNT,
     CONF_PASSWORD,
+    CONF_PERSISTENCE_MODE,
+    CONF_PHONEBOOK_FILE,
     CONF_REALM,
     CONF_SETTLE_TIME,
     CONF_SIP_HOST,
@@ -35,26 +62,49 @@ from .const import (
     CONF_SSH_PASSWORD,
     CONF_SSH_PORT,
     CONF_SSH_USER,
+    CONF_TTS_CACHE_SIZE_MB,
     CONF_TTS_DEBUG,
     CONF_TTS_ENGINE_ID,
     CONF_TTS_LANGUAGE,
+    CONF_TTS_PRERENDER,
+    CONF_TTS_SENTENCE_CHUNKS,
     CONF_TTS_VOICE,
     CONF_USERNAME,
     CONF_WEBHOOK_ID,
+    CONF_WEBHOOK_QUEUE_SIZE,
     DEFAULT_ANSWER_MODE,
+    DEFAULT_AUDIO_CACHE_MAX_AGE_DAYS,
+    DEFAULT_AUDIO_CACHE_MAX_MB,
+    DEFAULT_AUDIO_SAMPLE_RATE,
+    DEFAULT_BROADCAST_MAX_LEGS,
     DEFAULT_CACHE_DIR,
+    DEFAULT_CALL_HISTORY_RETENTION_DAYS,
+    DEFAULT_DIAL_RATE_LIMIT,
+    DEFAULT_DTMF_MAX_LENGTH,
+    DEFAULT_DTMF_TERMINATOR,
+    DEFAULT_DTMF_TIMEOUT,
+    DEFAULT_EVENT_HISTORY_SIZE,
+    DEFAULT_MAX_CALL_SESSIONS,
+    DEFAULT_MAX_CONCURRENT_COMMANDS,
+    DEFAULT_MAX_INACTIVE_CALL_SESSIONS,
     DEFAULT_NOTIFY_RING_TIMEOUT,
     DEFAULT_NOTIFY_SIP_ACCOUNT,
+    DEFAULT_PERSISTENCE_MODE,
     DEFAULT_SETTLE_TIME,
     DEFAULT_SIP_HOST,
     DEFAULT_SIP_PORT,
     DEFAULT_SSH_PORT,
+    DEFAULT_TTS_CACHE_SIZE_MB,
     DEFAULT_TTS_ENGINE_ID,
     DEFAULT_TTS_LANGUAGE,
+    DEFAULT_WEBHOOK_QUEUE_SIZE,
     DOMAIN,
-    NOTIFY_OPTION_KEYS,
+    MAX_EVENT_HISTORY_SIZE,
+    OPTION_KEYS,
+    PERSISTENCE_MODES,
     REQUIRED_SIP_OPTION,
 )
+from .routing import parse_routes
 from .supervisor import (
     SupervisorError,
     get_addon_info,
@@ -81,6 +131,35 @@ DEFAULTS = {
     CONF_NOTIFY_RING_TIMEOUT: DEFAULT_NOTIFY_RING_TIMEOUT,
     CONF_NOTIFY_SIP_ACCOUNT: DEFAULT_NOTIFY_SIP_ACCOUNT,
     CONF_NOTIFY_HANGUP: True,
+    CONF_ANNOUNCE_GROUPS: "",
+    CONF_IVR_FILE: "",
+    CONF_CALL_ROUTES: "",
+    CONF_PHONEBOOK_FILE: "",
+    CONF_BLOCKLIST_FILE: "",
+    CONF_BLOCKLIST_NATIONAL_MATCH: False,
+    CONF_MAX_CALL_SESSIONS: DEFAULT_MAX_CALL_SESSIONS,
+    CONF_MAX_INACTIVE_CALL_SESSIONS: DEFAULT_MAX_INACTIVE_CALL_SESSIONS,
+    CONF_EVENT_HISTORY_SIZE: DEFAULT_EVENT_HISTORY_SIZE,
+    CONF_PERSISTENCE_MODE: DEFAULT_PERSISTENCE_MODE,
+    CONF_CALL_HISTORY: False,
+    CONF_CALL_HISTORY_RETENTION_DAYS: DEFAULT_CALL_HISTORY_RETENTION_DAYS,
+    CONF_WEBHOOK_QUEUE_SIZE: DEFAULT_WEBHOOK_QUEUE_SIZE,
+    CONF_MAX_CONCURRENT_COMMANDS: DEFAULT_MAX_CONCURRENT_COMMANDS,
+    CONF_DIAL_RATE_LIMIT: DEFAULT_DIAL_RATE_LIMIT,
+    CONF_BROADCAST_MAX_LEGS: DEFAULT_BROADCAST_MAX_LEGS,
+    CONF_CALLER_ANALYTICS: False,
+    CONF_DTMF_COLLECT: False,
+    CONF_DTMF_TERMINATOR: DEFAULT_DTMF_TERMINATOR,
+    CONF_DTMF_MAX_LENGTH: DEFAULT_DTMF_MAX_LENGTH,
+    CONF_DTMF_TIMEOUT: DEFAULT_DTMF_TIMEOUT,
+    CONF_DTMF_SEQUENCE_ONLY: False,
+    CONF_TTS_PRERENDER: False,
+    CONF_TTS_CACHE_SIZE_MB: DEFAULT_TTS_CACHE_SIZE_MB,
+    CONF_TTS_SENTENCE_CHUNKS: True,
+    CONF_AUDIO_CACHE_MAX_MB: DEFAULT_AUDIO_CACHE_MAX_MB,
+    CONF_AUDIO_CACHE_MAX_AGE_DAYS: DEFAULT_AUDIO_CACHE_MAX_AGE_DAYS,
+    CONF_AUDIO_PREPARE: False,
+    CONF_AUDIO_SAMPLE_RATE: DEFAULT_AUDIO_SAMPLE_RATE,
     CONF_CACHE_DIR: DEFAULT_CACHE_DIR,
     CONF_NAME_SERVER: "",
     CONF_GLOBAL_OPTIONS: "",
@@ -188,6 +267,90 @@ def _options_schema(user_input: dict[str, Any] | None = None) -> vol.Schema:
                 CONF_NOTIFY_SIP_ACCOUNT, default=values[CONF_NOTIFY_SIP_ACCOUNT]
             ): vol.All(vol.Coerce(int), vol.Range(min=1)),
             vol.Optional(CONF_NOTIFY_HANGUP, default=values[CONF_NOTIFY_HANGUP]): bool,
+            vol.Optional(
+                CONF_ANNOUNCE_GROUPS, default=values[CONF_ANNOUNCE_GROUPS]
+            ): selector.TextSelector(selector.TextSelectorConfig(multiline=True)),
+            vol.Optional(CONF_IVR_FILE, default=values[CONF_IVR_FILE]): cv.string,
+            vol.Optional(
+                CONF_CALL_ROUTES, default=values[CONF_CALL_ROUTES]
+            ): selector.TextSelector(selector.TextSelectorConfig(multiline=True)),
+            vol.Optional(
+                CONF_PHONEBOOK_FILE, default=values[CONF_PHONEBOOK_FILE]
+            ): cv.string,
+            vol.Optional(
+                CONF_BLOCKLIST_FILE, default=values[CONF_BLOCKLIST_FILE]
+            ): cv.string,
+            vol.Optional(
+                CONF_BLOCKLIST_NATIONAL_MATCH,
+                default=values[CONF_BLOCKLIST_NATIONAL_MATCH],
+            ): bool,
+            vol.Optional(
+                CONF_MAX_CALL_SESSIONS, default=values[CONF_MAX_CALL_SESSIONS]
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                CONF_MAX_INACTIVE_CALL_SESSIONS,
+                default=values[CONF_MAX_INACTIVE_CALL_SESSIONS],
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_EVENT_HISTORY_SIZE, default=values[CONF_EVENT_HISTORY_SIZE]
+            ): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=MAX_EVENT_HISTORY_SIZE)
+            ),
+            vol.Optional(
+                CONF_PERSISTENCE_MODE, default=values[CONF_PERSISTENCE_MODE]
+            ): vol.In(PERSISTENCE_MODES),
+            vol.Optional(CONF_CALL_HISTORY, default=values[CONF_CALL_HISTORY]): bool,
+            vol.Optional(
+                CONF_CALL_HISTORY_RETENTION_DAYS,
+                default=values[CONF_CALL_HISTORY_RETENTION_DAYS],
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                CONF_WEBHOOK_QUEUE_SIZE, default=values[CONF_WEBHOOK_QUEUE_SIZE]
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                CONF_MAX_CONCURRENT_COMMANDS,
+                default=values[CONF_MAX_CONCURRENT_COMMANDS],
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+            vol.Optional(
+                CONF_DIAL_RATE_LIMIT, default=values[CONF_DIAL_RATE_LIMIT]
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                CONF_BROADCAST_MAX_LEGS, default=values[CONF_BROADCAST_MAX_LEGS]
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+            vol.Optional(
+                CONF_CALLER_ANALYTICS, default=values[CONF_CALLER_ANALYTICS]
+            ): bool,
+            vol.Optional(CONF_DTMF_COLLECT, default=values[CONF_DTMF_COLLECT]): bool,
+            vol.Optional(
+                CONF_DTMF_TERMINATOR, default=values[CONF_DTMF_TERMINATOR]
+            ): vol.In(("#", "*")),
+            vol.Optional(
+                CONF_DTMF_MAX_LENGTH, default=values[CONF_DTMF_MAX_LENGTH]
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=64)),
+            vol.Optional(CONF_DTMF_TIMEOUT, default=values[CONF_DTMF_TIMEOUT]): vol.All(
+                vol.Coerce(float), vol.Range(min=0.5, max=60)
+            ),
+            vol.Optional(
+                CONF_DTMF_SEQUENCE_ONLY, default=values[CONF_DTMF_SEQUENCE_ONLY]
+            ): bool,
+            vol.Optional(CONF_TTS_PRERENDER, default=values[CONF_TTS_PRERENDER]): bool,
+            vol.Optional(
+                CONF_TTS_CACHE_SIZE_MB, default=values[CONF_TTS_CACHE_SIZE_MB]
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10000)),
+            vol.Optional(
+                CONF_TTS_SENTENCE_CHUNKS, default=values[CONF_TTS_SENTENCE_CHUNKS]
+            ): bool,
+            vol.Optional(
+                CONF_AUDIO_CACHE_MAX_MB, default=values[CONF_AUDIO_CACHE_MAX_MB]
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100000)),
+            vol.Optional(
+                CONF_AUDIO_CACHE_MAX_AGE_DAYS,
+                default=values[CONF_AUDIO_CACHE_MAX_AGE_DAYS],
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3650)),
+            vol.Optional(CONF_AUDIO_PREPARE, default=values[CONF_AUDIO_PREPARE]): bool,
+            vol.Optional(
+                CONF_AUDIO_SAMPLE_RATE, default=values[CONF_AUDIO_SAMPLE_RATE]
+            ): vol.In((8000, 16000)),
         }
     )
 
@@ -217,6 +380,7 @@ def _normalize_input(user_input: dict[str, Any]) -> dict[str, Any]:
         CONF_SSH_HOST,
         CONF_SSH_USER,
         CONF_SSH_PASSWORD,
+        *CALL_HANDLING_OPTION_KEYS,
     )
     for field in string_fields:
         data[field] = _sanitize_text(data.get(field))
@@ -239,7 +403,7 @@ def _ensure_required_sip_option(options: str) -> str:
 
 def _merge_entry_input(config_entry: config_entries.ConfigEntry) -> dict[str, Any]:
     merged = dict(config_entry.data)
-    for key in NOTIFY_OPTION_KEYS:
+    for key in OPTION_KEYS:
         if key in config_entry.options:
             merged[key] = config_entry.options[key]
     return merged
@@ -247,7 +411,7 @@ def _merge_entry_input(config_entry: config_entries.ConfigEntry) -> dict[str, An
 
 def _split_entry_payload(data: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
     config_data = {key: data[key] for key in CORE_CONFIG_KEYS}
-    option_data = {key: data[key] for key in NOTIFY_OPTION_KEYS}
+    option_data = {key: data[key] for key in OPTION_KEYS}
     return config_data, option_data
 
 
@@ -401,18 +565,26 @@ class OptionsFlow(config_entries.OptionsFlowWithReload):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         current = _normalize_input(_merge_entry_input(self.config_entry))
+        suggested: dict[str, Any] = dict(self.config_entry.options)
+        errors: dict[str, str] = {}
 
         if user_input is not None:
             data = _normalize_input({**current, **user_input})
-            option_data = {key: data[key] for key in NOTIFY_OPTION_KEYS}
-            return self.async_create_entry(title="", data=option_data)
+            try:
+                parse_routes(data[CONF_CALL_ROUTES])
+            except vol.Invalid:
+                errors[CONF_CALL_ROUTES] = "invalid_call_routes"
+            else:
+                option_data = {key: data[key] for key in OPTION_KEYS}
+                return self.async_create_entry(title="", data=option_data)
+            current = suggested = data
 
         return self.async_show_form(
             step_id="init",
             data_schema=self.add_suggested_values_to_schema(
-                _options_schema(current), self.config_entry.options
+                _options_schema(current), suggested
             ),
-            errors={},
+            errors=errors,
         )
 
 
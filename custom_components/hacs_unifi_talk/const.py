@@ -15,6 +15,9 @@ PLATFORMS: list[Platform] = [
 ADDON_SLUG = "c7744bff_ha-sip"
 EVENT_WEBHOOK = f"{DOMAIN}_webhook"
 SIGNAL_CALL_STATE = f"{DOMAIN}_call_state"
+SIGNAL_COMMAND_QUEUE = f"{DOMAIN}_command_queue"
+SIGNAL_BLOCKLIST = f"{DOMAIN}_blocklist"
+SIGNAL_AUDIO_CACHE = f"{DOMAIN}_audio_cache"
 
 DATA_SERVICES_REGISTERED = "services_registered"
 STORAGE_KEY = f"{DOMAIN}_runtime"
@@ -30,6 +33,29 @@ DEFAULT_CACHE_DIR = "/config/hacs-unifi-talk/audio_cache"
 DEFAULT_SSH_PORT = 22
 DEFAULT_NOTIFY_RING_TIMEOUT = 15
 DEFAULT_NOTIFY_SIP_ACCOUNT = 1
+DEFAULT_MAX_CALL_SESSIONS = 25
+DEFAULT_MAX_INACTIVE_CALL_SESSIONS = 15
+DEFAULT_EVENT_HISTORY_SIZE = 25
+MAX_EVENT_HISTORY_SIZE = 10000
+DEFAULT_JOURNAL_COMPACT_AFTER = 500
+DEFAULT_CALL_HISTORY_RETENTION_DAYS = 365
+DEFAULT_WEBHOOK_QUEUE_SIZE = 1000
+DEFAULT_MAX_CONCURRENT_COMMANDS = 4
+DEFAULT_DIAL_RATE_LIMIT = 1.0
+DEFAULT_BROADCAST_MAX_LEGS = 10
+DEFAULT_DTMF_TERMINATOR = "#"
+DEFAULT_DTMF_MAX_LENGTH = 10
+DEFAULT_DTMF_TIMEOUT = 3.0
+DEFAULT_TTS_CACHE_SIZE_MB = 200
+# The janitor deletes files, so it only runs once a quota is set.
+DEFAULT_AUDIO_CACHE_MAX_MB = 0
+DEFAULT_AUDIO_CACHE_MAX_AGE_DAYS = 0
+DEFAULT_AUDIO_SAMPLE_RATE = 16000
+
+PERSISTENCE_SNAPSHOT = "snapshot"
+PERSISTENCE_JOURNAL = "journal"
+PERSISTENCE_MODES: tuple[str, ...] = (PERSISTENCE_SNAPSHOT, PERSISTENCE_JOURNAL)
+DEFAULT_PERSISTENCE_MODE = PERSISTENCE_SNAPSHOT
 REQUIRED_SIP_OPTION = "--ice false"
 
 CALL_EVENT_TYPES: tuple[str, ...] = (
@@ -42,6 +68,9 @@ CALL_EVENT_TYPES: tuple[str, ...] = (
     "timeout",
     "call_disconnected",
 )
+# Emitted by the integration itself once a buffered DTMF input completes.
+DTMF_SEQUENCE_EVENT = "dtmf_sequence"
+ENTITY_EVENT_TYPES: tuple[str, ...] = (*CALL_EVENT_TYPES, DTMF_SEQUENCE_EVENT)
 TERMINAL_CALL_EVENTS: tuple[str, ...] = (
     "ring_timeout",
     "timeout",
@@ -71,12 +100,81 @@ CONF_DEFAULT_TARGET = "default_target"
 CONF_NOTIFY_RING_TIMEOUT = "notify_ring_timeout"
 CONF_NOTIFY_SIP_ACCOUNT = "notify_sip_account"
 CONF_NOTIFY_HANGUP = "notify_hangup_after_message"
+CONF_ANNOUNCE_GROUPS = "announce_groups"
+CONF_IVR_FILE = "ivr_file"
+CONF_CALL_ROUTES = "call_routes"
+CONF_PHONEBOOK_FILE = "phonebook_file"
+CONF_BLOCKLIST_FILE = "blocklist_file"
+CONF_BLOCKLIST_NATIONAL_MATCH = "blocklist_national_match"
 NOTIFY_OPTION_KEYS: tuple[str, ...] = (
     CONF_DEFAULT_TARGET,
     CONF_NOTIFY_RING_TIMEOUT,
     CONF_NOTIFY_SIP_ACCOUNT,
     CONF_NOTIFY_HANGUP,
 )
+# Text options naming the files and tables that drive call handling.
+CALL_HANDLING_OPTION_KEYS: tuple[str, ...] = (
+    CONF_ANNOUNCE_GROUPS,
+    CONF_IVR_FILE,
+    CONF_CALL_ROUTES,
+    CONF_PHONEBOOK_FILE,
+    CONF_BLOCKLIST_FILE,
+)
+
+# Runtime retention
+CONF_MAX_CALL_SESSIONS = "max_call_sessions"
+CONF_MAX_INACTIVE_CALL_SESSIONS = "max_inactive_call_sessions"
+CONF_EVENT_HISTORY_SIZE = "event_history_size"
+CONF_PERSISTENCE_MODE = "persistence_mode"
+CONF_CALL_HISTORY = "call_history"
+CONF_CALL_HISTORY_RETENTION_DAYS = "call_history_retention_days"
+CONF_WEBHOOK_QUEUE_SIZE = "webhook_queue_size"
+CONF_MAX_CONCURRENT_COMMANDS = "max_concurrent_commands"
+CONF_DIAL_RATE_LIMIT = "dial_rate_limit"
+CONF_BROADCAST_MAX_LEGS = "broadcast_max_legs"
+CONF_CALLER_ANALYTICS = "caller_analytics"
+CONF_DTMF_COLLECT = "dtmf_collect"
+CONF_DTMF_TERMINATOR = "dtmf_terminator"
+CONF_DTMF_MAX_LENGTH = "dtmf_max_length"
+CONF_DTMF_TIMEOUT = "dtmf_timeout"
+CONF_DTMF_SEQUENCE_ONLY = "dtmf_sequence_only"
+CONF_TTS_PRERENDER = "tts_prerender"
+CONF_TTS_CACHE_SIZE_MB = "tts_cache_size_mb"
+CONF_TTS_SENTENCE_CHUNKS = "tts_sentence_chunks"
+CONF_AUDIO_CACHE_MAX_MB = "audio_cache_max_mb"
+CONF_AUDIO_CACHE_MAX_AGE_DAYS = "audio_cache_max_age_days"
+CONF_AUDIO_PREPARE = "audio_prepare"
+CONF_AUDIO_SAMPLE_RATE = "audio_sample_rate"
+RUNTIME_OPTION_KEYS: tuple[str, ...] = (
+    CONF_MAX_CALL_SESSIONS,
+    CONF_MAX_INACTIVE_CALL_SESSIONS,
+    CONF_EVENT_HISTORY_SIZE,
+    CONF_PERSISTENCE_MODE,
+    CONF_CALL_HISTORY,
+    CONF_CALL_HISTORY_RETENTION_DAYS,
+    CONF_WEBHOOK_QUEUE_SIZE,
+    CONF_MAX_CONCURRENT_COMMANDS,
+    CONF_DIAL_RATE_LIMIT,
+    CONF_BROADCAST_MAX_LEGS,
+    CONF_CALLER_ANALYTICS,
+    CONF_DTMF_COLLECT,
+    CONF_DTMF_TERMINATOR,
+    CONF_DTMF_MAX_LENGTH,
+    CONF_DTMF_TIMEOUT,
+    CONF_DTMF_SEQUENCE_ONLY,
+    CONF_BLOCKLIST_NATIONAL_MATCH,
+    CONF_TTS_PRERENDER,
+    CONF_TTS_CACHE_SIZE_MB,
+    CONF_TTS_SENTENCE_CHUNKS,
+    CONF_AUDIO_CACHE_MAX_MB,
+    CONF_AUDIO_CACHE_MAX_AGE_DAYS,
+    CONF_AUDIO_PREPARE,
+    CONF_AUDIO_SAMPLE_RATE,
+)
+
+OPTION_KEYS: tuple[str, ...] = (
+    NOTIFY_OPTION_KEYS + CALL_HANDLING_OPTION_KEYS + RUNTIME_OPTION_KEYS
+)
 
 # Global
 CONF_CACHE_DIR = "cache_dir"
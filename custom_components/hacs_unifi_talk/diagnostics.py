@@ -7,6 +7,7 @@ from typing import Any
 
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 
 from . import UniFiTalkConfigEntry
 from .const import CONF_PASSWORD, CONF_SIP_HOST, CONF_SSH_PASSWORD, CONF_WEBHOOK_ID
@@ -18,6 +19,9 @@ TO_REDACT = {
     CONF_WEBHOOK_ID,
     "caller",
     "parsed_caller",
+    "caller_name",
+    "last_caller",
+    "last_caller_name",
     "default_target",
 }
 
@@ -31,7 +35,30 @@ async def async_get_config_entry_diagnostics(
         "entry_data": async_redact_data(dict(entry.data), TO_REDACT),
         "entry_options": async_redact_data(dict(entry.options), TO_REDACT),
         "runtime_summary": async_redact_data(runtime.summary(), TO_REDACT),
-        "recent_events": async_redact_data(runtime.recent_events, TO_REDACT),
+        "recent_events": async_redact_data(runtime.recent_event_log(), TO_REDACT),
+        "webhook_queue": runtime.ingest.stats() if runtime.ingest else None,
+        "command_queue": runtime.commands.stats() if runtime.commands else None,
+        "call_waiters": runtime.waiters.stats(),
+        "ivr": runtime.ivr.stats() if runtime.ivr else None,
+        "dtmf": runtime.dtmf.stats() if runtime.dtmf else None,
+        "call_routing": runtime.router.stats() if runtime.router else None,
+        "phonebook": runtime.phonebook.stats() if runtime.phonebook else None,
+        "blocklist": runtime.blocklist.stats() if runtime.blocklist else None,
+        "tts_cache": runtime.tts_cache.stats() if runtime.tts_cache else None,
+        "audio_cache": runtime.janitor.stats() if runtime.janitor else None,
+        "audio": runtime.audio.stats() if runtime.audio else None,
+        "announcements": (
+            runtime.announcements.stats() if runtime.announcements else None
+        ),
+        "caller_analytics": (
+            runtime.analytics.totals(dt_util.utcnow().timestamp())
+            if runtime.analytics
+            else None
+        ),
+        "webhook_sequencing": {
+            "duplicates": runtime.deduplicator.duplicates,
+            **(runtime.sequencer.stats() if runtime.sequencer else {}),
+        },
         "calls": async_redact_data(
             {
                 internal_id: session.to_dict()
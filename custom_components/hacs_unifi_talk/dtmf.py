@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: 2025 Michael E. Harrington
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DTMF_SEQUENCE_EVENT, TERMINAL_CALL_EVENTS
+
+if TYPE_CHECKING:
+    from . import CallSession
+
+
+class DtmfCollector:
+    """Buffers DTMF digits per call and emits each completed sequence once.
+
+    A sequence completes on the terminator digit, when ``max_length`` digits have
+    been entered, or after ``timeout`` seconds without another digit. Digits
+    still buffered when a call ends are discarded. Sequences completed by a
+    digit are held for ``async_pop_completed`` so they apply in the same batch
+    as that digit, ahead of a hangup later in it; timed-out ones are emitted.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        emit: Callable[[dict[str, Any]], Any],
+        terminator: str,
+        max_length: int,
+        timeout: float,
+        sequence_only: bool = False,
+    ) -> None:
+        self.hass = hass
+        self.terminator = terminator
+        self.max_length = max_length
+        self.timeout = timeout
+        self.sequence_only = sequence_only
+        self._emit = emit
+        self._buffers: dict[str, list[str]] = {}
+        self._sessions: dict[str, CallSession] = {}
+        self._timers: dict[str, CALLBACK_TYPE] = {}
+        self._completed: list[dict[str, Any]] = []
+        self.sequences = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"buffered_calls": len(self._buffers), "sequences": self.sequences}
+
+    @callback
+    def async_handle_event(self, session: CallSession, payload: dict[str, Any]) -> None:
+        internal_id = session.internal_id
+        event = session.last_event
+        if event in TERMINAL_CALL_EVENTS:
+            self._discard(internal_id)
+            return
+        if event != "dtmf_digit" or not payload.get("digit"):
+            return
+
+        digit = str(payload["digit"])
+        if digit == self.terminator:
+            if internal_id in self._buffers:
+                self._completed.append(self._complete(internal_id, "terminator"))
+            return
+
+        buffer = self._buffers.setdefault(internal_id, [])
+        buffer.append(digit)
+        self._sessions[internal_id] = session
+        if self.max_length and len(buffer) >= self.max_length:
+            self._completed.append(self._complete(internal_id, "max_length"))
+            return
+        self._cancel_timer(internal_id)
+        self._timers[internal_id] = async_call_later(
+            self.hass, self.timeout, partial(self._async_timeout, internal_id)
+        )
+
+    @callback
+    def async_pop_completed(self) -> list[dict[str, Any]]:
+        completed, self._completed = self._completed, []
+        return completed
+
+    @callback
+    def async_stop(self) -> None:
+        for internal_id in list(self._buffers):
+            self._discard(internal_id)
+        self._completed.clear()
+
+    @callback
+    def _async_timeout(self, internal_id: str, _: datetime) -> None:
+        self._timers.pop(internal_id, None)
+        if internal_id in self._buffers:
+            self._emit(self._complete(internal_id, "timeout"))
+
+    def _complete(self, internal_id: str, reason: str) -> dict[str, Any]:
+        digits = "".join(self._buffers[internal_id])
+        session = self._sessions[internal_id]
+        self._discard(internal_id)
+        self.sequences += 1
+        return {
+            "event": DTMF_SEQUENCE_EVENT,
+            "internal_id": internal_id,
+            "digits": digits,
+            "reason": reason,
+            "caller": session.caller,
+            "parsed_caller": session.parsed_caller,
+            "sip_account": session.sip_account,
+        }
+
+    def _discard(self, internal_id: str) -> None:
+        self._cancel_timer(internal_id)
+        self._buffers.pop(internal_id, None)
+        self._sessions.pop(internal_id, None)
+
+    def _cancel_timer(self, internal_id: str) -> None:
+        if (unsub := self._timers.pop(internal_id, None)) is not None:
+            unsub()
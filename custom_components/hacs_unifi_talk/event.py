@@ -8,8 +8,8 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import UniFiTalkConfigEntry
-from .const import CALL_EVENT_TYPES, SIGNAL_CALL_STATE
+from . import RuntimeSnapshot, UniFiTalkConfigEntry
+from .const import ENTITY_EVENT_TYPES, SIGNAL_CALL_STATE
 from .entity import device_info
 
 
@@ -27,7 +27,7 @@ class UniFiTalkCallEventEntity(EventEntity):
     _attr_name = "Call Event"
     _attr_icon = "mdi:phone-ring"
     _attr_should_poll = False
-    _attr_event_types = list(CALL_EVENT_TYPES)
+    _attr_event_types = list(ENTITY_EVENT_TYPES)
 
     def __init__(self, entry: UniFiTalkConfigEntry) -> None:
         self.entry = entry
@@ -48,21 +48,24 @@ class UniFiTalkCallEventEntity(EventEntity):
             self._unsub_dispatcher = None
 
     @callback
-    def _handle_push_update(self, payload: dict) -> None:
-        event_type = payload.get("event")
-        if event_type not in CALL_EVENT_TYPES:
-            return
+    def _handle_push_update(self, payloads: list[dict], _: RuntimeSnapshot) -> None:
+        for payload in payloads:
+            event_type = payload.get("event")
+            if event_type not in ENTITY_EVENT_TYPES:
+                continue
 
-        self._trigger_event(
-            event_type,
-            {
-                "internal_id": payload.get("internal_id"),
-                "parsed_caller": payload.get("parsed_caller"),
-                "caller": payload.get("caller"),
-                "digit": payload.get("digit"),
-                "menu_id": payload.get("menu_id"),
-                "sip_account": payload.get("sip_account"),
-                "timestamp": payload.get("timestamp"),
-            },
-        )
-        self.async_write_ha_state()
+            self._trigger_event(
+                event_type,
+                {
+                    "internal_id": payload.get("internal_id"),
+                    "parsed_caller": payload.get("parsed_caller"),
+                    "caller": payload.get("caller"),
+                    "caller_name": payload.get("caller_name"),
+                    "digit": payload.get("digit"),
+                    "digits": payload.get("digits"),
+                    "menu_id": payload.get("menu_id"),
+                    "sip_account": payload.get("sip_account"),
+                    "timestamp": payload.get("timestamp"),
+                },
+            )
+            self.async_write_ha_state()
@@ -0,0 +1,401 @@
+# SPDX-FileCopyrightText: 2025 Michael E. Harrington
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+
+from .const import DTMF_SEQUENCE_EVENT
+from .phonebook import caller_key
+
+if TYPE_CHECKING:
+    from . import CallSession
+
+HISTORY_FLUSH_DELAY = 5.0
+HISTORY_FLUSH_BATCH = 100
+HISTORY_PRUNE_INTERVAL = timedelta(days=1)
+# Version 1 stores normalized caller keys; version 2 adds collected DTMF digits.
+HISTORY_SCHEMA_VERSION = 2
+
+CALL_OUTCOMES: tuple[str, ...] = (
+    "in_progress",
+    "answered",
+    "missed",
+    "ring_timeout",
+    "timeout",
+)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS calls (
+        internal_id TEXT PRIMARY KEY,
+        direction TEXT NOT NULL,
+        caller TEXT,
+        parsed_caller TEXT,
+        caller_key TEXT,
+        sip_account INTEGER,
+        started_at REAL NOT NULL,
+        established_at REAL,
+        ended_at REAL,
+        updated_at REAL NOT NULL,
+        last_event TEXT NOT NULL,
+        event_count INTEGER NOT NULL,
+        outcome TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS call_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        internal_id TEXT NOT NULL,
+        timestamp REAL NOT NULL,
+        event TEXT NOT NULL,
+        digit TEXT,
+        digits TEXT,
+        menu_id TEXT,
+        type TEXT,
+        message TEXT,
+        audio_file TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS calls_started ON calls (started_at)",
+    "CREATE INDEX IF NOT EXISTS calls_caller ON calls (caller_key, started_at)",
+    "CREATE INDEX IF NOT EXISTS calls_direction ON calls (direction, started_at)",
+    "CREATE INDEX IF NOT EXISTS calls_outcome ON calls (outcome, started_at)",
+    "CREATE INDEX IF NOT EXISTS call_events_call "
+    "ON call_events (internal_id, timestamp)",
+)
+
+_UPSERT_CALL = """
+    INSERT INTO calls (
+        internal_id, direction, caller, parsed_caller, caller_key, sip_account,
+        started_at, established_at, ended_at, updated_at, last_event,
+        event_count, outcome
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (internal_id) DO UPDATE SET
+        direction = excluded.direction,
+        caller = excluded.caller,
+        parsed_caller = excluded.parsed_caller,
+        caller_key = excluded.caller_key,
+        sip_account = excluded.sip_account,
+        established_at = excluded.established_at,
+        ended_at = excluded.ended_at,
+        updated_at = excluded.updated_at,
+        last_event = excluded.last_event,
+        event_count = excluded.event_count,
+        outcome = excluded.outcome
+"""
+
+_INSERT_EVENT = """
+    INSERT INTO call_events (
+        internal_id, timestamp, event, digit, digits, menu_id, type, message,
+        audio_file
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def call_outcome(session: CallSession) -> str:
+    if session.active:
+        return "in_progress"
+    if session.last_event in ("ring_timeout", "timeout"):
+        return session.last_event
+    return "answered" if session.established_at is not None else "missed"
+
+
+def _encode_cursor(call: dict[str, Any], started_at: float) -> str:
+    return f"{started_at!r}:{call['internal_id']}"
+
+
+def _decode_cursor(cursor: str) -> tuple[float, str]:
+    started_at, separator, internal_id = cursor.partition(":")
+    try:
+        if separator and internal_id:
+            return float(started_at), internal_id
+    except ValueError:
+        pass
+    raise ServiceValidationError(f"Invalid call history cursor: {cursor}")
+
+
+def _iso(value: float | None) -> str | None:
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, UTC).isoformat()
+
+
+class _HistoryDatabase:
+    """Blocking SQLite access; every method runs in the executor."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def open(self) -> None:
+        with self._lock:
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version < 1:
+                    conn.create_function(
+                        "caller_key", 1, caller_key, deterministic=True
+                    )
+                    conn.execute(
+                        "UPDATE calls SET caller_key = "
+                        "caller_key(COALESCE(NULLIF(parsed_caller, ''), caller))"
+                    )
+                columns = {
+                    row["name"]
+                    for row in conn.execute("PRAGMA table_info(call_events)")
+                }
+                if version < 2 and "digits" not in columns:
+                    conn.execute("ALTER TABLE call_events ADD COLUMN digits TEXT")
+                conn.execute(f"PRAGMA user_version = {HISTORY_SCHEMA_VERSION}")
+            self._conn = conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def write(
+        self, calls: list[tuple[Any, ...]], events: list[tuple[Any, ...]]
+    ) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT_CALL, calls)
+            self._conn.executemany(_INSERT_EVENT, events)
+
+    def prune(self, cutoff: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM call_events WHERE internal_id IN "
+                "(SELECT internal_id FROM calls WHERE updated_at < ?)",
+                (cutoff,),
+            )
+            self._conn.execute("DELETE FROM calls WHERE updated_at < ?", (cutoff,))
+
+    def query(
+        self,
+        *,
+        start: float | None,
+        end: float | None,
+        caller: str | None,
+        direction: str | None,
+        outcome: str | None,
+        before: tuple[float, str] | None,
+        limit: int,
+        include_events: bool,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        for clause, value in (
+            ("started_at >= ?", start),
+            ("started_at < ?", end),
+            ("caller_key = ?", caller),
+            ("direction = ?", direction),
+            ("outcome = ?", outcome),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        if before is not None:
+            # Calls sharing a start time are ordered by ID, so a page boundary
+            # between them neither skips nor repeats any.
+            clauses.append("(started_at, internal_id) < (?, ?)")
+            params.extend(before)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM calls {where} "
+                "ORDER BY started_at DESC, internal_id DESC LIMIT ?",
+                params,
+            ).fetchall()
+            calls = [
+                {
+                    "internal_id": row["internal_id"],
+                    "direction": row["direction"],
+                    "caller": row["caller"],
+                    "parsed_caller": row["parsed_caller"],
+                    "sip_account": row["sip_account"],
+                    "started_at": _iso(row["started_at"]),
+                    "established_at": _iso(row["established_at"]),
+                    "ended_at": _iso(row["ended_at"]),
+                    "updated_at": _iso(row["updated_at"]),
+                    "last_event": row["last_event"],
+                    "event_count": row["event_count"],
+                    "outcome": row["outcome"],
+                }
+                for row in rows
+            ]
+            if include_events and calls:
+                by_id = {call["internal_id"]: call for call in calls}
+                for call in calls:
+                    call["events"] = []
+                placeholders = ",".join("?" * len(by_id))
+                for row in self._conn.execute(
+                    "SELECT * FROM call_events "
+                    f"WHERE internal_id IN ({placeholders}) "
+                    "ORDER BY timestamp, id",
+                    list(by_id),
+                ):
+                    by_id[row["internal_id"]]["events"].append(
+                        {
+                            "timestamp": _iso(row["timestamp"]),
+                            "event": row["event"],
+                            "digit": row["digit"],
+                            "digits": row["digits"],
+                            "menu_id": row["menu_id"],
+                            "type": row["type"],
+                            "message": row["message"],
+                            "audio_file": row["audio_file"],
+                        }
+                    )
+        cursor = (
+            _encode_cursor(calls[-1], rows[-1]["started_at"])
+            if len(calls) == limit
+            else None
+        )
+        return calls, cursor
+
+
+class CallHistory:
+    """Long-term call history backed by SQLite, written in batches."""
+
+    def __init__(self, hass: HomeAssistant, path: str, retention_days: int) -> None:
+        self.hass = hass
+        self._db = _HistoryDatabase(path)
+        self._retention = timedelta(days=retention_days)
+        self._pending_calls: dict[str, tuple[Any, ...]] = {}
+        self._pending_events: list[tuple[Any, ...]] = []
+        self._flush_lock = asyncio.Lock()
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._unsub_prune: CALLBACK_TYPE | None = None
+
+    async def async_setup(self) -> None:
+        await self.hass.async_add_executor_job(self._db.open)
+        await self._async_prune()
+        self._unsub_prune = async_track_time_interval(
+            self.hass, self._async_prune, HISTORY_PRUNE_INTERVAL
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_prune is not None:
+            self._unsub_prune()
+            self._unsub_prune = None
+
+    async def async_close(self) -> None:
+        self.async_stop()
+        await self.async_flush()
+        await self.hass.async_add_executor_job(self._db.close)
+
+    @callback
+    def async_record(self, session: CallSession, payload: dict[str, Any]) -> None:
+        event = payload.get("event") or session.last_event
+        # A completed DTMF sequence adds an event row but leaves the call as is.
+        if event != DTMF_SEQUENCE_EVENT:
+            self._record_call(session)
+        self._pending_events.append(
+            (
+                session.internal_id,
+                session.updated_at,
+                event,
+                payload.get("digit"),
+                payload.get("digits"),
+                payload.get("menu_id"),
+                payload.get("type"),
+                payload.get("message"),
+                payload.get("audio_file"),
+            )
+        )
+        if len(self._pending_events) >= HISTORY_FLUSH_BATCH:
+            self._cancel_flush()
+            self.hass.async_create_task(self.async_flush())
+        elif self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, HISTORY_FLUSH_DELAY, self._async_scheduled_flush
+            )
+
+    def _record_call(self, session: CallSession) -> None:
+        self._pending_calls[session.internal_id] = (
+            session.internal_id,
+            session.direction,
+            session.caller,
+            session.parsed_caller,
+            caller_key(session.parsed_caller or session.caller),
+            session.sip_account,
+            session.created_at,
+            session.established_at,
+            session.disconnected_at,
+            session.updated_at,
+            session.last_event,
+            session.event_count,
+            call_outcome(session),
+        )
+
+    async def async_flush(self) -> None:
+        self._cancel_flush()
+        async with self._flush_lock:
+            if not self._pending_calls and not self._pending_events:
+                return
+            calls = list(self._pending_calls.values())
+            events = self._pending_events
+            self._pending_calls = {}
+            self._pending_events = []
+            await self.hass.async_add_executor_job(self._db.write, calls, events)
+
+    async def async_query(
+        self,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        caller: str | None = None,
+        direction: str | None = None,
+        outcome: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+        include_events: bool = False,
+    ) -> dict[str, Any]:
+        before = _decode_cursor(cursor) if cursor is not None else None
+        await self.async_flush()
+        calls, next_cursor = await self.hass.async_add_executor_job(
+            lambda: self._db.query(
+                start=start.timestamp() if start else None,
+                end=end.timestamp() if end else None,
+                caller=caller_key(caller) if caller is not None else None,
+                direction=direction,
+                outcome=outcome,
+                before=before,
+                limit=limit,
+                include_events=include_events,
+            )
+        )
+        return {"calls": calls, "count": len(calls), "next_cursor": next_cursor}
+
+    @callback
+    def _cancel_flush(self) -> None:
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+
+    async def _async_scheduled_flush(self, _: datetime) -> None:
+        self._unsub_flush = None
+        await self.async_flush()
+
+    async def _async_prune(self, _: datetime | None = None) -> None:
+        cutoff = (datetime.now(UTC) - self._retention).timestamp()
+        await self.hass.async_add_executor_job(self._db.prune, cutoff)
@@ -0,0 +1,121 @@
+# SPDX-FileCopyrightText: 2025 Michael E. Harrington
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+INGEST_BATCH_SIZE = 50
+
+
+class WebhookIngestQueue:
+    """Bounded queue between the webhook handler and runtime state updates.
+
+    The handler only enqueues. A single consumer drains whatever has queued up and
+    hands it to ``process_batch`` in arrival order, so bursts are applied with one
+    entity update and one save instead of one per request. Events delivered
+    together in one request are never split across batches. Capacity is counted
+    in events, not requests.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        process_batch: Callable[[list[dict[str, Any]]], None],
+        maxsize: int,
+    ) -> None:
+        self.hass = hass
+        self.maxsize = maxsize
+        self._process_batch = process_batch
+        self._queue: asyncio.Queue[list[dict[str, Any]]] = asyncio.Queue()
+        self._size = 0
+        self._task: asyncio.Task[None] | None = None
+        self.dropped = 0
+        self.high_water_mark = 0
+        self.processed = 0
+        self.batches = 0
+
+    @property
+    def depth(self) -> int:
+        return self._size
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "depth": self.depth,
+            "capacity": self.maxsize,
+            "high_water_mark": self.high_water_mark,
+            "dropped": self.dropped,
+            "processed": self.processed,
+            "batches": self.batches,
+        }
+
+    @callback
+    def async_start(self, entry: ConfigEntry) -> None:
+        self._task = entry.async_create_background_task(
+            self.hass, self._async_consume(), f"{entry.domain} webhook ingest"
+        )
+
+    async def async_stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Apply anything accepted before shutdown so it is persisted.
+        while batch := self._drain([]):
+            self._run_batch(batch)
+
+    @callback
+    def async_put(self, payloads: list[dict[str, Any]]) -> bool:
+        if not payloads:
+            return True
+        if self._size + len(payloads) > self.maxsize:
+            self.dropped += len(payloads)
+            _LOGGER.warning(
+                "Webhook queue is full (%s events); dropping %s event(s)",
+                self.maxsize,
+                len(payloads),
+            )
+            return False
+        self._queue.put_nowait(payloads)
+        self._size += len(payloads)
+        self.high_water_mark = max(self.high_water_mark, self._size)
+        return True
+
+    async def _async_consume(self) -> None:
+        while True:
+            batch = self._take([], await self._queue.get())
+            self._run_batch(self._drain(batch))
+
+    def _take(
+        self, batch: list[dict[str, Any]], payloads: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        self._size -= len(payloads)
+        batch.extend(payloads)
+        return batch
+
+    def _drain(self, batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        while len(batch) < INGEST_BATCH_SIZE:
+            try:
+                self._take(batch, self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    def _run_batch(self, batch: list[dict[str, Any]]) -> None:
+        self.batches += 1
+        self.processed += len(batch)
+        try:
+            self._process_batch(batch)
+        except Exception:
+            _LOGGER.exception("Error applying %s webhook event(s)", len(batch))
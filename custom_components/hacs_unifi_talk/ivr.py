@@ -0,0 +1,406 @@
+# SPDX-FileCopyrightText: 2025 Michael E. Harrington
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util.yaml import load_yaml
+
+from .const import TERMINAL_CALL_EVENTS
+
+if TYPE_CHECKING:
+    from . import CallSession
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_IVR_TIMEOUT = 10
+DEFAULT_IVR_RETRIES = 2
+
+_STEP_SCHEMA = vol.Any(
+    vol.In(("hangup", "repeat")),
+    vol.Schema({vol.Required("say"): cv.string, vol.Optional("language"): cv.string}),
+    vol.Schema({vol.Required("play"): cv.string}),
+    vol.Schema({vol.Required("goto"): cv.string}),
+    vol.Schema({vol.Required("transfer"): cv.string}),
+    vol.Schema(
+        {
+            vol.Required("service"): cv.service,
+            vol.Optional("data", default={}): dict,
+        }
+    ),
+)
+_STEPS_SCHEMA = vol.All(cv.ensure_list, [_STEP_SCHEMA])
+
+MENU_SCHEMA = vol.Schema(
+    {
+        vol.Required("prompt"): cv.string,
+        vol.Optional("language"): cv.string,
+        vol.Optional("timeout", default=DEFAULT_IVR_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1)
+        ),
+        vol.Optional("retries", default=DEFAULT_IVR_RETRIES): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Optional("choices", default={}): {
+            vol.All(vol.Coerce(str), vol.Match(r"^[0-9*#]+$")): _STEPS_SCHEMA
+        },
+        vol.Optional("invalid", default=["repeat"]): _STEPS_SCHEMA,
+        vol.Optional("no_input", default=["repeat"]): _STEPS_SCHEMA,
+        vol.Optional("exhausted", default=["hangup"]): _STEPS_SCHEMA,
+    }
+)
+
+IVR_SCHEMA = vol.Schema(
+    {
+        vol.Optional("start"): cv.string,
+        vol.Optional("answer_incoming", default=False): bool,
+        vol.Required("menus"): vol.All({cv.string: MENU_SCHEMA}, vol.Length(min=1)),
+    }
+)
+
+IvrStep = tuple[str, Any]
+
+
+@dataclass(frozen=True, slots=True)
+class IvrMenu:
+    name: str
+    prompt: str
+    language: str | None
+    timeout: float
+    retries: int
+    choices: dict[str, tuple[IvrStep, ...]]
+    # Every proper prefix of a multi-digit choice, so input can keep collecting.
+    prefixes: frozenset[str]
+    invalid: tuple[IvrStep, ...]
+    no_input: tuple[IvrStep, ...]
+    exhausted: tuple[IvrStep, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class IvrDefinition:
+    start: str
+    answer_incoming: bool
+    menus: dict[str, IvrMenu]
+
+
+@dataclass(slots=True)
+class _IvrCall:
+    internal_id: str
+    menu: IvrMenu
+    digits: str = ""
+    attempts: int = 0
+    unsub_timer: CALLBACK_TYPE | None = field(default=None, repr=False)
+
+
+def _compile_steps(steps: list[Any], menus: dict[str, Any]) -> tuple[IvrStep, ...]:
+    compiled: list[IvrStep] = []
+    for step in steps:
+        if isinstance(step, str):
+            compiled.append((step, None))
+        elif "say" in step:
+            compiled.append(("say", (step["say"], step.get("language"))))
+        elif "goto" in step:
+            if step["goto"] not in menus:
+                raise vol.Invalid(f"goto references unknown menu '{step['goto']}'")
+            compiled.append(("goto", step["goto"]))
+        elif "service" in step:
+            domain, service = step["service"].split(".", 1)
+            compiled.append(("service", (domain, service, step["data"])))
+        else:
+            kind = next(iter(step))
+            compiled.append((kind, step[kind]))
+    return tuple(compiled)
+
+
+def compile_ivr(config: dict[str, Any]) -> IvrDefinition:
+    """Validate an IVR definition and compile it into lookup tables."""
+    config = IVR_SCHEMA(config)
+    menus = config["menus"]
+    start = config.get("start") or next(iter(menus))
+    if start not in menus:
+        raise vol.Invalid(f"start references unknown menu '{start}'")
+
+    compiled: dict[str, IvrMenu] = {}
+    for name, menu in menus.items():
+        choices = {
+            digits: _compile_steps(steps, menus)
+            for digits, steps in menu["choices"].items()
+        }
+        compiled[name] = IvrMenu(
+            name=name,
+            prompt=menu["prompt"],
+            language=menu.get("language"),
+            timeout=menu["timeout"],
+            retries=menu["retries"],
+            choices=choices,
+            prefixes=frozenset(
+                digits[:length]
+                for digits in choices
+                for length in range(1, len(digits))
+            ),
+            invalid=_compile_steps(menu["invalid"], menus),
+            no_input=_compile_steps(menu["no_input"], menus),
+            exhausted=_compile_steps(menu["exhausted"], menus),
+        )
+    return IvrDefinition(
+        start=start,
+        answer_incoming=config["answer_incoming"],
+        menus=compiled,
+    )
+
+
+async def async_load_ivr(hass: HomeAssistant, path: str) -> IvrDefinition | None:
+    try:
+        config = await hass.async_add_executor_job(load_yaml, path)
+        return compile_ivr(config or {})
+    except HomeAssistantError as err:
+        _LOGGER.error("Unable to read IVR definition %s: %s", path, err)
+    except vol.Invalid as err:
+        _LOGGER.error("Invalid IVR definition in %s: %s", path, err)
+    return None
+
+
+class IvrEngine:
+    """Runs IVR menus for calls directly from webhook events.
+
+    Menu transitions are decided synchronously when an event is applied. The
+    ha-sip commands a transition needs are submitted in order in the background;
+    the command dispatcher keeps commands for one call in submission order.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        definition: IvrDefinition,
+        send: Callable[[dict[str, Any]], Awaitable[None]],
+        normalize_target: Callable[[str], str],
+    ) -> None:
+        self.hass = hass
+        self.entry = entry
+        self.definition = definition
+        self._send = send
+        self._normalize_target = normalize_target
+        self._calls: dict[str, _IvrCall] = {}
+
+    def stats(self) -> dict[str, int]:
+        return {"menus": len(self.definition.menus), "active_calls": len(self._calls)}
+
+    @callback
+    def async_start(
+        self, internal_id: str, menu: str | None = None, answer: bool = False
+    ) -> None:
+        self._end(internal_id)
+        call = _IvrCall(
+            internal_id, self.definition.menus[menu or self.definition.start]
+        )
+        self._calls[internal_id] = call
+        if answer:
+            prompt_menu: dict[str, Any] = {"message": call.menu.prompt}
+            if call.menu.language:
+                prompt_menu["language"] = call.menu.language
+            self._dispatch(
+                [{"command": "answer", "number": internal_id, "menu": prompt_menu}]
+            )
+        else:
+            self._dispatch([self._prompt(call)])
+        self._arm(call)
+
+    @callback
+    def async_stop(self) -> None:
+        for internal_id in list(self._calls):
+            self._end(internal_id)
+
+    @callback
+    def async_handle_event(self, session: CallSession, payload: dict[str, Any]) -> None:
+        event = session.last_event
+        internal_id = session.internal_id
+        if event == "incoming_call":
+            if self.definition.answer_incoming and internal_id not in self._calls:
+                self.async_start(internal_id, answer=True)
+            return
+
+        call = self._calls.get(internal_id)
+        if call is None:
+            return
+        if event in TERMINAL_CALL_EVENTS:
+            self._end(internal_id)
+        elif event == "dtmf_digit" and payload.get("digit"):
+            self._handle_digit(call, str(payload["digit"]))
+        elif event == "playback_done" and not call.digits:
+            # Give the caller the full timeout after the prompt finishes.
+            self._arm(call)
+
+    def _handle_digit(self, call: _IvrCall, digit: str) -> None:
+        call.digits += digit
+        menu = call.menu
+        if call.digits in menu.prefixes:
+            # Wait for more digits; a complete shorter choice runs on timeout.
+            self._arm(call)
+            return
+        steps = menu.choices.get(call.digits)
+        if steps is None:
+            self._retry(call, menu.invalid)
+            return
+        call.digits = ""
+        call.attempts = 0
+        self._run(call, steps)
+
+    def _retry(self, call: _IvrCall, steps: tuple[IvrStep, ...]) -> None:
+        call.digits = ""
+        call.attempts += 1
+        if call.attempts > call.menu.retries:
+            steps = call.menu.exhausted
+        self._run(call, steps)
+
+    @callback
+    def _async_timeout(self, internal_id: str, _: datetime) -> None:
+        call = self._calls.get(internal_id)
+        if call is None:
+            return
+        call.unsub_timer = None
+        if call.digits in call.menu.choices:
+            steps = call.menu.choices[call.digits]
+            call.digits = ""
+            call.attempts = 0
+            self._run(call, steps)
+        elif call.digits:
+            self._retry(call, call.menu.invalid)
+        else:
+            self._retry(call, call.menu.no_input)
+
+    def _run(self, call: _IvrCall, steps: tuple[IvrStep, ...]) -> None:
+        internal_id = call.internal_id
+        commands: list[dict[str, Any]] = []
+        ended = False
+        for index, (kind, arg) in enumerate(steps):
+            # Let playback finish before ha-sip runs the next step for this call.
+            wait = index < len(steps) - 1
+            if kind == "say":
+                message, language = arg
+                command = self._play_message(internal_id, message, language)
+                command["wait_for_audio_to_finish"] = wait
+                commands.append(command)
+            elif kind == "play":
+                commands.append(
+                    {
+                        "command": "play_audio_file",
+                        "number": internal_id,
+                        "audio_file": arg,
+                        "wait_for_audio_to_finish": wait,
+                    }
+                )
+            elif kind == "goto":
+                call.menu = self.definition.menus[arg]
+                call.attempts = 0
+                commands.append(self._prompt(call))
+            elif kind == "repeat":
+                commands.append(self._prompt(call))
+            elif kind == "service":
+                self.entry.async_create_background_task(
+                    self.hass,
+                    self._async_call_service(call.menu.name, internal_id, *arg),
+                    f"{self.entry.domain} IVR service",
+                )
+            elif kind == "transfer":
+                commands.append(
+                    {
+                        "command": "transfer",
+                        "number": internal_id,
+                        "transfer_to": self._normalize_target(arg),
+                    }
+                )
+                ended = True
+                break
+            elif kind == "hangup":
+                commands.append({"command": "hangup", "number": internal_id})
+                ended = True
+                break
+
+        if ended:
+            self._end(internal_id)
+        else:
+            self._arm(call)
+        self._dispatch(commands)
+
+    def _prompt(self, call: _IvrCall) -> dict[str, Any]:
+        return self._play_message(
+            call.internal_id, call.menu.prompt, call.menu.language
+        )
+
+    @staticmethod
+    def _play_message(
+        internal_id: str, message: str, language: str | None
+    ) -> dict[str, Any]:
+        command: dict[str, Any] = {
+            "command": "play_message",
+            "number": internal_id,
+            "message": message,
+        }
+        if language:
+            command["tts_language"] = language
+        return command
+
+    def _arm(self, call: _IvrCall) -> None:
+        if call.unsub_timer is not None:
+            call.unsub_timer()
+        call.unsub_timer = async_call_later(
+            self.hass,
+            call.menu.timeout,
+            partial(self._async_timeout, call.internal_id),
+        )
+
+    def _end(self, internal_id: str) -> None:
+        call = self._calls.pop(internal_id, None)
+        if call is not None and call.unsub_timer is not None:
+            call.unsub_timer()
+            call.unsub_timer = None
+
+    def _dispatch(self, commands: list[dict[str, Any]]) -> None:
+        for command in commands:
+            self.entry.async_create_background_task(
+                self.hass, self._async_send(command), f"{self.entry.domain} IVR"
+            )
+
+    async def _async_call_service(
+        self,
+        menu: str,
+        internal_id: str,
+        domain: str,
+        service: str,
+        data: dict[str, Any],
+    ) -> None:
+        try:
+            await self.hass.services.async_call(domain, service, data)
+        except (HomeAssistantError, vol.Invalid) as err:
+            _LOGGER.warning(
+                "IVR menu %s service %s.%s for call %s failed: %s",
+                menu,
+                domain,
+                service,
+                internal_id,
+                err,
+            )
+
+    async def _async_send(self, command: dict[str, Any]) -> None:
+        try:
+            await self._send(command)
+        except HomeAssistantError as err:
+            _LOGGER.warning(
+                "IVR %s command for call %s failed: %s",
+                command["command"],
+                command["number"],
+                err,
+            )
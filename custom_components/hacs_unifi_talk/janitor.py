@@ -0,0 +1,258 @@
+# SPDX-FileCopyrightText: 2025 Michael E. Harrington
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+_LOGGER = logging.getLogger(__name__)
+
+AUDIO_CACHE_SCAN_INTERVAL = timedelta(minutes=15)
+# Directory entries examined per executor job, so a large cache never holds a
+# worker thread for long.
+AUDIO_CACHE_SCAN_BATCH = 500
+
+# Index entry fields: size in bytes, last used (epoch seconds), hit count.
+_SIZE, _LAST_USED, _HITS = range(3)
+
+
+class _ScanState:
+    """A directory walk that can be resumed from another executor job."""
+
+    __slots__ = ("entries", "excluded", "pending", "root")
+
+    def __init__(self, root: str, excluded: frozenset[str]) -> None:
+        self.root = root
+        self.excluded = excluded
+        self.pending = [root]
+        self.entries: list[os.DirEntry[str]] = []
+
+    @property
+    def done(self) -> bool:
+        return not self.entries and not self.pending
+
+
+def _scan_batch(state: _ScanState, limit: int) -> list[tuple[str, int, float]]:
+    found: list[tuple[str, int, float]] = []
+    examined = 0
+    while examined < limit and not state.done:
+        if not state.entries:
+            try:
+                with os.scandir(state.pending.pop()) as listing:
+                    state.entries = list(listing)
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                pass
+            continue
+        entry = state.entries.pop()
+        examined += 1
+        # Dot files are temporary files and indexes written by their owners.
+        if entry.name.startswith("."):
+            continue
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.path not in state.excluded:
+                    state.pending.append(entry.path)
+                continue
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            stat = entry.stat(follow_symlinks=False)
+        except FileNotFoundError:
+            continue
+        found.append(
+            (
+                os.path.relpath(entry.path, state.root),
+                stat.st_size,
+                # Access times are unreliable on noatime and relatime mounts,
+                # so files count as used when their modification time moves.
+                # Cache owners touch a file whenever they reuse it.
+                stat.st_mtime,
+            )
+        )
+    return found
+
+
+def _remove_files(root: str, paths: list[str]) -> list[str]:
+    removed: list[str] = []
+    for path in paths:
+        try:
+            os.remove(os.path.join(root, path))
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            _LOGGER.warning("Unable to remove cached audio %s: %s", path, err)
+            continue
+        removed.append(path)
+    return removed
+
+
+class AudioCacheJanitor:
+    """Keeps the shared audio cache directory within size and age quotas.
+
+    The directory is walked in small executor batches on an interval. Each file
+    is indexed with its size, last use, and hit count. Last use is the file's
+    modification time, which cache owners touch on every reuse; a hit is a scan
+    that finds it touched since the previous one and a new file counts as a
+    miss. Files unused for longer than ``max_age`` are removed, then the
+    least recently used files until the total fits ``max_bytes``. Directories in
+    ``excluded`` are skipped; the TTS cache manages its own.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        directory: str,
+        store: Store[dict[str, Any]],
+        max_bytes: int,
+        max_age: timedelta | None,
+        excluded: tuple[str, ...] = (),
+        on_change: Callable[[], None] | None = None,
+    ) -> None:
+        self.hass = hass
+        self.entry = entry
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._store = store
+        self._excluded = frozenset(excluded)
+        self._on_change = on_change
+        self._index: dict[str, list[float]] = {}
+        self._unsub_interval: CALLBACK_TYPE | None = None
+        self._scanning = False
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.last_scan: str | None = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "files": len(self._index),
+            "size": self.size,
+            "max_bytes": self.max_bytes,
+            "max_age_days": self.max_age.days if self.max_age else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+            "last_scan": self.last_scan,
+        }
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load() or {}
+        self._index = {
+            path: list(entry)
+            for path, entry in data.get("files", {}).items()
+            if isinstance(entry, list) and len(entry) == 3
+        }
+        self.size = int(sum(entry[_SIZE] for entry in self._index.values()))
+        self.hits = data.get("hits", 0)
+        self.misses = data.get("misses", 0)
+        self.evicted = data.get("evicted", 0)
+        self.last_scan = data.get("last_scan")
+
+    @callback
+    def async_start(self) -> None:
+        self._unsub_interval = async_track_time_interval(
+            self.hass, self._async_interval, AUDIO_CACHE_SCAN_INTERVAL
+        )
+        self.entry.async_create_background_task(
+            self.hass, self.async_run(), f"{self.entry.domain} audio cache scan"
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_interval is not None:
+            self._unsub_interval()
+            self._unsub_interval = None
+
+    async def async_run(self) -> None:
+        if self._scanning:
+            return
+        self._scanning = True
+        try:
+            await self._async_scan()
+            await self._async_enforce()
+            self.last_scan = datetime.now(UTC).isoformat()
+            await self._store.async_save(self._serialize())
+        finally:
+            self._scanning = False
+        if self._on_change is not None:
+            self._on_change()
+
+    async def _async_interval(self, _: datetime) -> None:
+        await self.async_run()
+
+    async def _async_scan(self) -> None:
+        state = _ScanState(self.directory, self._excluded)
+        # The first scan only builds the index; existing files are not misses.
+        counting = self.last_scan is not None
+        seen: dict[str, list[float]] = {}
+        while not state.done:
+            batch = await self.hass.async_add_executor_job(
+                _scan_batch, state, AUDIO_CACHE_SCAN_BATCH
+            )
+            for path, size, last_used in batch:
+                entry = self._index.get(path)
+                if entry is None:
+                    if counting:
+                        self.misses += 1
+                    entry = [size, last_used, 0]
+                elif last_used > entry[_LAST_USED]:
+                    if counting:
+                        self.hits += 1
+                    entry = [size, last_used, entry[_HITS] + 1]
+                else:
+                    entry = [size, entry[_LAST_USED], entry[_HITS]]
+                seen[path] = entry
+        # Files that disappeared since the last scan drop out of the index.
+        self._index = seen
+        self.size = int(sum(entry[_SIZE] for entry in seen.values()))
+
+    async def _async_enforce(self) -> None:
+        expired: list[str] = []
+        if self.max_age is not None:
+            cutoff = time.time() - self.max_age.total_seconds()
+            expired = [
+                path
+                for path, entry in self._index.items()
+                if entry[_LAST_USED] < cutoff
+            ]
+        size = self.size - sum(self._index[path][_SIZE] for path in expired)
+        if self.max_bytes and size > self.max_bytes:
+            removed = set(expired)
+            for path in sorted(
+                self._index, key=lambda path: self._index[path][_LAST_USED]
+            ):
+                if size <= self.max_bytes:
+                    break
+                if path not in removed:
+                    expired.append(path)
+                    size -= self._index[path][_SIZE]
+        if not expired:
+            return
+        removed = await self.hass.async_add_executor_job(
+            _remove_files, self.directory, expired
+        )
+        self.evicted += len(removed)
+        for path in removed:
+            self.size -= int(self._index.pop(path)[_SIZE])
+        _LOGGER.debug("Removed %s files from the audio cache", len(removed))
+
+    def _serialize(self) -> dict[str, Any]:
+        return {
+            "files": self._index,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+            "last_scan": self.last_scan,
+        }
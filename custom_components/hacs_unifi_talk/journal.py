@@ -0,0 +1,161 @@
+# SPDX-FileCopyrightText: 2025 Michael E. Harrington
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.json import json_dumps
+from homeassistant.helpers.storage import Store
+from homeassistant.util.json import json_loads
+
+from .const import DEFAULT_JOURNAL_COMPACT_AFTER
+
+_LOGGER = logging.getLogger(__name__)
+
+JOURNAL_FLUSH_DELAY = 1.0
+JOURNAL_COMPACT_INTERVAL = timedelta(hours=1)
+
+
+def _append_lines(path: str, lines: list[str]) -> None:
+    with open(path, "a", encoding="utf-8") as journal_file:
+        journal_file.write("".join(lines))
+
+
+def _read_records(path: str) -> list[dict[str, Any]]:
+    records: list[dict[str, Any]] = []
+    try:
+        with open(path, encoding="utf-8") as journal_file:
+            for line in journal_file:
+                if not line.strip():
+                    continue
+                try:
+                    record = json_loads(line)
+                except ValueError:
+                    # A torn final write is expected after a power loss.
+                    _LOGGER.debug("Skipping unreadable journal record in %s", path)
+                    continue
+                if isinstance(record, dict):
+                    records.append(record)
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def _truncate(path: str) -> None:
+    try:
+        os.truncate(path, 0)
+    except FileNotFoundError:
+        pass
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class CallJournal:
+    """Append-only log of webhook payloads layered on top of a Store snapshot.
+
+    Each record carries a sequence number. The snapshot stores the last sequence
+    it covers, so records that were already compacted are skipped on replay even
+    if truncating the journal did not complete.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: str,
+        store: Store[dict[str, Any]],
+        serialize: Callable[[], dict[str, Any]],
+        compact_after: int = DEFAULT_JOURNAL_COMPACT_AFTER,
+    ) -> None:
+        self.hass = hass
+        self.path = path
+        self.store = store
+        self._serialize = serialize
+        self._compact_after = compact_after
+        self._pending: list[str] = []
+        self._records_since_compact = 0
+        self._lock = asyncio.Lock()
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._unsub_interval: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        self._unsub_interval = async_track_time_interval(
+            self.hass, self._async_interval_compact, JOURNAL_COMPACT_INTERVAL
+        )
+
+    async def async_load(self) -> list[dict[str, Any]]:
+        records = await self.hass.async_add_executor_job(_read_records, self.path)
+        self._records_since_compact = len(records)
+        return records
+
+    @callback
+    def async_append(self, seq: int, timestamp: str, payload: dict[str, Any]) -> None:
+        self._pending.append(
+            json_dumps({"seq": seq, "ts": timestamp, "payload": payload}) + "\n"
+        )
+        self._records_since_compact += 1
+        if self._records_since_compact >= self._compact_after:
+            self._cancel_flush()
+            self.hass.async_create_task(self.async_compact())
+        elif self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, JOURNAL_FLUSH_DELAY, self._async_scheduled_flush
+            )
+
+    async def async_flush(self) -> None:
+        self._cancel_flush()
+        async with self._lock:
+            if not self._pending:
+                return
+            lines, self._pending = self._pending, []
+            await self.hass.async_add_executor_job(_append_lines, self.path, lines)
+
+    async def async_compact(self) -> None:
+        self._cancel_flush()
+        async with self._lock:
+            # Everything buffered so far is already reflected in the snapshot.
+            data = self._serialize()
+            self._pending = []
+            self._records_since_compact = 0
+            await self.store.async_save(data)
+            await self.hass.async_add_executor_job(_truncate, self.path)
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_interval is not None:
+            self._unsub_interval()
+            self._unsub_interval = None
+
+    async def async_close(self) -> None:
+        self.async_stop()
+        await self.async_compact()
+
+    async def async_remove(self) -> None:
+        await self.hass.async_add_executor_job(_remove, self.path)
+
+    @callback
+    def _cancel_flush(self) -> None:
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+
+    async def _async_scheduled_flush(self, _: datetime) -> None:
+        self._unsub_flush = None
+        await self.async_flush()
+
+    async def _async_interval_compact(self, _: datetime) -> None:
+        if self._records_since_compact:
+            await self.async_compact()
@@ -0,0 +1,178 @@
+# SPDX-FileCopyrightText: 2025 Michael E. Harrington
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import csv
+import logging
+import os
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .waiters import target_key
+
+_LOGGER = logging.getLogger(__name__)
+
+PHONEBOOK_CHECK_INTERVAL = timedelta(minutes=1)
+# Callers are also matched on their national number, so +1 555 123 4567 and
+# 555 123 4567 resolve to the same contact.
+NATIONAL_NUMBER_DIGITS = 10
+NORMALIZE_CACHE_SIZE = 2048
+_SEPARATORS = str.maketrans("", "", " -().")
+_VCARD_SUFFIXES = (".vcf", ".vcard")
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def number_keys(value: str | None) -> tuple[str, ...]:
+    """Return the index keys for a number, SIP URI, or extension."""
+    key = target_key(value)
+    if not key:
+        return ()
+    key = key.translate(_SEPARATORS)
+    if key.startswith("00"):
+        key = key[2:]
+    digits = key.removeprefix("+")
+    if not digits.isdigit():
+        return (key,)
+    if len(digits) > NATIONAL_NUMBER_DIGITS:
+        return (digits, digits[-NATIONAL_NUMBER_DIGITS:])
+    return (digits,)
+
+
+def caller_key(value: str | None, national: bool = True) -> str | None:
+    """Return the single key a caller is grouped and compared under.
+
+    Long numbers are keyed on their national part, so +1 555 123 4567 and
+    555 123 4567 compare equal; ``national=False`` keeps the full number.
+    """
+    keys = number_keys(value)
+    if not keys:
+        return None
+    return keys[-1] if national else keys[0]
+
+
+def _read_csv(path: str) -> list[tuple[str, list[str]]]:
+    contacts: list[tuple[str, list[str]]] = []
+    with open(path, encoding="utf-8-sig", newline="") as phonebook_file:
+        for index, row in enumerate(csv.reader(phonebook_file)):
+            cells = [cell.strip() for cell in row]
+            if not cells or not cells[0]:
+                continue
+            if index == 0 and cells[0].lower() == "name":
+                continue
+            contacts.append((cells[0], [cell for cell in cells[1:] if cell]))
+    return contacts
+
+
+def _read_vcards(path: str) -> list[tuple[str, list[str]]]:
+    contacts: list[tuple[str, list[str]]] = []
+    lines: list[str] = []
+    with open(path, encoding="utf-8-sig") as phonebook_file:
+        for raw in phonebook_file:
+            raw = raw.rstrip("\r\n")
+            # Folded vCard lines continue with a leading space or tab.
+            if raw[:1] in (" ", "\t") and lines:
+                lines[-1] += raw[1:]
+            else:
+                lines.append(raw)
+
+    name: str | None = None
+    numbers: list[str] = []
+    for line in lines:
+        prop, _, value = line.partition(":")
+        prop = prop.split(";", 1)[0].upper()
+        if prop == "BEGIN":
+            name, numbers = None, []
+        elif prop == "FN":
+            name = value.strip()
+        elif prop == "TEL":
+            numbers.append(value.strip())
+        elif prop == "END" and name:
+            contacts.append((name, numbers))
+    return contacts
+
+
+def _load(path: str) -> tuple[float, dict[str, str]] | None:
+    try:
+        mtime = os.stat(path).st_mtime
+        if path.lower().endswith(_VCARD_SUFFIXES):
+            contacts = _read_vcards(path)
+        else:
+            contacts = _read_csv(path)
+    except FileNotFoundError:
+        return None
+
+    names: dict[str, str] = {}
+    for name, numbers in contacts:
+        for number in numbers:
+            for key in number_keys.__wrapped__(number):
+                names.setdefault(key, name)
+    return mtime, names
+
+
+def _mtime(path: str) -> float | None:
+    try:
+        return os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+class Phonebook:
+    """Caller names from a CSV or vCard file, indexed by normalized number.
+
+    The file is parsed in the executor when the integration loads and again only
+    after its modification time changes, so lookups during webhook processing
+    are dictionary reads.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        self.hass = hass
+        self.path = path
+        self._names: dict[str, str] = {}
+        self._mtime: float | None = None
+        self._unsub_interval: CALLBACK_TYPE | None = None
+
+    def stats(self) -> dict[str, int]:
+        return {"numbers": len(self._names)}
+
+    def lookup(self, value: str | None) -> str | None:
+        for key in number_keys(value):
+            if (name := self._names.get(key)) is not None:
+                return name
+        return None
+
+    async def async_load(self) -> None:
+        try:
+            loaded = await self.hass.async_add_executor_job(_load, self.path)
+        except (OSError, UnicodeDecodeError, csv.Error) as err:
+            _LOGGER.error("Unable to read phonebook %s: %s", self.path, err)
+            return
+        if loaded is None:
+            _LOGGER.warning("Phonebook %s does not exist", self.path)
+            self._mtime = None
+            self._names = {}
+            return
+        self._mtime, self._names = loaded
+        _LOGGER.debug(
+            "Loaded %s phonebook numbers from %s", len(self._names), self.path
+        )
+
+    @callback
+    def async_start(self) -> None:
+        self._unsub_interval = async_track_time_interval(
+            self.hass, self._async_check, PHONEBOOK_CHECK_INTERVAL
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_interval is not None:
+            self._unsub_interval()
+            self._unsub_interval = None
+
+    async def _async_check(self, _: datetime) -> None:
+        mtime = await self.hass.async_add_executor_job(_mtime, self.path)
+        if mtime != self._mtime:
+            await self.async_load()
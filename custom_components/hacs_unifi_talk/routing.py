@@ -0,0 +1,317 @@
+# SPDX-FileCopyrightText: 2025 Michael E. Harrington
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import logging
+import re
+from bisect import bisect_right
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .phonebook import caller_key
+
+if TYPE_CHECKING:
+    from . import CallSession
+    from .ivr import IvrEngine
+
+_LOGGER = logging.getLogger(__name__)
+
+ROUTE_ACTIONS: tuple[str, ...] = (
+    "answer_and_speak",
+    "transfer",
+    "hangup",
+    "script",
+    "ivr",
+)
+MINUTES_PER_DAY = 24 * 60
+WILDCARD = "x"
+
+_WINDOW = re.compile(r"^(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})$")
+_PATTERN = re.compile(r"^(\*|[^\s*]+\*?)$")
+
+
+@dataclass(frozen=True, slots=True)
+class CallRoute:
+    pattern: str
+    action: str
+    argument: str | None
+    # Minutes of the day as [start, end); a start after the end wraps midnight.
+    window: tuple[int, int] | None
+    line: int
+
+
+@dataclass(frozen=True, slots=True)
+class _Schedule:
+    """Routes for one pattern, indexed by the minute of the day they apply from."""
+
+    starts: tuple[int, ...]
+    routes: tuple[CallRoute | None, ...]
+
+    def at(self, minute: int) -> CallRoute | None:
+        return self.routes[bisect_right(self.starts, minute) - 1]
+
+
+@dataclass(slots=True)
+class _Node:
+    children: dict[str, _Node] = field(default_factory=dict)
+    literals: int = 0
+    exact: _Schedule | None = None
+    prefix: _Schedule | None = None
+
+
+def _normalize_pattern(value: str) -> str:
+    """Normalize a pattern like the full caller key it is matched against."""
+    body = value.rstrip("*")
+    key = caller_key(body.removeprefix("+"), national=False) if body else None
+    return (key or body) + value[len(body) :]
+
+
+def _parse_window(value: str, line: int) -> tuple[int, int]:
+    match = _WINDOW.match(value)
+    if match is None:
+        raise vol.Invalid(f"line {line}: invalid time window '{value}'")
+    start_h, start_m, end_h, end_m = (int(part) for part in match.groups())
+    if start_h > 24 or end_h > 24 or start_m > 59 or end_m > 59:
+        raise vol.Invalid(f"line {line}: invalid time window '{value}'")
+    return (
+        min(start_h * 60 + start_m, MINUTES_PER_DAY),
+        min(end_h * 60 + end_m, MINUTES_PER_DAY),
+    )
+
+
+def _covers(window: tuple[int, int] | None, minute: int) -> bool:
+    if window is None:
+        return True
+    start, end = window
+    if start == end:
+        return True
+    if start < end:
+        return start <= minute < end
+    return minute >= start or minute < end
+
+
+def _compile_schedule(routes: list[CallRoute]) -> _Schedule:
+    # The first route in table order that covers a minute wins it.
+    bounds = {0}
+    for route in routes:
+        if route.window is not None:
+            bounds.update(point % MINUTES_PER_DAY for point in route.window)
+    starts = tuple(sorted(bounds))
+    return _Schedule(
+        starts=starts,
+        routes=tuple(
+            next((route for route in routes if _covers(route.window, start)), None)
+            for start in starts
+        ),
+    )
+
+
+def parse_routes(value: str | None) -> list[CallRoute]:
+    """Parse ``pattern [HH:MM-HH:MM] = action [argument]`` lines."""
+    routes: list[CallRoute] = []
+    for line, raw in enumerate((value or "").splitlines(), start=1):
+        text = raw.strip()
+        if not text or text.startswith("#"):
+            continue
+        match_part, sep, action_part = text.partition("=")
+        if not sep:
+            raise vol.Invalid(f"line {line}: expected 'pattern = action'")
+        tokens = match_part.split()
+        if not tokens or len(tokens) > 2:
+            raise vol.Invalid(f"line {line}: expected 'pattern [HH:MM-HH:MM]'")
+        pattern = _normalize_pattern(tokens[0])
+        if not _PATTERN.match(pattern):
+            raise vol.Invalid(f"line {line}: invalid pattern '{tokens[0]}'")
+        window = _parse_window(tokens[1], line) if len(tokens) == 2 else None
+
+        action, _, argument = action_part.strip().partition(" ")
+        argument = argument.strip() or None
+        if action not in ROUTE_ACTIONS:
+            raise vol.Invalid(f"line {line}: unknown action '{action}'")
+        if action in ("answer_and_speak", "transfer", "script") and not argument:
+            raise vol.Invalid(f"line {line}: {action} needs an argument")
+        if action == "script" and not argument.startswith("script."):
+            raise vol.Invalid(f"line {line}: expected a script entity ID")
+        routes.append(CallRoute(pattern, action, argument, window, line))
+    return routes
+
+
+class RoutingTable:
+    """Caller-ID routes compiled into a trie with a time-of-day index per node.
+
+    Patterns are exact numbers (``+15551234567``), prefixes (``555*``), numbers
+    with single-digit wildcards (``1xx``), or ``*`` for every caller. An exact
+    match beats a prefix match, longer matches beat shorter ones, and literal
+    digits beat wildcards. If the best match has no route for the current time,
+    the next best match is used.
+    """
+
+    def __init__(self, routes: list[CallRoute]) -> None:
+        self.size = len(routes)
+        self._root = _Node()
+        pending: dict[tuple[int, str], list[CallRoute]] = {}
+        nodes: dict[int, _Node] = {}
+        for route in routes:
+            is_prefix = route.pattern.endswith("*")
+            node = self._root
+            for char in route.pattern.rstrip("*"):
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _Node(
+                        literals=node.literals + (char != WILDCARD)
+                    )
+                node = child
+            nodes[id(node)] = node
+            kind = "prefix" if is_prefix else "exact"
+            pending.setdefault((id(node), kind), []).append(route)
+        for (node_id, kind), items in pending.items():
+            setattr(nodes[node_id], kind, _compile_schedule(items))
+
+    def match(self, number: str, minute: int) -> CallRoute | None:
+        candidates: list[tuple[int, int, int, _Schedule]] = []
+        active = [self._root]
+        for depth, char in enumerate(number):
+            next_active: list[_Node] = []
+            for node in active:
+                if node.prefix is not None:
+                    candidates.append((0, depth, node.literals, node.prefix))
+                if (child := node.children.get(char)) is not None:
+                    next_active.append(child)
+                if (
+                    char.isdigit()
+                    and (child := node.children.get(WILDCARD)) is not None
+                ):
+                    next_active.append(child)
+            active = next_active
+            if not active:
+                break
+        else:
+            for node in active:
+                if node.exact is not None:
+                    candidates.append((1, len(number), node.literals, node.exact))
+                if node.prefix is not None:
+                    candidates.append((0, len(number), node.literals, node.prefix))
+
+        candidates.sort(key=lambda item: item[:3], reverse=True)
+        for *_, schedule in candidates:
+            if (route := schedule.at(minute)) is not None:
+                return route
+        return None
+
+
+class CallRouter:
+    """Applies the routing table to incoming calls inside webhook processing."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        table: RoutingTable,
+        send: Callable[[dict[str, Any]], Awaitable[None]],
+        normalize_target: Callable[[str], str],
+        ivr: IvrEngine | None = None,
+    ) -> None:
+        self.hass = hass
+        self.entry = entry
+        self.table = table
+        self._send = send
+        self._normalize_target = normalize_target
+        self._ivr = ivr
+        self.routed = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"routes": self.table.size, "routed": self.routed}
+
+    @callback
+    def async_handle_event(self, session: CallSession) -> bool:
+        """Route a new incoming call; return True when a route handled it."""
+        if session.last_event != "incoming_call":
+            return False
+        caller = session.parsed_caller or session.caller
+        # The full number, so routes can match on a country code.
+        number = caller_key(caller, national=False) or ""
+        now = dt_util.now()
+        route = self.table.match(number, now.hour * 60 + now.minute)
+        if route is None:
+            return False
+
+        internal_id = session.internal_id
+        _LOGGER.debug(
+            "Routing call %s from %s by line %s: %s",
+            internal_id,
+            number,
+            route.line,
+            route.action,
+        )
+        if route.action == "ivr":
+            if self._ivr is None:
+                _LOGGER.warning(
+                    "Call route on line %s uses ivr, but no IVR is loaded", route.line
+                )
+                return False
+            if route.argument and route.argument not in self._ivr.definition.menus:
+                _LOGGER.warning(
+                    "Call route on line %s uses unknown IVR menu '%s'",
+                    route.line,
+                    route.argument,
+                )
+                return False
+            self._ivr.async_start(internal_id, route.argument, answer=True)
+        elif route.action == "script":
+            self._run(
+                self.hass.services.async_call(
+                    "script",
+                    "turn_on",
+                    {
+                        "entity_id": route.argument,
+                        "variables": {
+                            "internal_id": internal_id,
+                            "caller": session.caller,
+                            "parsed_caller": session.parsed_caller,
+                            "sip_account": session.sip_account,
+                        },
+                    },
+                )
+            )
+        elif route.action == "answer_and_speak":
+            self._command(
+                {
+                    "command": "answer",
+                    "number": internal_id,
+                    "menu": {"message": route.argument, "post_action": "hangup"},
+                }
+            )
+        elif route.action == "transfer":
+            self._command(
+                {
+                    "command": "transfer",
+                    "number": internal_id,
+                    "transfer_to": self._normalize_target(route.argument or ""),
+                }
+            )
+        else:
+            self._command({"command": "hangup", "number": internal_id})
+        self.routed += 1
+        return True
+
+    def _command(self, command: dict[str, Any]) -> None:
+        self._run(self._send(command))
+
+    def _run(self, job: Coroutine[Any, Any, Any]) -> None:
+        self.entry.async_create_background_task(
+            self.hass, self._async_run(job), f"{self.entry.domain} call route"
+        )
+
+    async def _async_run(self, job: Coroutine[Any, Any, Any]) -> None:
+        try:
+            await job
+        except HomeAssistantError as err:
+            _LOGGER.warning("Call route action failed: %s", err)
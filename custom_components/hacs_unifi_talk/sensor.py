@@ -3,16 +3,35 @@
 
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorEntity
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.const import PERCENTAGE, UnitOfInformation
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
 
-from . import UniFiTalkConfigEntry
-from .const import SIGNAL_CALL_STATE
+from . import RuntimeSnapshot, UniFiTalkConfigEntry
+from .analytics import CALLER_BUCKET_SECONDS
+from .const import (
+    SIGNAL_AUDIO_CACHE,
+    SIGNAL_BLOCKLIST,
+    SIGNAL_CALL_STATE,
+    SIGNAL_COMMAND_QUEUE,
+)
 from .entity import device_info
 
+TOP_CALLERS_ATTRIBUTE_LIMIT = 5
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -20,17 +39,31 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     del hass
-    async_add_entities(
-        [
-            UniFiTalkLastEventSensor(entry),
-            UniFiTalkActiveCallsSensor(entry),
-            UniFiTalkLastCallerSensor(entry),
-            UniFiTalkLastDtmfSensor(entry),
-        ]
-    )
+    entities: list[SensorEntity] = [
+        UniFiTalkLastEventSensor(entry),
+        UniFiTalkActiveCallsSensor(entry),
+        UniFiTalkLastCallerSensor(entry),
+        UniFiTalkLastDtmfSensor(entry),
+        UniFiTalkWebhookQueueSensor(entry),
+        UniFiTalkCommandQueueSensor(entry),
+        UniFiTalkTopCallersSensor(entry),
+    ]
+    # Options changes reload the entry, so these follow the feature settings.
+    if entry.runtime_data.blocklist is not None:
+        entities.append(UniFiTalkBlockedCallsSensor(entry))
+    if entry.runtime_data.janitor is not None:
+        entities.append(UniFiTalkAudioCacheSizeSensor(entry))
+        entities.append(UniFiTalkAudioCacheHitRateSensor(entry))
+    async_add_entities(entities)
+
+
+class UniFiTalkBaseSensor(SensorEntity, ABC):
+    """Sensor rendered from the shared runtime snapshot.
 
+    ``_snapshot_key`` must cover everything ``_apply_snapshot`` publishes; the
+    state is only written when the key changes.
+    """
 
-class UniFiTalkBaseSensor(SensorEntity):
     _attr_has_entity_name = True
     _attr_should_poll = False
 
@@ -39,6 +72,7 @@ class UniFiTalkBaseSensor(SensorEntity):
         self._attr_unique_id = f"{entry.entry_id}_{suffix}"
         self._attr_device_info = device_info(entry)
         self._unsub_dispatcher = None
+        self._state_key: tuple[Any, ...] | None = None
 
     async def async_added_to_hass(self) -> None:
         self._unsub_dispatcher = async_dispatcher_connect(
@@ -46,7 +80,7 @@ class UniFiTalkBaseSensor(SensorEntity):
             f"{SIGNAL_CALL_STATE}_{self.entry.entry_id}",
             self._handle_push_update,
         )
-        self._handle_push_update({})
+        self._handle_push_update([], self.entry.runtime_data.snapshot)
 
     async def async_will_remove_from_hass(self) -> None:
         if self._unsub_dispatcher is not None:
@@ -54,8 +88,21 @@ class UniFiTalkBaseSensor(SensorEntity):
             self._unsub_dispatcher = None
 
     @callback
-    def _handle_push_update(self, _: dict) -> None:
-        raise NotImplementedError
+    def _handle_push_update(self, _: list[dict], snapshot: RuntimeSnapshot) -> None:
+        state_key = self._snapshot_key(snapshot)
+        if state_key == self._state_key:
+            return
+        self._state_key = state_key
+        self._apply_snapshot(snapshot)
+        self.async_write_ha_state()
+
+    @abstractmethod
+    def _snapshot_key(self, snapshot: RuntimeSnapshot) -> tuple[Any, ...]:
+        """Return the values this sensor publishes, for change detection."""
+
+    @abstractmethod
+    def _apply_snapshot(self, snapshot: RuntimeSnapshot) -> None:
+        """Set state and attributes from the snapshot."""
 
 
 class UniFiTalkLastEventSensor(UniFiTalkBaseSensor):
@@ -67,21 +114,21 @@ class UniFiTalkLastEventSensor(UniFiTalkBaseSensor):
         self._attr_native_value = "idle"
         self._attr_extra_state_attributes = {}
 
-    @callback
-    def _handle_push_update(self, _: dict) -> None:
-        runtime = self.entry.runtime_data
-        summary = runtime.summary()
-        self._attr_native_value = summary["last_event"]
+    def _snapshot_key(self, snapshot: RuntimeSnapshot) -> tuple[Any, ...]:
+        return (snapshot.last_event, snapshot.last_updated)
+
+    def _apply_snapshot(self, snapshot: RuntimeSnapshot) -> None:
+        self._attr_native_value = snapshot.last_event
         self._attr_extra_state_attributes = {
-            "updated": summary["last_updated"],
-            "last_caller": summary["last_caller"],
-            "internal_id": summary["last_internal_id"],
-            "last_menu_id": summary["last_menu_id"],
-            "last_dtmf_digit": summary["last_dtmf_digit"],
-            "last_message": summary["last_message"],
-            "last_audio_file": summary["last_audio_file"],
+            "updated": snapshot.last_updated,
+            "last_caller": snapshot.last_caller,
+            "last_caller_name": snapshot.last_caller_name,
+            "internal_id": snapshot.last_internal_id,
+            "last_menu_id": snapshot.last_menu_id,
+            "last_dtmf_digit": snapshot.last_dtmf_digit,
+            "last_message": snapshot.last_message,
+            "last_audio_file": snapshot.last_audio_file,
         }
-        self.async_write_ha_state()
 
 
 class UniFiTalkActiveCallsSensor(UniFiTalkBaseSensor):
@@ -93,17 +140,20 @@ class UniFiTalkActiveCallsSensor(UniFiTalkBaseSensor):
         self._attr_native_value = 0
         self._attr_extra_state_attributes = {}
 
-    @callback
-    def _handle_push_update(self, _: dict) -> None:
-        runtime = self.entry.runtime_data
-        active_calls = runtime.active_calls()
-        self._attr_native_value = len(active_calls)
+    def _snapshot_key(self, snapshot: RuntimeSnapshot) -> tuple[Any, ...]:
+        return (
+            snapshot.active_call_ids,
+            snapshot.active_calls,
+            snapshot.recent_calls,
+        )
+
+    def _apply_snapshot(self, snapshot: RuntimeSnapshot) -> None:
+        self._attr_native_value = snapshot.active_call_count
         self._attr_extra_state_attributes = {
-            "active_call_ids": [session.internal_id for session in active_calls],
-            "active_calls": [session.to_dict() for session in active_calls[:5]],
-            "recent_calls": runtime.recent_call_snapshots(5),
+            "active_call_ids": list(snapshot.active_call_ids),
+            "active_calls": list(snapshot.active_calls),
+            "recent_calls": list(snapshot.recent_calls),
         }
-        self.async_write_ha_state()
 
 
 class UniFiTalkLastCallerSensor(UniFiTalkBaseSensor):
@@ -115,16 +165,19 @@ class UniFiTalkLastCallerSensor(UniFiTalkBaseSensor):
         self._attr_native_value = None
         self._attr_extra_state_attributes = {}
 
-    @callback
-    def _handle_push_update(self, _: dict) -> None:
-        runtime = self.entry.runtime_data
-        self._attr_native_value = runtime.last_caller
+    def _snapshot_key(self, snapshot: RuntimeSnapshot) -> tuple[Any, ...]:
+        return (
+            snapshot.last_caller,
+            snapshot.last_caller_name,
+            snapshot.last_incoming_call,
+        )
+
+    def _apply_snapshot(self, snapshot: RuntimeSnapshot) -> None:
+        self._attr_native_value = snapshot.last_caller
         self._attr_extra_state_attributes = {
-            "last_event": runtime.last_event,
-            "updated": runtime.last_updated,
-            "last_incoming_call": runtime.last_incoming_call,
+            "caller_name": snapshot.last_caller_name,
+            "last_incoming_call": snapshot.last_incoming_call,
         }
-        self.async_write_ha_state()
 
 
 class UniFiTalkLastDtmfSensor(UniFiTalkBaseSensor):
@@ -138,12 +191,245 @@ class UniFiTalkLastDtmfSensor(UniFiTalkBaseSensor):
         self._attr_native_value = None
         self._attr_extra_state_attributes = {}
 
+    def _snapshot_key(self, snapshot: RuntimeSnapshot) -> tuple[Any, ...]:
+        return (
+            snapshot.last_dtmf_digit,
+            snapshot.last_dtmf_updated or snapshot.last_updated,
+            snapshot.last_internal_id,
+        )
+
+    def _apply_snapshot(self, snapshot: RuntimeSnapshot) -> None:
+        self._attr_native_value = snapshot.last_dtmf_digit
+        self._attr_extra_state_attributes = {
+            "updated": snapshot.last_dtmf_updated or snapshot.last_updated,
+            "internal_id": snapshot.last_internal_id,
+        }
+
+
+class UniFiTalkWebhookQueueSensor(UniFiTalkBaseSensor):
+    _attr_name = "Dropped Webhook Events"
+    _attr_icon = "mdi:tray-alert"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, entry: UniFiTalkConfigEntry) -> None:
+        super().__init__(entry, "dropped_webhook_events")
+        self._attr_native_value = 0
+        self._attr_extra_state_attributes = {}
+
+    def _snapshot_key(self, snapshot: RuntimeSnapshot) -> tuple[Any, ...]:
+        ingest = self.entry.runtime_data.ingest
+        if ingest is None:
+            return ()
+        return (ingest.dropped, ingest.high_water_mark)
+
+    def _apply_snapshot(self, snapshot: RuntimeSnapshot) -> None:
+        ingest = self.entry.runtime_data.ingest
+        if ingest is None:
+            return
+        stats = ingest.stats()
+        self._attr_native_value = stats.pop("dropped")
+        self._attr_extra_state_attributes = stats
+
+
+class UniFiTalkTopCallersSensor(UniFiTalkBaseSensor):
+    _attr_name = "Top Callers"
+    _attr_icon = "mdi:account-multiple"
+    _attr_native_unit_of_measurement = "calls"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, entry: UniFiTalkConfigEntry) -> None:
+        super().__init__(entry, "top_callers")
+        self._attr_native_value = 0
+        self._attr_extra_state_attributes = {}
+
+    @property
+    def available(self) -> bool:
+        return self.entry.runtime_data.analytics is not None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self.entry.runtime_data.analytics is not None:
+            # Without new calls, counts still age out of the windows.
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass,
+                    self._async_refresh,
+                    timedelta(seconds=CALLER_BUCKET_SECONDS),
+                )
+            )
+
     @callback
-    def _handle_push_update(self, _: dict) -> None:
-        runtime = self.entry.runtime_data
-        self._attr_native_value = runtime.last_dtmf_digit
+    def _async_refresh(self, _: datetime) -> None:
+        self._handle_push_update([], self.entry.runtime_data.snapshot)
+
+    def _snapshot_key(self, snapshot: RuntimeSnapshot) -> tuple[Any, ...]:
+        analytics = self.entry.runtime_data.analytics
+        if analytics is None:
+            return ()
+        bucket = int(dt_util.utcnow().timestamp() // CALLER_BUCKET_SECONDS)
+        return (analytics.recorded, bucket)
+
+    def _apply_snapshot(self, snapshot: RuntimeSnapshot) -> None:
+        analytics = self.entry.runtime_data.analytics
+        if analytics is None:
+            return
+        now = dt_util.utcnow().timestamp()
+        totals = analytics.totals(now)
+        self._attr_native_value = totals["hour"]
         self._attr_extra_state_attributes = {
-            "updated": runtime.last_updated,
-            "internal_id": runtime.last_internal_id,
+            "calls_last_day": totals["day"],
+            "top_hour": analytics.top_callers("hour", TOP_CALLERS_ATTRIBUTE_LIMIT, now),
+            "top_day": analytics.top_callers("day", TOP_CALLERS_ATTRIBUTE_LIMIT, now),
         }
+
+
+class UniFiTalkCommandQueueSensor(SensorEntity):
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_name = "Command Queue"
+    _attr_icon = "mdi:tray-full"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, entry: UniFiTalkConfigEntry) -> None:
+        self.entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_command_queue"
+        self._attr_device_info = device_info(entry)
+        self._attr_native_value = 0
+        self._attr_extra_state_attributes = {}
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"{SIGNAL_COMMAND_QUEUE}_{self.entry.entry_id}",
+                self._handle_queue_update,
+            )
+        )
+        self._handle_queue_update()
+
+    @callback
+    def _handle_queue_update(self) -> None:
+        commands = self.entry.runtime_data.commands
+        if commands is None:
+            return
+        stats = commands.stats()
+        self._attr_native_value = stats.pop("depth")
+        self._attr_extra_state_attributes = stats
+        self.async_write_ha_state()
+
+
+class UniFiTalkBlockedCallsSensor(SensorEntity):
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_name = "Blocked Calls"
+    _attr_icon = "mdi:phone-cancel"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, entry: UniFiTalkConfigEntry) -> None:
+        self.entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_blocked_calls"
+        self._attr_device_info = device_info(entry)
+        self._attr_native_value = 0
+        self._attr_extra_state_attributes = {}
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"{SIGNAL_BLOCKLIST}_{self.entry.entry_id}",
+                self._handle_blocklist_update,
+            )
+        )
+        self._handle_blocklist_update()
+
+    @callback
+    def _handle_blocklist_update(self) -> None:
+        blocklist = self.entry.runtime_data.blocklist
+        if blocklist is not None:
+            stats = blocklist.stats()
+            self._attr_native_value = stats.pop("blocked_calls")
+            self._attr_extra_state_attributes = stats
         self.async_write_ha_state()
+
+
+class UniFiTalkAudioCacheSensor(SensorEntity, ABC):
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, entry: UniFiTalkConfigEntry, suffix: str) -> None:
+        self.entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_{suffix}"
+        self._attr_device_info = device_info(entry)
+        self._attr_native_value = None
+        self._attr_extra_state_attributes = {}
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"{SIGNAL_AUDIO_CACHE}_{self.entry.entry_id}",
+                self._handle_cache_update,
+            )
+        )
+        self._handle_cache_update()
+
+    @callback
+    def _handle_cache_update(self) -> None:
+        janitor = self.entry.runtime_data.janitor
+        if janitor is not None:
+            self._apply_stats(janitor.stats())
+        self.async_write_ha_state()
+
+    @abstractmethod
+    def _apply_stats(self, stats: dict[str, Any]) -> None:
+        """Set state and attributes from the janitor's stats."""
+
+
+class UniFiTalkAudioCacheSizeSensor(UniFiTalkAudioCacheSensor):
+    _attr_name = "Audio Cache Size"
+    _attr_icon = "mdi:folder-music"
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _attr_suggested_unit_of_measurement = UnitOfInformation.MEGABYTES
+
+    def __init__(self, entry: UniFiTalkConfigEntry) -> None:
+        super().__init__(entry, "audio_cache_size")
+
+    def _apply_stats(self, stats: dict[str, Any]) -> None:
+        tts_cache = self.entry.runtime_data.tts_cache
+        tts_size = tts_cache.size if tts_cache is not None else 0
+        self._attr_native_value = stats["size"] + tts_size
+        self._attr_extra_state_attributes = {
+            "files": stats["files"],
+            "tts_cache_size": tts_size,
+            "max_bytes": stats["max_bytes"],
+            "max_age_days": stats["max_age_days"],
+            "evicted": stats["evicted"],
+            "last_scan": stats["last_scan"],
+        }
+
+
+class UniFiTalkAudioCacheHitRateSensor(UniFiTalkAudioCacheSensor):
+    _attr_name = "Audio Cache Hit Rate"
+    _attr_icon = "mdi:bullseye-arrow"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_suggested_display_precision = 1
+
+    def __init__(self, entry: UniFiTalkConfigEntry) -> None:
+        super().__init__(entry, "audio_cache_hit_rate")
+
+    def _apply_stats(self, stats: dict[str, Any]) -> None:
+        hits, misses = stats["hits"], stats["misses"]
+        tts_cache = self.entry.runtime_data.tts_cache
+        if tts_cache is not None:
+            hits += tts_cache.hits
+            misses += tts_cache.misses
+        lookups = hits + misses
+        self._attr_native_value = round(hits / lookups * 100, 1) if lookups else None
+        self._attr_extra_state_attributes = {"hits": hits, "misses": misses}
@@ -0,0 +1,208 @@
+# SPDX-FileCopyrightText: 2025 Michael E. Harrington
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import CALL_EVENT_TYPES, TERMINAL_CALL_EVENTS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Identical retries inside this window are dropped. DTMF digits are exempt.
+DUPLICATE_WINDOW = 0.5
+DUPLICATE_CACHE_SIZE = 256
+REORDER_WINDOW = 0.5
+
+_IN_CALL_EVENTS = frozenset(
+    {"entered_menu", "dtmf_digit", "playback_done", "timeout", "call_disconnected"}
+)
+_SETUP_EVENTS = frozenset(
+    {"call_established", "ring_timeout", "timeout", "call_disconnected"}
+)
+# Events each call state may accept next. "new" is a call without a session yet.
+CALL_TRANSITIONS: dict[str, frozenset[str]] = {
+    "new": _SETUP_EVENTS | {"incoming_call"},
+    "idle": _SETUP_EVENTS | {"incoming_call"},
+    "ringing": _SETUP_EVENTS,
+    "active": _IN_CALL_EVENTS,
+    "menu": _IN_CALL_EVENTS,
+    "timed_out": frozenset(),
+    "disconnected": frozenset(),
+}
+# In-call events that can overtake call_established and are held briefly.
+EARLY_EVENTS = frozenset({"entered_menu", "dtmf_digit", "playback_done"})
+_PRE_ANSWER_STATES = frozenset({"new", "idle", "ringing"})
+
+
+def state_for_event(event: str, current: str) -> str:
+    return {
+        "incoming_call": "ringing",
+        "call_established": "active",
+        "entered_menu": "menu",
+        "dtmf_digit": current if current != "idle" else "active",
+        "playback_done": current if current != "idle" else "active",
+        "ring_timeout": "timed_out",
+        "timeout": "timed_out",
+        "call_disconnected": "disconnected",
+    }.get(event, current)
+
+
+class WebhookDeduplicator:
+    """Bounded LRU of recently seen webhook fingerprints."""
+
+    def __init__(self, maxsize: int = DUPLICATE_CACHE_SIZE) -> None:
+        self._maxsize = maxsize
+        self._seen: OrderedDict[tuple[Any, ...], float] = OrderedDict()
+        self.duplicates = 0
+
+    @callback
+    def async_is_duplicate(self, payload: dict[str, Any]) -> bool:
+        internal_id = payload.get("internal_id")
+        # ha-sip sends no delivery ID, and a caller keying "11" produces two
+        # identical digit events; those are left to the transition table.
+        if not internal_id or payload.get("event") == "dtmf_digit":
+            return False
+
+        fingerprint = (internal_id, payload.get("event"), payload.get("menu_id"))
+        now = time.monotonic()
+        seen_at = self._seen.get(fingerprint)
+        self._seen[fingerprint] = now
+        self._seen.move_to_end(fingerprint)
+        if len(self._seen) > self._maxsize:
+            self._seen.popitem(last=False)
+        if seen_at is not None and now - seen_at < DUPLICATE_WINDOW:
+            self.duplicates += 1
+            return True
+        return False
+
+
+class CallEventSequencer:
+    """Rejects impossible per-call transitions and reorders early events.
+
+    ``release`` receives held events whose reorder window expired; it must apply
+    them without passing them through the sequencer again.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        release: Callable[[list[dict[str, Any]]], None],
+    ) -> None:
+        self.hass = hass
+        self._release = release
+        self._held: dict[str, list[tuple[float, dict[str, Any]]]] = {}
+        self._unsub_expire: CALLBACK_TYPE | None = None
+        self.rejected = 0
+        self.reordered = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "rejected": self.rejected,
+            "reordered": self.reordered,
+            "held": sum(len(held) for held in self._held.values()),
+        }
+
+    @callback
+    def async_order(
+        self,
+        payloads: list[dict[str, Any]],
+        session_state: Callable[[str], str | None],
+    ) -> list[dict[str, Any]]:
+        ready: list[dict[str, Any]] = []
+        projected: dict[str, str] = {}
+        for payload in payloads:
+            internal_id = payload.get("internal_id")
+            event = payload.get("event")
+            if not internal_id or event not in CALL_EVENT_TYPES:
+                ready.append(payload)
+                continue
+
+            state = projected.get(internal_id) or session_state(internal_id) or "new"
+            if event in TERMINAL_CALL_EVENTS and internal_id in self._held:
+                # Anything held for this call happened before it ended.
+                for _, held in self._held.pop(internal_id):
+                    ready.append(held)
+                    state = state_for_event(held["event"], state)
+
+            if event in CALL_TRANSITIONS.get(state, frozenset()):
+                ready.append(payload)
+                state = state_for_event(event, state)
+                state = self._release_allowed(internal_id, state, ready)
+            elif event in EARLY_EVENTS and state in _PRE_ANSWER_STATES:
+                self._held.setdefault(internal_id, []).append(
+                    (time.monotonic(), payload)
+                )
+                self.reordered += 1
+                self._schedule_expiry()
+            else:
+                self.rejected += 1
+                _LOGGER.debug(
+                    "Ignoring %s for call %s in state %s", event, internal_id, state
+                )
+            projected[internal_id] = state
+        return ready
+
+    @callback
+    def async_release_all(self) -> None:
+        if self._unsub_expire is not None:
+            self._unsub_expire()
+            self._unsub_expire = None
+        held = sorted(
+            (item for items in self._held.values() for item in items),
+            key=lambda item: item[0],
+        )
+        self._held = {}
+        if held:
+            self._release([payload for _, payload in held])
+
+    def _release_allowed(
+        self, internal_id: str, state: str, ready: list[dict[str, Any]]
+    ) -> str:
+        held = self._held.get(internal_id)
+        while held:
+            allowed = CALL_TRANSITIONS.get(state, frozenset())
+            index = next(
+                (i for i, (_, item) in enumerate(held) if item["event"] in allowed),
+                None,
+            )
+            if index is None:
+                break
+            _, payload = held.pop(index)
+            ready.append(payload)
+            state = state_for_event(payload["event"], state)
+        if internal_id in self._held and not held:
+            del self._held[internal_id]
+        return state
+
+    @callback
+    def _schedule_expiry(self) -> None:
+        if self._unsub_expire is None:
+            self._unsub_expire = async_call_later(
+                self.hass, REORDER_WINDOW, self._async_expire
+            )
+
+    @callback
+    def _async_expire(self, _: datetime) -> None:
+        self._unsub_expire = None
+        cutoff = time.monotonic() - REORDER_WINDOW
+        expired: list[dict[str, Any]] = []
+        for internal_id in list(self._held):
+            held = self._held[internal_id]
+            while held and held[0][0] <= cutoff:
+                expired.append(held.pop(0)[1])
+            if not held:
+                del self._held[internal_id]
+        if self._held:
+            self._schedule_expiry()
+        if expired:
+            # The expected predecessor never arrived; apply them as received.
+            self._release(expired)
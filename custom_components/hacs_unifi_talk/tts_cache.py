@@ -0,0 +1,303 @@
+# SPDX-FileCopyrightText: 2025 Michael E. Harrington
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components import tts
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+TTS_CACHE_SUBDIR = "tts"
+TTS_INDEX_FILE = "index.json"
+TTS_INDEX_SAVE_DELAY = 5.0
+# Past this, the command goes out with live TTS instead of waiting longer.
+TTS_RENDER_TIMEOUT = 15.0
+# Shorter sentences are joined to the next one so chunks are not choppy.
+TTS_CHUNK_MIN_CHARS = 40
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+")
+
+
+def tts_cache_key(
+    message: str, language: str | None, voice: str | None, engine_id: str
+) -> str:
+    """Content address of one rendering of a message."""
+    material = json.dumps([message, language, voice, engine_id])
+    return hashlib.sha256(material.encode()).hexdigest()[:32]
+
+
+def split_sentences(message: str) -> list[str]:
+    """Split a message into sentence chunks that can be rendered separately."""
+    chunks: list[str] = []
+    for sentence in _SENTENCE_END.split(message.strip()):
+        if chunks and len(chunks[-1]) < TTS_CHUNK_MIN_CHARS:
+            chunks[-1] = f"{chunks[-1]} {sentence}"
+        else:
+            chunks.append(sentence)
+    if len(chunks) > 1 and len(chunks[-1]) < TTS_CHUNK_MIN_CHARS:
+        chunks[-2:] = [" ".join(chunks[-2:])]
+    return chunks
+
+
+def _read_index(path: str) -> dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as index_file:
+            data = json.load(index_file)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_index(path: str, entries: dict[str, dict[str, Any]]) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as index_file:
+        json.dump(entries, index_file)
+    os.replace(temp_path, path)
+
+
+def _write_audio(directory: str, filename: str, data: bytes) -> None:
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f".{filename}.tmp")
+    with open(temp_path, "wb") as audio_file:
+        audio_file.write(data)
+    os.replace(temp_path, os.path.join(directory, filename))
+
+
+def _remove_files(paths: list[str]) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class TtsCache:
+    """Pre-rendered TTS audio in the shared cache directory.
+
+    Files are named by a hash of (message, language, voice, engine) so ha-sip
+    can play them directly. The index keeps entries in least recently used
+    order and evicts from the front once ``max_bytes`` is exceeded. With
+    ``sentence_chunks``, long messages are rendered and played per sentence so
+    the first words do not wait for the whole text.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        cache_dir: str,
+        engine_id: str,
+        language: str | None,
+        voice: str | None,
+        max_bytes: int,
+        sentence_chunks: bool = False,
+    ) -> None:
+        self.hass = hass
+        self.directory = os.path.join(cache_dir, TTS_CACHE_SUBDIR)
+        self.engine_id = engine_id
+        self.language = language
+        self.voice = voice
+        self.max_bytes = max_bytes
+        self.sentence_chunks = sentence_chunks
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._rendering: dict[str, asyncio.Task[str | None]] = {}
+        self._unsub_save: CALLBACK_TYPE | None = None
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "size": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "failures": self.failures,
+        }
+
+    async def async_load(self) -> None:
+        index = await self.hass.async_add_executor_job(
+            _read_index, os.path.join(self.directory, TTS_INDEX_FILE)
+        )
+        entries = sorted(
+            (
+                (key, entry)
+                for key, entry in index.items()
+                if isinstance(entry, dict) and entry.get("file")
+            ),
+            key=lambda item: item[1].get("last_used", 0),
+        )
+        self._entries = OrderedDict(entries)
+        self.size = sum(int(entry.get("size", 0)) for _, entry in entries)
+
+    @callback
+    def async_lookup(self, message: str, language: str | None = None) -> str | None:
+        key = self._key(message, language)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._touch(key, entry)
+        return os.path.join(self.directory, entry["file"])
+
+    @callback
+    def async_lookup_or_render(
+        self, message: str, language: str | None = None
+    ) -> str | None:
+        """Return a cached file now, or start rendering it for the next use."""
+        if (path := self.async_lookup(message, language)) is not None:
+            self.hits += 1
+            return path
+        self.async_prefetch([message], language)
+        return None
+
+    async def async_render(
+        self, message: str, language: str | None = None
+    ) -> str | None:
+        """Return the audio file for a message, rendering it on a miss."""
+        if (path := self.async_lookup(message, language)) is not None:
+            self.hits += 1
+            return path
+        key = self._key(message, language)
+        task = self._rendering.get(key)
+        if task is None:
+            # Renders run as their own task so a caller giving up does not
+            # waste the work; the file is still cached for the next call.
+            self.misses += 1
+            task = self.hass.async_create_background_task(
+                self._async_render(key, message, language), "UniFi Talk TTS render"
+            )
+            self._rendering[key] = task
+            task.add_done_callback(lambda done: self._async_rendered(key, done))
+        return await asyncio.shield(task)
+
+    async def async_prerender(
+        self, message: str, language: str | None = None
+    ) -> str | None:
+        """Render with a time limit; None means the caller should use live TTS."""
+        try:
+            async with asyncio.timeout(TTS_RENDER_TIMEOUT):
+                return await self.async_render(message, language)
+        except TimeoutError:
+            _LOGGER.warning("TTS rendering timed out; falling back to live TTS")
+        except HomeAssistantError as err:
+            _LOGGER.warning("TTS rendering failed; falling back to live TTS: %s", err)
+        return None
+
+    def split_message(self, message: str) -> list[str]:
+        if not self.sentence_chunks:
+            return [message]
+        return split_sentences(message)
+
+    @callback
+    def async_prefetch(
+        self, messages: list[str], language: str | None = None
+    ) -> asyncio.Task[None]:
+        """Render messages one after another in the background."""
+        return self.hass.async_create_background_task(
+            self._async_prefetch(messages, language), "UniFi Talk TTS prefetch"
+        )
+
+    async def _async_prefetch(self, messages: list[str], language: str | None) -> None:
+        for message in messages:
+            if await self.async_prerender(message, language) is None:
+                return
+
+    @callback
+    def _async_rendered(self, key: str, task: asyncio.Task[str | None]) -> None:
+        self._rendering.pop(key, None)
+        if not task.cancelled() and (err := task.exception()) is not None:
+            _LOGGER.debug("TTS rendering failed: %s", err)
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_save is not None:
+            self._unsub_save()
+            self._unsub_save = None
+            self.hass.async_create_task(self._async_save())
+
+    async def _async_render(
+        self, key: str, message: str, language: str | None
+    ) -> str | None:
+        options = {tts.ATTR_VOICE: self.voice} if self.voice else None
+        media_source_id = tts.generate_media_source_id(
+            self.hass,
+            message,
+            engine=self.engine_id,
+            language=language or self.language,
+            options=options,
+        )
+        try:
+            extension, data = await tts.async_get_media_source_audio(
+                self.hass, media_source_id
+            )
+        except HomeAssistantError:
+            self.failures += 1
+            raise
+        if not data:
+            self.failures += 1
+            return None
+
+        filename = f"{key}.{extension or 'mp3'}"
+        await self.hass.async_add_executor_job(
+            _write_audio, self.directory, filename, data
+        )
+        entry = {"file": filename, "size": len(data), "last_used": 0.0}
+        self._entries[key] = entry
+        self.size += len(data)
+        self._touch(key, entry)
+        await self._async_evict()
+        return os.path.join(self.directory, filename)
+
+    def _key(self, message: str, language: str | None) -> str:
+        return tts_cache_key(
+            message, language or self.language, self.voice, self.engine_id
+        )
+
+    def _touch(self, key: str, entry: dict[str, Any]) -> None:
+        entry["last_used"] = time.time()
+        self._entries.move_to_end(key)
+        self._schedule_save()
+
+    async def _async_evict(self) -> None:
+        evicted: list[str] = []
+        # Never evict the newest entry, even if it alone exceeds the budget.
+        while self.size > self.max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            self.size -= int(entry.get("size", 0))
+            evicted.append(os.path.join(self.directory, entry["file"]))
+        if evicted:
+            await self.hass.async_add_executor_job(_remove_files, evicted)
+
+    def _schedule_save(self) -> None:
+        if self._unsub_save is None:
+            self._unsub_save = async_call_later(
+                self.hass, TTS_INDEX_SAVE_DELAY, self._async_save_later
+            )
+
+    async def _async_save_later(self, _: datetime) -> None:
+        self._unsub_save = None
+        await self._async_save()
+
+    async def _async_save(self) -> None:
+        try:
+            await self.hass.async_add_executor_job(
+                _write_index,
+                os.path.join(self.directory, TTS_INDEX_FILE),
+                dict(self._entries),
+            )
+        except OSError as err:
+            _LOGGER.warning("Unable to write TTS cache index: %s", err)
@@ -0,0 +1,206 @@
+# SPDX-FileCopyrightText: 2025 Michael E. Harrington
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import TERMINAL_CALL_EVENTS
+
+if TYPE_CHECKING:
+    from . import CallSession
+
+_SIP_URI = re.compile(r"<([^>]*)>")
+# Finished waiters stay in the deadline heap until popped; rebuild past this size.
+DEADLINE_COMPACT_SIZE = 256
+
+
+def target_key(value: str | None) -> str | None:
+    """Return the user part of a dial target or SIP URI for matching calls."""
+    if not value:
+        return None
+    value = value.strip()
+    if match := _SIP_URI.search(value):
+        value = match.group(1)
+    if value.startswith(("sip:", "sips:", "tel:")):
+        value = value.split(":", 1)[1]
+    return value.split("@", 1)[0].split(";", 1)[0].lower() or None
+
+
+@dataclass(slots=True, eq=False)
+class CallWaiter:
+    target: str | None
+    events: frozenset[str]
+    # Resolves to the matching event, or None when the timeout expires.
+    future: asyncio.Future[dict[str, Any] | None]
+    internal_id: str | None = None
+    keys: list[tuple[str, str]] = field(default_factory=list)
+
+
+class CallWaiters:
+    """Pending waits on call events, indexed by (internal_id, event).
+
+    Outbound calls only get an ``internal_id`` from their first webhook event, so
+    a dial waiter starts out keyed by its dial target. The first event of a new
+    outgoing call whose remote party matches binds the oldest waiter for that
+    target to the call. Terminal events always resolve a waiter.
+
+    Timeouts share one heap and one loop timer armed for the earliest deadline.
+    """
+
+    def __init__(self) -> None:
+        self._by_target: dict[str, list[CallWaiter]] = {}
+        self._by_event: dict[tuple[str, str], list[CallWaiter]] = {}
+        self._deadlines: list[tuple[float, int, CallWaiter]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending_targets": sum(len(items) for items in self._by_target.values()),
+            "pending_keys": len(self._by_event),
+            "deadlines": len(self._deadlines),
+        }
+
+    @callback
+    def async_add(self, target: str | None, events: frozenset[str]) -> CallWaiter:
+        waiter = self._new_waiter(target_key(target), events)
+        if waiter.target is not None:
+            self._by_target.setdefault(waiter.target, []).append(waiter)
+        return waiter
+
+    @callback
+    def async_add_for_call(
+        self, internal_id: str, events: frozenset[str], timeout: float
+    ) -> CallWaiter:
+        waiter = self._new_waiter(None, events)
+        self._index(waiter, internal_id)
+        self.async_set_timeout(waiter, timeout)
+        return waiter
+
+    @callback
+    def async_set_timeout(self, waiter: CallWaiter, timeout: float) -> None:
+        loop = asyncio.get_running_loop()
+        if len(self._deadlines) >= DEADLINE_COMPACT_SIZE:
+            self._deadlines = [
+                item for item in self._deadlines if not item[2].future.done()
+            ]
+            heapq.heapify(self._deadlines)
+        entry = (loop.time() + timeout, next(self._sequence), waiter)
+        heapq.heappush(self._deadlines, entry)
+        if self._deadlines[0] is entry:
+            self._schedule(loop)
+
+    @callback
+    def async_remove(self, waiter: CallWaiter) -> None:
+        self._unindex(waiter)
+        if not waiter.future.done():
+            waiter.future.cancel()
+
+    @callback
+    def async_cancel_all(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._deadlines.clear()
+        waiters = {
+            waiter
+            for index in (self._by_target, self._by_event)
+            for items in index.values()
+            for waiter in items
+        }
+        self._by_target.clear()
+        self._by_event.clear()
+        for waiter in waiters:
+            if not waiter.future.done():
+                waiter.future.set_exception(
+                    HomeAssistantError("UniFi Talk is unloading")
+                )
+
+    @callback
+    def async_resolve(
+        self, session: CallSession, event: str, payload: dict[str, Any]
+    ) -> None:
+        if session.direction == "outgoing" and session.event_count == 1:
+            self._bind(session)
+
+        waiters = self._by_event.get((session.internal_id, event))
+        if not waiters:
+            return
+        result = {**payload, "internal_id": session.internal_id, "event": event}
+        for waiter in list(waiters):
+            self._finish(waiter, result)
+
+    def _new_waiter(self, target: str | None, events: frozenset[str]) -> CallWaiter:
+        return CallWaiter(
+            target=target,
+            events=events,
+            future=asyncio.get_running_loop().create_future(),
+        )
+
+    def _bind(self, session: CallSession) -> None:
+        for candidate in (session.parsed_caller, session.caller):
+            key = target_key(candidate)
+            waiters = self._by_target.get(key) if key is not None else None
+            if not waiters:
+                continue
+            waiter = waiters.pop(0)
+            if not waiters:
+                del self._by_target[key]
+            self._index(waiter, session.internal_id)
+            return
+
+    def _index(self, waiter: CallWaiter, internal_id: str) -> None:
+        waiter.internal_id = internal_id
+        for event in waiter.events.union(TERMINAL_CALL_EVENTS):
+            key = (internal_id, event)
+            waiter.keys.append(key)
+            self._by_event.setdefault(key, []).append(waiter)
+
+    def _unindex(self, waiter: CallWaiter) -> None:
+        if waiter.target is not None:
+            self._discard(self._by_target, waiter.target, waiter)
+        for key in waiter.keys:
+            self._discard(self._by_event, key, waiter)
+        waiter.keys.clear()
+
+    @staticmethod
+    def _discard(
+        index: dict[Any, list[CallWaiter]], key: Any, waiter: CallWaiter
+    ) -> None:
+        waiters = index.get(key)
+        if waiters and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del index[key]
+
+    def _finish(self, waiter: CallWaiter, result: dict[str, Any] | None) -> None:
+        self._unindex(waiter)
+        if not waiter.future.done():
+            waiter.future.set_result(result)
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # Entries of waiters that already finished are dropped lazily.
+        while self._deadlines and self._deadlines[0][2].future.done():
+            heapq.heappop(self._deadlines)
+        if self._deadlines:
+            self._timer = loop.call_at(self._deadlines[0][0], self._expire, loop)
+
+    def _expire(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._timer = None
+        now = loop.time()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, _, waiter = heapq.heappop(self._deadlines)
+            self._finish(waiter, None)
+        self._schedule(loop)